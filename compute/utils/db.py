@@ -53,6 +53,42 @@ class ComputeDb:
                 )
             """
             )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pog_identity (
+                    hotkey TEXT PRIMARY KEY,
+                    gpu_name TEXT,
+                    num_gpus INTEGER,
+                    gpu_names TEXT,
+                    vram REAL,
+                    time_fp32 REAL,
+                    multiplication_times TEXT,
+                    identified_at REAL,
+                    FOREIGN KEY (hotkey) REFERENCES miner_details (hotkey) ON DELETE CASCADE
+                )
+            """
+            )
+            cursor.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pog_jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    hotkey TEXT,
+                    axon TEXT,
+                    status TEXT,
+                    worker_id TEXT,
+                    lease_token TEXT,
+                    lease_expires_at REAL,
+                    attempts INTEGER DEFAULT 0,
+                    gpu_name TEXT,
+                    num_gpus INTEGER,
+                    timed_out INTEGER DEFAULT 0,
+                    created_at REAL,
+                    finished_at REAL
+                )
+            """
+            )
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_pog_jobs_status ON pog_jobs (status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_pog_jobs_lease_token ON pog_jobs (lease_token)")
 
             self.conn.commit()
         except Exception as e:
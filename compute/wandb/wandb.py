@@ -161,6 +161,10 @@ class ComputeWandb:
         else:
             bt.logging.warning(f"wandb init failed, logging not possible.")
 
+    def log_pog_metrics(self, data):
+        if self.run:
+            self.run.log({"pog": data})
+
     def update_allocated(self, allocated):
         """
         This function update the allocated value on miner side.
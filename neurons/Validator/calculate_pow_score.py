@@ -32,20 +32,29 @@ def normalize(val, min_value, max_value):
 def prevent_none(val):
     return 0 if not val else val
 
-def calc_score_pog(gpu_specs, hotkey, allocated_hotkeys, config_data, mock=False):
+def build_pog_score_lookup(gpu_data):
+    """
+    Score of a single GPU of each model. 8 GPUs of the best model score 50, doubled when allocated.
+
+    Only depends on the config, so holders of a config snapshot build it once.
+    """
+    gpu_scores = gpu_data.get("gpu_scores", {})
+    # Get the GPU with the maximum score
+    max_gpu = max(gpu_scores, key=gpu_scores.get)
+    max_score = gpu_scores[max_gpu]*8
+    score_factor = 50/max_score
+    return {gpu_name: gpu_score * score_factor for gpu_name, gpu_score in gpu_scores.items()}
+
+def calc_score_pog(gpu_specs, hotkey, allocated_hotkeys, config_data, mock=False, score_lookup=None):
     try:
-        gpu_data = config_data["gpu_performance"]
-        gpu_scores = gpu_data.get("gpu_scores", {})
-        # Get the GPU with the maximum score
-        max_gpu = max(gpu_scores, key=gpu_scores.get)
-        max_score = gpu_scores[max_gpu]*8
-        score_factor = 50/max_score
+        if score_lookup is None:
+            score_lookup = build_pog_score_lookup(config_data["gpu_performance"])
 
         gpu_name = gpu_specs.get("gpu_name")
         num_gpus = min(gpu_specs.get("num_gpus"), 8)
 
         # Get GPU score
-        score = gpu_scores.get(gpu_name) * num_gpus * score_factor
+        score = score_lookup.get(gpu_name) * num_gpus
 
         # Add allocation score, multiplier = 2
         if hotkey in allocated_hotkeys:
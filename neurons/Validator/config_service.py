@@ -0,0 +1,194 @@
+import asyncio
+import os
+import time
+from types import MappingProxyType
+
+import bittensor as bt
+
+from neurons.Validator.calculate_pow_score import build_pog_score_lookup
+from neurons.Validator.pog import get_gpu_reference_table, load_yaml_config
+
+
+def freeze(value):
+    """Read-only copy of a loaded YAML document: mappings become mapping proxies and lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+# Defaults of the merkle_proof settings read by the validator's PoG scheduling,
+# applied by validate_config so every reader sees the same value
+MERKLE_PROOF_DEFAULTS = {
+    "pog_retry_limit": 22,
+    "pog_retry_interval": 60,
+    "pog_max_retry_interval": 600,
+    "max_workers": 256,
+    "pog_min_workers": 4,
+    "pog_concurrency_increase": 2,
+    "pog_concurrency_decrease": 0.5,
+    "pog_max_timeout_rate": 0.2,
+    "pog_max_loop_lag": 0.5,
+    "pog_max_cpu_percent": 90,
+    "pog_max_verification_latency": 30,
+    "max_random_delay": 900,
+    "pog_refresh_interval": 4320,
+    "pog_window": 600,
+    "pog_window_budget": 64,
+    "pog_schedule_interval": 30,
+    "pog_job_queue": False,
+    "pog_job_lease": 120,
+    "pog_job_max_attempts": 3,
+}
+
+
+class ConfigSnapshot:
+    """
+    Immutable, validated content of config.yaml at one point in time.
+
+    The structures derived from the config (GPU reference table, PoG score lookup)
+    are built with the snapshot, so they are computed once per config version.
+    """
+
+    def __init__(self, data, version, loaded_at):
+        self.data = freeze(data)
+        self.version = version
+        self.loaded_at = loaded_at
+        gpu_data = self.data["gpu_performance"]
+        self.gpu_table = get_gpu_reference_table(gpu_data)
+        self.score_lookup = build_pog_score_lookup(gpu_data)
+
+    @classmethod
+    def load(cls, file_path, version=1):
+        """
+        Load and validate the config file.
+
+        :raises ValueError: If the file is not a valid validator config.
+        """
+        data = load_yaml_config(file_path)
+        validate_config(data)
+        try:
+            return cls(data, version, time.time())
+        except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
+            raise ValueError(f"Invalid config file {file_path}: {e!r}")
+
+
+def validate_config(data):
+    """
+    Check the sections of config.yaml read by the validator and fill in
+    the missing merkle_proof settings from MERKLE_PROOF_DEFAULTS.
+
+    :raises ValueError: On the first problem found.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("The config must be a mapping.")
+    for section in ("gpu_performance", "merkle_proof"):
+        if not isinstance(data.get(section), dict):
+            raise ValueError(f"Missing section {section}.")
+
+    gpu_data = data["gpu_performance"]
+    profiles = gpu_data.get("GPU_TFLOPS_FP16")
+    if not isinstance(profiles, dict) or not profiles:
+        raise ValueError("gpu_performance.GPU_TFLOPS_FP16 must list at least one GPU.")
+    for table in ("GPU_TFLOPS_FP16", "GPU_TFLOPS_FP32", "GPU_AVRAM"):
+        values = gpu_data.get(table)
+        if not isinstance(values, dict):
+            raise ValueError(f"Missing gpu_performance.{table}.")
+        for gpu_name in profiles:
+            value = values.get(gpu_name)
+            if not isinstance(value, (int, float)) or value <= 0:
+                raise ValueError(f"gpu_performance.{table} needs a positive value for {gpu_name}.")
+    gpu_scores = gpu_data.get("gpu_scores")
+    if not isinstance(gpu_scores, dict) or not gpu_scores:
+        raise ValueError("gpu_performance.gpu_scores must list at least one GPU.")
+    if not all(isinstance(score, (int, float)) and score >= 0 for score in gpu_scores.values()):
+        raise ValueError("gpu_performance.gpu_scores values must be non-negative numbers.")
+    if max(gpu_scores.values()) <= 0:
+        raise ValueError("gpu_performance.gpu_scores needs a positive score.")
+
+    merkle_proof = data["merkle_proof"]
+    if not merkle_proof.get("miner_script_path"):
+        raise ValueError("Missing merkle_proof.miner_script_path.")
+    for key, value in MERKLE_PROOF_DEFAULTS.items():
+        merkle_proof.setdefault(key, value)
+    for key, value in merkle_proof.items():
+        if key.startswith(("pog_", "max_", "benchmark_")) and isinstance(value, (int, float)) and value < 0:
+            raise ValueError(f"merkle_proof.{key} must not be negative.")
+
+
+class ConfigService:
+    """
+    Serves the current snapshot of config.yaml and reloads it when the file changes.
+
+    Changes are detected by polling the file's modification time, size and inode,
+    which also catches editors replacing the file. A new version is validated
+    before it is swapped in; an invalid file is logged and the previous snapshot
+    stays active. Readers should take `snapshot` once per unit of work (e.g. a
+    miner test) so they see a consistent config.
+    """
+
+    def __init__(self, file_path, poll_interval=10.0):
+        self.file_path = file_path
+        self.poll_interval = poll_interval
+        self.listeners = []
+        self._stat = self._file_stat()
+        self.snapshot = ConfigSnapshot.load(file_path)
+
+    @property
+    def data(self):
+        return self.snapshot.data
+
+    def add_listener(self, listener):
+        """Call `listener(snapshot, previous_snapshot)` after each successful reload."""
+        self.listeners.append(listener)
+
+    def _file_stat(self):
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _load_changed(self):
+        file_stat = self._file_stat()
+        if file_stat is None or file_stat == self._stat:
+            return None
+        # A half-written file is retried once its next write changes the stat again
+        self._stat = file_stat
+        try:
+            return ConfigSnapshot.load(self.file_path, self.snapshot.version + 1)
+        except Exception as e:
+            bt.logging.error(f"❌ Ignoring invalid {self.file_path}, keeping config version {self.snapshot.version}: {e}")
+            return None
+
+    def _swap(self, snapshot):
+        previous = self.snapshot
+        self.snapshot = snapshot
+        bt.logging.info(f"🔄 Reloaded {self.file_path} (config version {snapshot.version}).")
+        for listener in self.listeners:
+            try:
+                listener(snapshot, previous)
+            except Exception as e:
+                bt.logging.error(f"❌ Error applying config version {snapshot.version}: {e}")
+
+    def reload(self):
+        """
+        Load the config file if it changed since the last check.
+
+        :return: The new snapshot, or None if the file did not change or is invalid.
+        """
+        snapshot = self._load_changed()
+        if snapshot is not None:
+            self._swap(snapshot)
+        return snapshot
+
+    async def watch(self):
+        """Check the config file every `poll_interval` seconds until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            # Parsing and validation run off the event loop, the swap and listeners on it
+            snapshot = await loop.run_in_executor(None, self._load_changed)
+            if snapshot is not None:
+                self._swap(snapshot)
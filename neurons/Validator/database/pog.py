@@ -15,6 +15,8 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 import datetime
+import json
+import time
 
 import bittensor as bt
 
@@ -95,3 +97,103 @@ def get_pog_specs(db: ComputeDb, hotkey):
         return None
     finally:
         cursor.close()
+
+def get_pog_last_successes(db: ComputeDb):
+    """
+    Retrieves the time of the latest successful PoG test of every hotkey.
+
+    :return: A dictionary mapping hotkey to a UNIX timestamp.
+    """
+    cursor = db.get_cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT hotkey, MAX(CAST(strftime('%s', created_at) AS INTEGER))
+            FROM pog_stats
+            WHERE gpu_name IS NOT NULL AND num_gpus IS NOT NULL
+            GROUP BY hotkey
+            """
+        )
+        return {hotkey: float(timestamp) for hotkey, timestamp in cursor.fetchall() if timestamp is not None}
+    except Exception as e:
+        # bt.logging.error(f"Error retrieving pog_stats timestamps: {e}")
+        return {}
+    finally:
+        cursor.close()
+
+def update_pog_identity(db: ComputeDb, hotkey, gpu_name, num_gpus, gpu_names, vram, time_fp32, multiplication_times):
+    """
+    Stores the outcome of a full PoG identification, used as reference by the re-verification fast path.
+
+    :param hotkey: The miner's hotkey identifier.
+    :param gpu_name: The identified GPU name.
+    :param num_gpus: The number of GPUs.
+    :param gpu_names: GPU names reported by the miner.
+    :param vram: Usable VRAM in GB measured by the benchmark, sizes the PoG matrices.
+    :param time_fp32: Benchmarked time of one full-size FP32 matrix multiplication.
+    :param multiplication_times: Per-GPU multiplication times of the Merkle challenge.
+    """
+    cursor = db.get_cursor()
+    try:
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO pog_identity
+                (hotkey, gpu_name, num_gpus, gpu_names, vram, time_fp32, multiplication_times, identified_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (hotkey, gpu_name, num_gpus, json.dumps(gpu_names), vram, time_fp32, json.dumps(multiplication_times), time.time())
+        )
+        db.conn.commit()
+    except Exception as e:
+        db.conn.rollback()
+        # bt.logging.error(f"Error updating pog_identity for {hotkey}: {e}")
+    finally:
+        cursor.close()
+
+def get_pog_identity(db: ComputeDb, hotkey):
+    """
+    Retrieves the cached PoG identity of a hotkey.
+
+    :return: A dictionary with the stored identification or None.
+    """
+    cursor = db.get_cursor()
+    try:
+        cursor.execute(
+            """
+            SELECT gpu_name, num_gpus, gpu_names, vram, time_fp32, multiplication_times, identified_at
+            FROM pog_identity
+            WHERE hotkey = ?
+            """,
+            (hotkey,)
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        gpu_name, num_gpus, gpu_names, vram, time_fp32, multiplication_times, identified_at = row
+        return {
+            "gpu_name": gpu_name,
+            "num_gpus": num_gpus,
+            "gpu_names": json.loads(gpu_names),
+            "vram": vram,
+            "time_fp32": time_fp32,
+            "multiplication_times": json.loads(multiplication_times),
+            "identified_at": identified_at,
+        }
+    except Exception as e:
+        # bt.logging.error(f"Error retrieving pog_identity for {hotkey}: {e}")
+        return None
+    finally:
+        cursor.close()
+
+def delete_pog_identity(db: ComputeDb, hotkey):
+    """
+    Drops the cached PoG identity of a hotkey, forcing a full identification on its next test.
+    """
+    cursor = db.get_cursor()
+    try:
+        cursor.execute("DELETE FROM pog_identity WHERE hotkey = ?", (hotkey,))
+        db.conn.commit()
+    except Exception as e:
+        db.conn.rollback()
+    finally:
+        cursor.close()
@@ -0,0 +1,159 @@
+import secrets
+import time
+
+import bittensor as bt
+
+from compute.utils.db import ComputeDb
+
+
+class PogJob:
+    """A PoG job claimed by a worker."""
+
+    def __init__(self, job_id, hotkey, axon, lease_token):
+        self.job_id = job_id
+        self.hotkey = hotkey
+        self.axon = axon
+        self.lease_token = lease_token
+
+
+class PogJobQueue:
+    """
+    Lease-based PoG job table shared by the validator and PoG worker processes.
+
+    The validator enqueues one job per miner to test. Workers claim jobs with a lease
+    that they renew with heartbeats; a job whose lease expires goes back to the queue,
+    and is reported as failed once it has been claimed `max_attempts` times. Finished
+    jobs are collected, and removed, by the validator.
+
+    Backed by the `pog_jobs` table of the validator's SQLite database. Every claim and
+    update is a single UPDATE statement, so several processes can share the table.
+    """
+
+    def __init__(self, db: ComputeDb, lease_seconds=120, max_attempts=3):
+        self.db = db
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def _execute(self, query, params=()):
+        """
+        Run one write statement in its own transaction.
+
+        :return: Number of rows changed, 0 if the statement failed; failures are logged as
+            errors, so a database fault is not mistaken for an empty queue or a lost lease.
+        """
+        cursor = self.db.get_cursor()
+        try:
+            cursor.execute(query, params)
+            self.db.conn.commit()
+            return cursor.rowcount
+        except Exception as e:
+            self.db.conn.rollback()
+            bt.logging.error(f"❌ PoG job queue {query.split()[0]} failed: {e}")
+            return 0
+        finally:
+            cursor.close()
+
+    def _fetchall(self, query, params=()):
+        cursor = self.db.get_cursor()
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def enqueue(self, axon):
+        """
+        Add a job for the miner unless one is already pending or running.
+
+        :return: True if a job was added.
+        """
+        return self._execute(
+            """
+            INSERT INTO pog_jobs (hotkey, axon, status, attempts, created_at)
+            SELECT ?, ?, 'pending', 0, ?
+            WHERE NOT EXISTS (
+                SELECT 1 FROM pog_jobs WHERE hotkey = ? AND status IN ('pending', 'leased')
+            )
+            """,
+            (axon.hotkey, axon.to_string(), time.time(), axon.hotkey)
+        ) > 0
+
+    def active_hotkeys(self):
+        """Hotkeys of the jobs pending or running."""
+        rows = self._fetchall("SELECT hotkey FROM pog_jobs WHERE status IN ('pending', 'leased')")
+        return {hotkey for hotkey, in rows}
+
+    def claim(self, worker_id):
+        """
+        Lease the oldest pending job, or a job whose lease expired.
+
+        :return: PogJob or None when there is nothing to do.
+        """
+        now = time.time()
+        # Jobs abandoned too many times are failed instead of being handed out again
+        self._execute(
+            """
+            UPDATE pog_jobs SET status = 'done', gpu_name = NULL, num_gpus = NULL, timed_out = 1, finished_at = ?
+            WHERE status = 'leased' AND lease_expires_at < ? AND attempts >= ?
+            """,
+            (now, now, self.max_attempts)
+        )
+        lease_token = secrets.token_hex(16)
+        claimed = self._execute(
+            """
+            UPDATE pog_jobs
+            SET status = 'leased', worker_id = ?, lease_token = ?, lease_expires_at = ?, attempts = attempts + 1
+            WHERE id = (
+                SELECT id FROM pog_jobs
+                WHERE status = 'pending' OR (status = 'leased' AND lease_expires_at < ?)
+                ORDER BY id
+                LIMIT 1
+            )
+            """,
+            (worker_id, lease_token, now + self.lease_seconds, now)
+        )
+        if not claimed:
+            return None
+        rows = self._fetchall("SELECT id, hotkey, axon FROM pog_jobs WHERE lease_token = ?", (lease_token,))
+        if not rows:
+            return None
+        job_id, hotkey, axon = rows[0]
+        return PogJob(job_id, hotkey, bt.AxonInfo.from_string(axon), lease_token)
+
+    def heartbeat(self, job):
+        """
+        Extend the lease of a running job.
+
+        :return: False if the lease was lost to another worker.
+        """
+        return self._execute(
+            "UPDATE pog_jobs SET lease_expires_at = ? WHERE id = ? AND lease_token = ? AND status = 'leased'",
+            (time.time() + self.lease_seconds, job.job_id, job.lease_token)
+        ) > 0
+
+    def complete(self, job, gpu_name, num_gpus, timed_out=False):
+        """
+        Record the outcome of a job.
+
+        :return: False if the lease was lost, the result must then be dropped.
+        """
+        return self._execute(
+            """
+            UPDATE pog_jobs SET status = 'done', gpu_name = ?, num_gpus = ?, timed_out = ?, finished_at = ?
+            WHERE id = ? AND lease_token = ? AND status = 'leased'
+            """,
+            (gpu_name, num_gpus, int(timed_out), time.time(), job.job_id, job.lease_token)
+        ) > 0
+
+    def collect_results(self):
+        """
+        Remove the finished jobs and return their outcome.
+
+        :return: List of (hotkey, gpu_name, num_gpus, timed_out) tuples.
+        """
+        rows = self._fetchall(
+            "SELECT id, hotkey, gpu_name, num_gpus, timed_out FROM pog_jobs WHERE status = 'done' ORDER BY id"
+        )
+        if rows:
+            self._execute("DELETE FROM pog_jobs WHERE status = 'done' AND id <= ?", (rows[-1][0],))
+        return [(hotkey, gpu_name, num_gpus, bool(timed_out)) for _, hotkey, gpu_name, num_gpus, timed_out in rows]
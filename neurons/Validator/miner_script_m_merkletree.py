@@ -7,48 +7,152 @@ import sys
 import os
 import numpy as np
 import hashlib
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
 from multiprocessing.pool import ThreadPool
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import argparse
 import json
 import gc
+import struct
+import threading
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
 
 os.environ["PYTORCH_CUDA_ALLOC_CONF"] = "max_split_size_mb:512"
 
+# Binary proof response format (little-endian):
+#   header:   magic (4s), version (H), hash_size (H), num_rows (I), row_length (I), num_leaves (I), num_siblings (I)
+#   bitmap:   ceil(num_leaves / 8) bytes, bit i set if row i is included (LSB first)
+#   rows:     num_rows x row_length float32, in ascending row index order
+#   siblings: num_siblings x hash_size uint8 Merkle multiproof, see get_merkle_multiproof
+PROOF_FORMAT_MAGIC = b"PoGR"
+PROOF_FORMAT_VERSION = 2
+PROOF_HEADER = struct.Struct("<4sHHIIII")
+
 import subprocess
 import sys
 
-def get_gpu_info():
+# Rows at least this large are hashed with blake3's own multithreaded mode
+BLAKE3_THREADING_THRESHOLD = 1 << 20
+
+def blake3_leaf_hash(data=b""):
+    max_threads = blake3.blake3.AUTO if len(data) >= BLAKE3_THREADING_THRESHOLD else 1
+    return blake3.blake3(data, max_threads=max_threads)
+
+# Hash backends available for the Merkle tree: name -> (node hash, leaf hash)
+HASH_BACKENDS = {"sha256": (hashlib.sha256, hashlib.sha256)}
+if blake3 is not None:
+    HASH_BACKENDS["blake3"] = (blake3.blake3, blake3_leaf_hash)
+
+def get_hash_backend(name):
+    """Return the (node hash, leaf hash) functions registered under `name`."""
+    if name not in HASH_BACKENDS:
+        raise ValueError(f"Unsupported hash algorithm: {name}")
+    return HASH_BACKENDS[name]
+
+def collect_gpu_info():
     """
     Detect the number and types of GPUs available on the system.
 
     Returns:
-        dict: Dictionary containing the number of GPUs and their names.
+        dict: Dictionary containing the number of GPUs, their names and the supported hash algorithms.
     """
     if not torch.cuda.is_available():
-        return {"num_gpus": 0, "gpu_names": []}
+        return {"num_gpus": 0, "gpu_names": [], "hash_algorithms": list(HASH_BACKENDS)}
 
     num_gpus = torch.cuda.device_count()
     gpu_names = [torch.cuda.get_device_name(i) for i in range(num_gpus)]
 
-    gpu_info = {"num_gpus": num_gpus, "gpu_names": gpu_names}
+    return {"num_gpus": num_gpus, "gpu_names": gpu_names, "hash_algorithms": list(HASH_BACKENDS)}
 
-    print(json.dumps(gpu_info, indent=2))
+def get_gpu_info():
+    print(json.dumps(collect_gpu_info(), indent=2))
 
-def estimate_vram_size(buffer_factor=0.9, precision="fp16"):
-    dtype = torch.float16 if precision == "fp16" else torch.float32
-    element_size = 2 if precision == "fp16" else 4  # Size of each element in bytes
-    total_elements = 1024 * 1024  # Start with a 1MB array
+# VRAM probing: the binary search stops once its bracket is narrower than the tolerance
+# or after the maximum number of allocations; probe sizes are aligned to 2 MiB
+VRAM_PROBE_TOLERANCE = 256 * 1024 * 1024
+VRAM_PROBE_MAX_STEPS = 16
+VRAM_PROBE_ALIGNMENT = 2 * 1024 * 1024
 
+def try_allocate(num_bytes, device):
+    """Check whether a single block of `num_bytes` can be allocated, releasing it right away."""
     try:
-        while True:
-            arr = torch.empty((total_elements,), dtype=dtype, device="cuda")
-            total_elements *= 2
+        block = torch.empty((num_bytes,), dtype=torch.uint8, device=device)
+        del block
+        return True
     except RuntimeError:
-        total_elements //= 2  # Step back to last successful allocation
-        vram_bytes = total_elements * element_size
-        usable_vram = vram_bytes / (buffer_factor * 1e9)  # Convert to GB
-        return usable_vram
+        return False
+    finally:
+        torch.cuda.empty_cache()
+
+def probe_device_vram(gpu_id, tolerance=VRAM_PROBE_TOLERANCE, max_steps=VRAM_PROBE_MAX_STEPS):
+    """
+    Find the largest single allocation possible on a GPU.
+
+    The free memory reported by the driver bounds a search of real allocations, each
+    released before the next one. Probes step down from the bound with doubling steps
+    until one succeeds, then bisect the remaining bracket, so a GPU whose free memory
+    is almost entirely allocatable is settled in one or two allocations.
+
+    Returns:
+        dict: GPU ID, total, free and usable (largest allocatable block) memory in bytes.
+    """
+    device = get_device(gpu_id, "cuda")
+    torch.cuda.empty_cache()
+    free, total = torch.cuda.mem_get_info(device)
+    low, high = 0, free
+    step = tolerance
+    candidate = max(free - step, 0)
+    found = False
+    steps = 0
+    while high - low > tolerance and steps < max_steps:
+        candidate -= candidate % VRAM_PROBE_ALIGNMENT
+        if try_allocate(candidate, device):
+            low = candidate
+            found = True
+        else:
+            high = candidate
+        steps += 1
+        if found:
+            candidate = (low + high) // 2
+        else:
+            step *= 2
+            candidate = max(high - step, 0)
+    return {"gpu_id": gpu_id, "total": total, "free": free, "usable": low}
+
+def legacy_vram_size(usable_bytes, element_size=2):
+    """
+    VRAM in GB that the former doubling allocation loop reported for `usable_bytes`.
+
+    That loop allocated FP16 tensors of 1M, 2M, 4M... elements with the previous one
+    still alive, so it stopped at the largest power of two fitting 1.5 times in memory.
+    The GPU_AVRAM references used for identification were measured with it.
+    """
+    elements = 1024 * 1024
+    while 3 * elements * element_size <= usable_bytes:
+        elements *= 2
+    return elements * element_size / 1e9
+
+def estimate_vram(device_type="cuda"):
+    """
+    Probe the usable VRAM of every GPU.
+
+    Returns:
+        dict: "vram", the legacy identification figure in GB, "usable_vram", the largest
+        block allocatable on every GPU in GB, and "devices", the per-GPU probe results.
+    """
+    if device_type != "cuda":
+        # The CPU device stands in for a GPU holding just the FP16 benchmark matrices
+        usable = 2 * 2 * BENCHMARK_CPU_SIZE ** 2
+        return {"vram": usable / 1e9, "usable_vram": usable / 1e9,
+                "devices": [{"gpu_id": 0, "total": usable, "free": usable, "usable": usable}]}
+    devices = [probe_device_vram(gpu_id) for gpu_id in range(torch.cuda.device_count())]
+    usable = min((device["usable"] for device in devices), default=0)
+    return {"vram": legacy_vram_size(usable), "usable_vram": usable / 1e9, "devices": devices}
 
 def adjust_matrix_size(vram, element_size=2, buffer_factor=0.8):
     usable_vram = vram * buffer_factor * 1e9  # Usable VRAM in bytes
@@ -57,14 +161,17 @@ def adjust_matrix_size(vram, element_size=2, buffer_factor=0.8):
     return aligned_size
 
 def get_seeds():
-    """Read n and seeds from /tmp/seeds.txt."""
+    """Read n, the hash algorithm, the low-memory flag and seeds from /tmp/seeds.txt."""
     if not os.path.exists('/tmp/seeds.txt'):
         print("Seeds file not found.")
         sys.exit(1)
     with open('/tmp/seeds.txt', 'r') as f:
         content = f.read().strip()
     lines = content.split('\n')
-    n = int(lines[0])
+    header = lines[0].split()
+    n = int(header[0])
+    hash_algorithm = header[1] if len(header) > 1 else "sha256"
+    low_memory = len(header) > 2 and header[2] == "low_memory"
     seeds = {}
     for line in lines[1:]:
         gpu_id, s_A, s_B = line.strip().split()
@@ -72,7 +179,7 @@ def get_seeds():
         s_A = int(s_A)
         s_B = int(s_B)
         seeds[gpu_id] = (s_A, s_B)
-    return n, seeds
+    return n, seeds, hash_algorithm, low_memory
 
 def get_challenge_indices():
     """Read challenge indices from /tmp/challenge_indices.txt."""
@@ -91,200 +198,592 @@ def get_challenge_indices():
     return indices
 
 
-def build_merkle_tree_rows(C, hash_func=hashlib.sha256, num_threads=None):
+# Long-lived worker pool shared by every Merkle tree build
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+HASH_CHUNK_SIZE = 4096
+# Rows of C copied to the host per block in streaming compute mode
+STREAM_BLOCK_ROWS = 1024
+# Rows of C multiplied per block in low-memory mode; proof mode recomputes whole blocks
+# with the same shapes so the recomputed rows are bit-identical to the committed ones
+RECOMPUTE_BLOCK_ROWS = 1024
+# Matrix values generated per block, bounds the int64 scratch memory of the PRNG
+GENERATION_BLOCK_ELEMENTS = 1 << 24
+# Benchmark: untimed warmup multiplications (clock ramp-up, cuBLAS heuristics, allocator),
+# then timed trials; matrix sizes are capped so repeated trials stay within a few seconds
+BENCHMARK_WARMUP = 3
+BENCHMARK_TRIALS = 10
+BENCHMARK_MAX_SIZE = 16384
+# The FP32 multiplication bounding the Merkle challenge time is also timed at its full,
+# uncapped size; the capped FP32 trials already warmed cuBLAS up, so it needs no warmup
+BENCHMARK_FULL_SIZE_WARMUP = 0
+BENCHMARK_FULL_SIZE_TRIALS = 2
+# Matrix size benchmarked on the CPU device, which stands in for a single small GPU
+BENCHMARK_CPU_SIZE = 512
+
+def get_hash_pool(num_threads=8):
+    """Return the process-wide hashing pool, creating it on first use."""
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ThreadPool(num_threads)
+        return _hash_pool
+
+def merkle_level_sizes(total_leaves):
+    """Number of nodes on each level of the tree, leaves first."""
+    sizes = [total_leaves]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+def hash_rows_into(rows, out, leaf_hash_func, pool, chunk_size=HASH_CHUNK_SIZE):
+    """Hash each row of `rows` into the matching row of `out`, in chunks on `pool`."""
+    num_rows = rows.shape[0]
+    digest_size = out.shape[1]
+
+    def hash_chunk(start):
+        end = min(start + chunk_size, num_rows)
+        digests = b"".join(leaf_hash_func(rows[i, :].tobytes()).digest() for i in range(start, end))
+        out[start:end] = np.frombuffer(digests, dtype=np.uint8).reshape(-1, digest_size)
+
+    if num_rows > chunk_size:
+        pool.map(hash_chunk, range(0, num_rows, chunk_size))
+    else:
+        hash_chunk(0)
+
+def build_merkle_levels(tree, total_leaves, hash_func, pool, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Fill the upper levels of a flat Merkle tree whose leaves are already hashed.
+
+    Each pair of children is contiguous in the flat array, so a chunk of parents
+    is computed from a single slice of the level below.
+
+    Returns:
+        bytes: The root hash.
+    """
+    digest_size = tree.shape[1]
+    level_sizes = merkle_level_sizes(total_leaves)
+    offset = 0
+    for num_nodes, num_parents in zip(level_sizes, level_sizes[1:]):
+        level = tree[offset:offset + num_nodes]
+        parents = tree[offset + num_nodes:offset + num_nodes + num_parents]
+
+        def hash_pairs(start):
+            end = min(start + chunk_size, num_parents)
+            data = level[2 * start:2 * end].tobytes()
+            if 2 * end > num_nodes:
+                data += level[-1].tobytes()  # Duplicate if odd number of nodes
+            pair_size = 2 * digest_size
+            digests = b"".join(
+                hash_func(data[k:k + pair_size]).digest() for k in range(0, len(data), pair_size)
+            )
+            parents[start:end] = np.frombuffer(digests, dtype=np.uint8).reshape(-1, digest_size)
+
+        if num_parents > chunk_size:
+            pool.map(hash_pairs, range(0, num_parents, chunk_size))
+        else:
+            hash_pairs(0)
+        offset += num_nodes
+
+    return tree[-1].tobytes()
+
+def allocate_merkle_tree(total_leaves, digest_size):
+    """Allocate a flat (num_nodes, digest_size) uint8 array for a tree over `total_leaves` leaves."""
+    return np.empty((sum(merkle_level_sizes(total_leaves)), digest_size), dtype=np.uint8)
+
+def build_merkle_tree_rows(C, hash_func=hashlib.sha256, num_threads=None, chunk_size=HASH_CHUNK_SIZE, leaf_hash_func=None):
+    """
+    Build a Merkle tree over the rows of C.
+
+    Rows are hashed with `leaf_hash_func` (defaults to `hash_func`), which lets a
+    backend use a faster path for large inputs while producing identical digests.
+
+    The tree is a flat (num_nodes, digest_size) uint8 array holding every level
+    back to back, leaves first; the last node of an odd level is paired with itself.
+    Leaves and internal nodes are hashed in chunks on a single long-lived pool.
+
+    Returns:
+        tuple: (root_hash bytes, tree np.ndarray)
+    """
     if num_threads is None:
         num_threads = 8
+    if leaf_hash_func is None:
+        leaf_hash_func = hash_func
+    pool = get_hash_pool(num_threads)
 
     n = C.shape[0]
-    
-    # Hash each row of C using the specified hash function
-    def hash_row(i):
-        return hash_func(C[i, :].tobytes()).digest()
-    
-    # Parallelize row hashing
-    with ThreadPool(num_threads) as pool:
-        leaves = pool.map(hash_row, range(n))
-    
-    tree = leaves.copy()
-    num_leaves = len(leaves)
-    offset = 0
+    tree = allocate_merkle_tree(n, hash_func().digest_size)
+    hash_rows_into(C, tree[:n], leaf_hash_func, pool, chunk_size)
+    root_hash = build_merkle_levels(tree, n, hash_func, pool, chunk_size)
+    return root_hash, tree
+
+def stream_merkle_tree_rows(C_torch, hash_func=hashlib.sha256, leaf_hash_func=None, out=None,
+                            block_rows=None, num_threads=None):
+    """
+    Copy C to the host in row blocks and hash each block while the next one transfers.
+
+    On CUDA devices blocks are copied on a side stream into two reusable pinned
+    buffers; on the CPU device blocks are hashed in place, so the same code path
+    can be exercised without a GPU.
+
+    Args:
+        C_torch (torch.Tensor): Result matrix on its device.
+        hash_func (callable): Hash function of the internal nodes.
+        leaf_hash_func (callable): Hash function of the rows (defaults to `hash_func`).
+        out (np.ndarray): Optional (n, n) host array receiving a copy of C.
+        block_rows (int): Rows per transferred block.
+        num_threads (int): Size of the hashing pool.
+
+    Returns:
+        tuple: (root_hash bytes, tree np.ndarray, list of per-block timings)
+    """
+    if num_threads is None:
+        num_threads = 8
+    if block_rows is None:
+        block_rows = STREAM_BLOCK_ROWS
+    if leaf_hash_func is None:
+        leaf_hash_func = hash_func
+    pool = get_hash_pool(num_threads)
+
+    n = C_torch.shape[0]
+    device = C_torch.device
+    use_cuda = device.type == "cuda"
+    tree = allocate_merkle_tree(n, hash_func().digest_size)
+    blocks = [(start, min(start + block_rows, n)) for start in range(0, n, block_rows)]
+
+    if use_cuda:
+        buffers = [
+            torch.empty((block_rows, C_torch.shape[1]), dtype=C_torch.dtype, pin_memory=True)
+            for _ in range(2)
+        ]
+        events = [None, None]
+        copy_stream = torch.cuda.Stream(device)
+        # Transfers must start only once C has been computed on the default stream
+        copy_stream.wait_stream(torch.cuda.current_stream(device))
+
+    def start_copy(block_idx):
+        if not use_cuda:
+            return
+        slot = block_idx % 2
+        start, end = blocks[block_idx]
+        with torch.cuda.stream(copy_stream):
+            buffers[slot][:end - start].copy_(C_torch[start:end], non_blocking=True)
+            events[slot] = torch.cuda.Event()
+            events[slot].record(copy_stream)
 
-    # Function to hash pairs of nodes using the specified hash function
-    def hash_pair(i):
-        left = tree[offset + i]
-        if i + 1 < num_leaves:
-            right = tree[offset + i + 1]
+    block_timings = []
+    start_copy(0)
+    for block_idx, (start, end) in enumerate(blocks):
+        slot = block_idx % 2
+        start_time_wait = time.time()
+        if use_cuda:
+            events[slot].synchronize()
+            block = buffers[slot][:end - start].numpy()
         else:
-            right = left  # Duplicate if odd number of leaves
-        return hash_func(left + right).digest()
+            block = C_torch[start:end].numpy()
+        transfer_wait = time.time() - start_time_wait
 
-    # Build the Merkle tree
-    while num_leaves > 1:
-        with ThreadPool(num_threads) as pool:
-            # Process pairs of leaves
-            new_level = pool.map(hash_pair, range(0, num_leaves, 2))
-        tree.extend(new_level)
-        offset += num_leaves
-        num_leaves = len(new_level)
+        # Queue the next transfer into the other buffer before hashing this block
+        if block_idx + 1 < len(blocks):
+            start_copy(block_idx + 1)
 
-    root_hash = tree[-1]
-    return root_hash, tree
+        start_time_hash = time.time()
+        hash_rows_into(block, tree[start:end], leaf_hash_func, pool)
+        if out is not None:
+            out[start:end] = block
+        hash_time = time.time() - start_time_hash
+        block_timings.append({"rows": end - start, "transfer_wait": transfer_wait, "hash_time": hash_time})
+
+    root_hash = build_merkle_levels(tree, n, hash_func, pool)
+    return root_hash, tree, block_timings
+
+def get_merkle_multiproof(tree, row_indices, total_leaves):
+    """
+    Build a Merkle multiproof covering several rows.
+
+    Levels are walked bottom-up and, within a level, nodes in ascending index order.
+    A sibling hash is emitted only when it can not be computed from the challenged
+    rows themselves, so shared ancestors are never sent twice.
+
+    Args:
+        tree (np.ndarray): Flat Merkle tree as built by build_merkle_tree_rows.
+        row_indices (iterable): Challenged row indices, duplicates allowed.
+        total_leaves (int): Total number of leaves in the Merkle tree.
 
-def get_merkle_proof_row(tree, row_index, total_leaves):
-    proof = []
-    idx = row_index
+    Returns:
+        tuple: (sorted unique row indices, list of sibling hashes)
+    """
+    leaf_indices = sorted(set(int(i) for i in row_indices))
+    siblings = []
+    known = leaf_indices
     num_leaves = total_leaves
     offset = 0
     while num_leaves > 1:
-        sibling_idx = idx ^ 1
-        if sibling_idx < num_leaves:
-            sibling_hash = tree[offset + sibling_idx]
-        else:
-            sibling_hash = tree[offset + idx]  # Duplicate if sibling is missing
-        proof.append(sibling_hash)
-        idx = idx // 2
+        known_set = set(known)
+        for idx in known:
+            sibling_idx = idx ^ 1
+            if sibling_idx < num_leaves and sibling_idx not in known_set:
+                siblings.append(tree[offset + sibling_idx].tobytes())
+        known = sorted(set(idx // 2 for idx in known))
         offset += num_leaves
         num_leaves = (num_leaves + 1) // 2
-    return proof
-
-def xorshift32_torch(state):
-    state = state.type(torch.int64)
-    x = state & 0xFFFFFFFF
-    x = x ^ ((x << 13) & 0xFFFFFFFF)
-    x = x ^ ((x >> 17) & 0xFFFFFFFF)
-    x = x ^ ((x << 5) & 0xFFFFFFFF)
-    x = x & 0xFFFFFFFF
+    return leaf_indices, siblings
+
+def serialize_proof_response(rows, tree, leaf_indices, total_leaves):
+    """
+    Encode the challenged rows of C and their Merkle multiproof in the binary proof response format.
+
+    Args:
+        rows (np.ndarray): Challenged rows of C, one per entry of `leaf_indices`.
+        tree (np.ndarray): Flat Merkle tree as built by build_merkle_tree_rows.
+        leaf_indices (list): Sorted, unique challenged row indices.
+        total_leaves (int): Total number of leaves in the Merkle tree.
+
+    Returns:
+        bytes: The encoded response.
+    """
+    _, siblings = get_merkle_multiproof(tree, leaf_indices, total_leaves)
+    rows = np.ascontiguousarray(rows, dtype="<f4")
+    bitmap = np.zeros(total_leaves, dtype=bool)
+    bitmap[leaf_indices] = True
+    header = PROOF_HEADER.pack(
+        PROOF_FORMAT_MAGIC, PROOF_FORMAT_VERSION, tree.shape[1], len(leaf_indices), rows.shape[1], total_leaves, len(siblings)
+    )
+    return header + np.packbits(bitmap, bitorder="little").tobytes() + rows.tobytes() + b"".join(siblings)
+
+def xorshift32_torch_(x, scratch):
+    """In-place xorshift32 on an int64 tensor of 32-bit states, using `scratch` for the shifted values."""
+    torch.bitwise_left_shift(x, 13, out=scratch)
+    x ^= scratch.bitwise_and_(0xFFFFFFFF)
+    torch.bitwise_right_shift(x, 17, out=scratch)
+    x ^= scratch.bitwise_and_(0xFFFFFFFF)
+    torch.bitwise_left_shift(x, 5, out=scratch)
+    x ^= scratch.bitwise_and_(0xFFFFFFFF)
     return x
 
-def generate_matrix_torch(s, n):
-    device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+def generate_matrix_rows_torch(s, n, row_start, row_end, device=None, out=None):
+    """
+    Generate rows [row_start, row_end) of the seeded matrix, bit-identical to the
+    same rows of generate_matrix_torch(s, n).
+
+    Scratch memory is two int64 tensors of the block size; the result is written
+    into `out` when given.
+    """
+    if device is None:
+        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
     dtype = torch.int64
 
-    # Prepare indices
-    i_indices = torch.arange(n, dtype=dtype, device=device).repeat_interleave(n)
-    j_indices = torch.arange(n, dtype=dtype, device=device).repeat(n)
+    i_indices = torch.arange(row_start, row_end, dtype=dtype, device=device).unsqueeze(1)
+    j_indices = torch.arange(n, dtype=dtype, device=device).unsqueeze(0)
 
     # Convert s to signed 64-bit integer
     s_signed = (s + 2**63) % 2**64 - 2**63
-    s_tensor = torch.tensor(s_signed, dtype=dtype, device=device)
 
-    # Modify the computation to prevent overflow
-    # Since 4294967296 mod 2^32 is 0, we can adjust the computation
-    i_mod = i_indices % (2**32)
-    states = (s_tensor + i_mod + j_indices) & 0xFFFFFFFF
+    # Since 4294967296 mod 2^32 is 0, i can be reduced modulo 2^32 to prevent overflow
+    states = (i_indices % (2**32) + s_signed) + j_indices
+    states &= 0xFFFFFFFF
+    scratch = torch.empty_like(states)
 
     for _ in range(10):
-        states = xorshift32_torch(states)
+        xorshift32_torch_(states, scratch)
+    del scratch
 
-    matrix = (states.float() / float(0xFFFFFFFF)).reshape(n, n)
+    if out is None:
+        out = torch.empty((row_end - row_start, n), dtype=torch.float32, device=device)
+    out.copy_(states)
+    out /= float(0xFFFFFFFF)
+    return out
+
+def generate_matrix_torch(s, n, device=None, block_elements=GENERATION_BLOCK_ELEMENTS):
+    """
+    Generate the n x n seeded matrix in row blocks of about `block_elements` values,
+    so peak scratch memory stays bounded regardless of n.
+    """
+    if device is None:
+        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+    matrix = torch.empty((n, n), dtype=torch.float32, device=device)
+    block_rows = max(1, block_elements // max(n, 1))
+    for start in range(0, n, block_rows):
+        end = min(start + block_rows, n)
+        generate_matrix_rows_torch(s, n, start, end, device, out=matrix[start:end])
     return matrix
 
-def run_benchmark():
-    # Detect number of GPUs
-    num_gpus = torch.cuda.device_count()
+def summarize_times(times):
+    """Median, 10th and 90th percentile of the trial times, in seconds."""
+    p10, median, p90 = np.percentile(times, [10, 50, 90])
+    return {"median": float(median), "p10": float(p10), "p90": float(p90)}
 
-    # Estimate available VRAM
-    estimated_vram = estimate_vram_size(buffer_factor=1.0, precision="fp16")
+def benchmark_results(device_type="cuda", warmup=BENCHMARK_WARMUP, trials=BENCHMARK_TRIALS):
+    """
+    Benchmark FP16 and FP32 matrix multiplication on every GPU.
 
-    # Adjust matrix sizes
-    matrix_size_fp16 = adjust_matrix_size(estimated_vram, element_size=2, buffer_factor=1.0)
-    matrix_size_fp32 = adjust_matrix_size(estimated_vram, element_size=4, buffer_factor=0.5)
+    Each GPU runs `warmup` untimed then `trials` timed multiplications per precision,
+    all GPUs concurrently, at sizes capped to BENCHMARK_MAX_SIZE. The FP32 multiplication
+    is also timed at its full size derived from the usable VRAM ("fp32_full"), which the
+    validator uses as the time budget of the Merkle challenge. The top-level timings are
+    those of the slowest GPU, which bounds the whole host.
 
-    # Run benchmarks
-    elapsed_time_fp16 = benchmark_matrix_multiplication(matrix_size_fp16, precision="fp16")
-    elapsed_time_fp32 = benchmark_matrix_multiplication(matrix_size_fp32, precision="fp32")
+    Returns:
+        dict: Number of GPUs, VRAM figures in GB and per-device memory, matrix sizes,
+        timing summaries and per-GPU results.
+    """
+    memory = estimate_vram(device_type)
+    usable_vram = memory["usable_vram"]
+    if device_type == "cuda":
+        num_gpus = torch.cuda.device_count()
+        # Adjust matrix sizes
+        full_size_fp32 = adjust_matrix_size(usable_vram, element_size=4, buffer_factor=0.5)
+        matrix_size_fp16 = min(adjust_matrix_size(usable_vram, element_size=2, buffer_factor=1.0), BENCHMARK_MAX_SIZE)
+        matrix_size_fp32 = min(full_size_fp32, BENCHMARK_MAX_SIZE)
+        gpu_names = [torch.cuda.get_device_name(i) for i in range(num_gpus)]
+    else:
+        num_gpus = 1
+        matrix_size_fp16 = matrix_size_fp32 = full_size_fp32 = BENCHMARK_CPU_SIZE
+        gpu_names = ["cpu"]
+
+    def benchmark_gpu(gpu_id):
+        device = get_device(gpu_id, device_type)
+        times_fp16 = benchmark_matrix_multiplication(matrix_size_fp16, "fp16", device, warmup, trials)
+        times_fp32 = benchmark_matrix_multiplication(matrix_size_fp32, "fp32", device, warmup, trials)
+        if full_size_fp32 != matrix_size_fp32:
+            if device.type == "cuda":
+                # Hand the cached capped matrices back before allocating the full-size ones
+                torch.cuda.empty_cache()
+            times_fp32_full = benchmark_matrix_multiplication(
+                full_size_fp32, "fp32", device, BENCHMARK_FULL_SIZE_WARMUP, BENCHMARK_FULL_SIZE_TRIALS
+            )
+        else:
+            times_fp32_full = times_fp32
+        return {
+            "gpu_id": gpu_id,
+            "name": gpu_names[gpu_id],
+            "fp16": summarize_times(times_fp16),
+            "fp32": summarize_times(times_fp32),
+            "fp32_full": summarize_times(times_fp32_full),
+        }
 
+    # One thread per GPU, so the benchmark takes as long as the slowest GPU rather than the sum of all
+    with ThreadPoolExecutor(max_workers=max(num_gpus, 1)) as executor:
+        gpus = list(executor.map(benchmark_gpu, range(num_gpus)))
+
+    slowest = max(gpus, key=lambda gpu: gpu["fp32"]["median"]) if gpus else None
+    return {
+        "num_gpus": num_gpus,
+        "vram": memory["vram"],
+        "usable_vram": usable_vram,
+        "devices": memory["devices"],
+        "size_fp16": matrix_size_fp16,
+        "size_fp32": matrix_size_fp32,
+        "size_fp32_full": full_size_fp32,
+        "warmup": warmup,
+        "trials": trials,
+        "fp16": slowest["fp16"] if slowest else None,
+        "fp32": slowest["fp32"] if slowest else None,
+        "fp32_full": max((gpu["fp32_full"] for gpu in gpus), key=lambda times: times["median"], default=None),
+        "gpus": gpus,
+    }
+
+def benchmark_output(device_type="cuda", warmup=BENCHMARK_WARMUP, trials=BENCHMARK_TRIALS):
+    """Benchmark results as the JSON payload expected by the validator's `parse_benchmark_output`."""
+    return json.dumps(benchmark_results(device_type, warmup, trials))
+
+def run_benchmark(device_type="cuda"):
     # Output results
-    print(f"{num_gpus} {estimated_vram:.2f} {matrix_size_fp16} {elapsed_time_fp16:.6f} {matrix_size_fp32} {elapsed_time_fp32:.6f}")
+    print(benchmark_output(device_type))
+
+def benchmark_matrix_multiplication(size, precision="fp16", device=None, warmup=BENCHMARK_WARMUP, trials=BENCHMARK_TRIALS):
+    """
+    Time `trials` multiplications of two size x size matrices, after `warmup` untimed ones.
+
+    CUDA trials are timed with device events, CPU trials with perf_counter.
 
-def benchmark_matrix_multiplication(size, precision="fp16"):
+    Returns:
+        list: Elapsed time of each trial in seconds.
+    """
+    device = device or torch.device("cuda")
     dtype = torch.float16 if precision == "fp16" else torch.float32
-    A = torch.randn(size, size, dtype=dtype, device="cuda")
-    B = torch.randn(size, size, dtype=dtype, device="cuda")
+    A = torch.randn(size, size, dtype=dtype, device=device)
+    B = torch.randn(size, size, dtype=dtype, device=device)
+    C = torch.empty(size, size, dtype=dtype, device=device)
+
+    for _ in range(warmup):
+        torch.matmul(A, B, out=C)
+    synchronize(device)
+
+    times = []
+    for _ in range(trials):
+        if device.type == "cuda":
+            start_event = torch.cuda.Event(enable_timing=True)
+            end_event = torch.cuda.Event(enable_timing=True)
+            start_event.record()
+            torch.matmul(A, B, out=C)
+            end_event.record()
+            end_event.synchronize()
+            times.append(start_event.elapsed_time(end_event) / 1000)  # Milliseconds to seconds
+        else:
+            start_time = time.perf_counter()
+            torch.matmul(A, B, out=C)
+            times.append(time.perf_counter() - start_time)
+    del A, B, C
+    return times
+
+def get_device(gpu_id, device_type="cuda"):
+    """Return the torch device used for `gpu_id`, selecting it as current on CUDA."""
+    if device_type == "cuda":
+        torch.cuda.set_device(gpu_id)
+        return torch.device(f'cuda:{gpu_id}')
+    return torch.device('cpu')
 
-    torch.cuda.synchronize()
-    start_time = time.time()
-    torch.matmul(A, B)
-    torch.cuda.synchronize()
-    elapsed_time = time.time() - start_time
-    return elapsed_time
+def synchronize(device):
+    if device.type == "cuda":
+        torch.cuda.synchronize(device)
+
+def multiply_row_blocks(A_torch, B_torch, block_rows=RECOMPUTE_BLOCK_ROWS):
+    """Compute A @ B one block of rows at a time, matching the shapes used by recompute_rows."""
+    n = A_torch.shape[0]
+    C_torch = torch.empty((n, B_torch.shape[1]), dtype=A_torch.dtype, device=A_torch.device)
+    for start in range(0, n, block_rows):
+        end = min(start + block_rows, n)
+        torch.matmul(A_torch[start:end], B_torch, out=C_torch[start:end])
+    return C_torch
+
+def recompute_rows(s_A, s_B, n, leaf_indices, device, block_rows=RECOMPUTE_BLOCK_ROWS):
+    """
+    Recompute rows of C = A @ B from the seeds, one row block at a time.
+
+    Only B and the row blocks of A containing challenged rows are generated.
+
+    Returns:
+        np.ndarray: (len(leaf_indices), n) float32 rows, in the order of `leaf_indices`.
+    """
+    B_torch = generate_matrix_torch(s_B, n, device)
+    rows = np.empty((len(leaf_indices), n), dtype=np.float32)
+    block_starts = sorted(set(i - i % block_rows for i in leaf_indices))
+    for start in block_starts:
+        end = min(start + block_rows, n)
+        A_block = generate_matrix_rows_torch(s_A, n, start, end, device)
+        C_block = torch.matmul(A_block, B_torch).cpu().numpy()
+        for k, i in enumerate(leaf_indices):
+            if start <= i < end:
+                rows[k] = C_block[i - start]
+        del A_block, C_block
+    del B_torch
+    return rows
 
-def process_gpu(gpu_id, s_A, s_B, n):
+def compute_gpu(gpu_id, s_A, s_B, n, hash_algorithm="sha256", device_type="cuda", low_memory=False, C_out=None):
     """
-    Process computations for a single GPU.
+    Generate A and B, compute C = A @ B and build the Merkle tree over the rows of C on a single GPU.
 
     Args:
         gpu_id (int): ID of the GPU to use.
         s_A (int): Seed for matrix A.
         s_B (int): Seed for matrix B.
         n (int): Size of the matrices.
+        hash_algorithm (str): Hash backend used for the Merkle tree.
+        device_type (str): 'cuda', or 'cpu' to run without a GPU.
+        low_memory (bool): Multiply in row blocks so proof mode can recompute challenged rows.
+        C_out (np.ndarray): Optional (n, n) host array receiving C.
 
     Returns:
-        tuple: (root_hash_result, gpu_timing_result)
+        tuple: (root_hash bytes, merkle_tree np.ndarray, gpu_timing dict)
     """
-    try:
-        # Set the current device
-        torch.cuda.set_device(gpu_id)
-        device = torch.device(f'cuda:{gpu_id}')
-        
-        # Initialize timing dictionary
-        gpu_timing = {}
+    # Set the current device
+    device = get_device(gpu_id, device_type)
 
-        # Step 2: Generate A and B with received seeds using PRNG
-        start_time_generation = time.time()
+    # Initialize timing dictionary
+    gpu_timing = {}
 
-        # Clear cache before allocation
+    # Step 2: Generate A and B with received seeds using PRNG
+    start_time_generation = time.time()
+
+    # Clear cache before allocation
+    if device.type == "cuda":
         torch.cuda.empty_cache()
 
-        # Generate A and B matrices
-        A_torch = generate_matrix_torch(s_A, n)
-        B_torch = generate_matrix_torch(s_B, n)
+    # Generate A and B matrices
+    A_torch = generate_matrix_torch(s_A, n, device)
+    B_torch = generate_matrix_torch(s_B, n, device)
 
-        end_time_generation = time.time()
-        generation_time = end_time_generation - start_time_generation
-        gpu_timing['generation_time'] = generation_time
-        gpu_timing['n'] = n
+    end_time_generation = time.time()
+    generation_time = end_time_generation - start_time_generation
+    gpu_timing['generation_time'] = generation_time
+    gpu_timing['n'] = n
 
-        # Step 3: Compute C on GPU
-        start_time_multiplication = time.time()
+    # Step 3: Compute C on GPU
+    start_time_multiplication = time.time()
+    if low_memory:
+        C_torch = multiply_row_blocks(A_torch, B_torch)
+    else:
         C_torch = torch.matmul(A_torch, B_torch)
-        torch.cuda.synchronize(device)  # Ensure computation is finished
-        end_time_multiplication = time.time()
-        multiplication_time = end_time_multiplication - start_time_multiplication
-        gpu_timing['multiplication_time'] = multiplication_time
-        print(f"GPU {gpu_id}: Matrix multiplication time on GPU: {multiplication_time:.2f} seconds")
-
-        # Step 4: Move C back to CPU for Merkle tree construction
-        start_time_transfer_back = time.time()
-        C = C_torch.cpu().numpy()
-        end_time_transfer_back = time.time()
-        transfer_back_time = end_time_transfer_back - start_time_transfer_back
-        gpu_timing['transfer_back_time'] = transfer_back_time
-        # Optional: Uncomment to log transfer time
-        # print(f"GPU {gpu_id}: Data transfer from GPU time: {transfer_back_time:.2f} seconds")
-
-        # Step 5: Construct Merkle tree over rows of C
-        start_time_merkle = time.time()
-        root_hash, merkle_tree = build_merkle_tree_rows(C)
-        end_time_merkle = time.time()
-        merkle_tree_time = end_time_merkle - start_time_merkle
-        gpu_timing['merkle_tree_time'] = merkle_tree_time
-        # Optional: Uncomment to log Merkle tree construction time and root hash
-        # print(f"GPU {gpu_id}: Merkle tree over rows construction time: {merkle_tree_time:.2f} seconds")
-        # print(f"GPU {gpu_id}: Root hash: {root_hash.hex()}")
+    synchronize(device)  # Ensure computation is finished
+    end_time_multiplication = time.time()
+    multiplication_time = end_time_multiplication - start_time_multiplication
+    gpu_timing['multiplication_time'] = multiplication_time
+    print(f"GPU {gpu_id}: Matrix multiplication time on GPU: {multiplication_time:.2f} seconds")
+    del A_torch, B_torch
+
+    # Step 4-5: Stream C back to the host in row blocks, hashing each block while the next transfers
+    start_time_merkle = time.time()
+    hash_func, leaf_hash_func = get_hash_backend(hash_algorithm)
+    root_hash, merkle_tree, block_timings = stream_merkle_tree_rows(
+        C_torch, hash_func=hash_func, leaf_hash_func=leaf_hash_func, out=C_out
+    )
+    end_time_merkle = time.time()
+    gpu_timing['transfer_back_time'] = sum(block['transfer_wait'] for block in block_timings)
+    gpu_timing['merkle_tree_time'] = end_time_merkle - start_time_merkle - gpu_timing['transfer_back_time']
+    gpu_timing['hash_algorithm'] = hash_algorithm
+    gpu_timing['blocks'] = block_timings
+    # Optional: Uncomment to log Merkle tree construction time and root hash
+    # print(f"GPU {gpu_id}: Merkle tree over rows construction time: {gpu_timing['merkle_tree_time']:.2f} seconds")
+    # print(f"GPU {gpu_id}: Root hash: {root_hash.hex()}")
+
+    # Free GPU memory
+    del C_torch
+    if device.type == "cuda":
+        torch.cuda.empty_cache()
+    gc.collect()
+
+    return root_hash, merkle_tree, gpu_timing
+
+def process_gpu(gpu_id, s_A, s_B, n, hash_algorithm="sha256", device_type="cuda", low_memory=False):
+    """
+    Process computations for a single GPU and persist the results to shared memory.
+
+    Args:
+        gpu_id (int): ID of the GPU to use.
+        s_A (int): Seed for matrix A.
+        s_B (int): Seed for matrix B.
+        n (int): Size of the matrices.
+        hash_algorithm (str): Hash backend used for the Merkle tree.
+        device_type (str): 'cuda', or 'cpu' to run without a GPU.
+        low_memory (bool): Persist only the Merkle tree; proof mode recomputes challenged rows.
+
+    Returns:
+        tuple: (root_hash_result, gpu_timing_result)
+    """
+    try:
+        # Unless in low-memory mode, C is written straight into its shared memory file for later proof generation
+        C_path = f'/dev/shm/C_gpu_{gpu_id}.npy'
+        if low_memory:
+            C = None
+            if os.path.exists(C_path):
+                os.remove(C_path)  # Never serve proofs from a stale matrix
+        else:
+            C = np.lib.format.open_memmap(C_path, mode='w+', dtype=np.float32, shape=(n, n))
+
+        root_hash, merkle_tree, gpu_timing = compute_gpu(
+            gpu_id, s_A, s_B, n, hash_algorithm, device_type, low_memory, C_out=C
+        )
 
         # Save root hash and timings
         root_hash_result = (gpu_id, root_hash.hex())
         gpu_timing_result = (gpu_id, gpu_timing)
 
-        # Save Merkle tree and C for later proof generation
+        # Save Merkle tree for later proof generation
         np.save(f'/dev/shm/merkle_tree_gpu_{gpu_id}.npy', merkle_tree)
-        np.save(f'/dev/shm/C_gpu_{gpu_id}.npy', C)
-
-        # Free GPU memory
-        del A_torch, B_torch, C_torch, C, merkle_tree
-        torch.cuda.empty_cache()
-        gc.collect()
+        if C is not None:
+            C.flush()
+        del C, merkle_tree
 
         return root_hash_result, gpu_timing_result
 
@@ -292,31 +791,48 @@ def process_gpu(gpu_id, s_A, s_B, n):
         print(f"Error processing GPU {gpu_id}: {e}")
         return None, None
 
-def run_compute():
+def resolve_executor(executor, device_type, num_gpus):
+    """'auto' runs one process per GPU on multi-GPU CUDA hosts, and threads otherwise."""
+    if executor == "auto":
+        return "process" if device_type == "cuda" and num_gpus > 1 else "thread"
+    return executor
+
+def create_gpu_executor(executor, num_gpus):
+    """
+    Executor running one task per GPU.
+
+    Threads share one GIL, so the hashing and NumPy work of many GPUs runs almost
+    serially; spawned processes give each GPU its own CUDA context, hashing threads and GIL.
+    """
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=num_gpus, mp_context=multiprocessing.get_context("spawn"))
+    return ThreadPoolExecutor(max_workers=num_gpus)
+
+def run_compute(device_type="cuda", executor="auto"):
     """
     Run compute operations on all available GPUs in parallel.
     """
-    if not torch.cuda.is_available():
+    if device_type == "cuda" and not torch.cuda.is_available():
         print("Error: No GPU detected.")
         sys.exit(1)
 
     # Detect number of GPUs
-    num_gpus = torch.cuda.device_count()
+    num_gpus = torch.cuda.device_count() if device_type == "cuda" else 1
 
     # Read n and seeds
-    n, seeds = get_seeds()
+    n, seeds, hash_algorithm, low_memory = get_seeds()
 
     # Initialize lists to store root hashes and timings per GPU
     root_hashes = []
     gpu_timings = []
 
-    # Use ThreadPoolExecutor to parallelize GPU tasks
-    with ThreadPoolExecutor(max_workers=num_gpus) as executor:
+    # Parallelize GPU tasks; the matrices and Merkle trees go through /dev/shm files, only hashes and timings are returned
+    with create_gpu_executor(resolve_executor(executor, device_type, num_gpus), num_gpus) as pool:
         # Submit tasks for each GPU
         futures = []
         for gpu_id in range(num_gpus):
             s_A, s_B = seeds[gpu_id]
-            futures.append(executor.submit(process_gpu, gpu_id, s_A, s_B, n))
+            futures.append(pool.submit(process_gpu, gpu_id, s_A, s_B, n, hash_algorithm, device_type, low_memory))
         
         for future in as_completed(futures):
             root_hash_result, gpu_timing_result = future.result()
@@ -329,60 +845,379 @@ def run_compute():
     print(f"Root hashes: {json.dumps(root_hashes)}")
     print(f"Timings: {json.dumps(gpu_timings)}")
 
-def run_proof_gpu(gpu_id, indices, num_gpus):
-    # Set the GPU device
-    torch.cuda.set_device(gpu_id)
-    
-    # Load data for the specific GPU
-    gpu_indices = indices[gpu_id]
-    merkle_tree = np.load(f'/dev/shm/merkle_tree_gpu_{gpu_id}.npy', allow_pickle=True)
-    C = np.load(f'/dev/shm/C_gpu_{gpu_id}.npy')
-    
+def generate_proof_response(gpu_id, gpu_indices, merkle_tree, C=None, device=None, seeds=None, n=None,
+                            hash_algorithm="sha256", low_memory=False):
+    """
+    Build the binary proof response of a single GPU for its challenge indices.
+
+    Rows are read from C, or recomputed from the seeds in low-memory mode and
+    checked against the committed leaves.
+
+    Returns:
+        bytes: The encoded response.
+
+    Raises:
+        RuntimeError: If a recomputed row does not match its committed leaf, no proof is sent.
+    """
+    leaf_indices = sorted(set(int(i) for i, j in gpu_indices))
+
     # Start proof generation
     start_time_proof = time.time()
-    responses = {'rows': [], 'proofs': [], 'indices': gpu_indices}
-    total_leaves = C.shape[0]
-    
-    for idx, (i, j) in enumerate(gpu_indices):
-        row = C[i, :]
-        proof = get_merkle_proof_row(merkle_tree, i, total_leaves)
-        responses['rows'].append(row)
-        responses['proofs'].append(proof)
-    
+    if low_memory:
+        # Recompute the challenged rows from the seeds and check them against the committed leaves
+        s_A, s_B = seeds[gpu_id]
+        rows = recompute_rows(s_A, s_B, n, leaf_indices, device)
+        _, leaf_hash_func = get_hash_backend(hash_algorithm)
+        mismatched = [
+            i for row, i in zip(rows, leaf_indices)
+            if leaf_hash_func(row.tobytes()).digest() != merkle_tree[i].tobytes()
+        ]
+        if mismatched:
+            raise RuntimeError(
+                f"GPU {gpu_id}: Recomputed rows {mismatched} do not match the committed Merkle tree."
+            )
+    else:
+        n = C.shape[0]
+        rows = C[leaf_indices, :]
+    response = serialize_proof_response(rows, merkle_tree, leaf_indices, n)
     end_time_proof = time.time()
     proof_time = end_time_proof - start_time_proof
     print(f"GPU {gpu_id}: Proof generation time: {proof_time:.2f} seconds")
-    
+    return response
+
+def run_proof_gpu(gpu_id, indices, num_gpus, device_type="cuda", seeds=None, n=None,
+                  hash_algorithm="sha256", low_memory=False):
+    # Set the GPU device
+    device = get_device(gpu_id, device_type)
+
+    # Load data for the specific GPU
+    merkle_tree = np.load(f'/dev/shm/merkle_tree_gpu_{gpu_id}.npy', mmap_mode='r')
+    C = None if low_memory else np.load(f'/dev/shm/C_gpu_{gpu_id}.npy', mmap_mode='r')
+
+    response = generate_proof_response(
+        gpu_id, indices[gpu_id], merkle_tree, C, device, seeds, n, hash_algorithm, low_memory
+    )
+
     # Save responses to shared memory
-    np.save(f'/dev/shm/responses_gpu_{gpu_id}.npy', responses)
+    with open(f'/dev/shm/responses_gpu_{gpu_id}.bin', 'wb') as f:
+        f.write(response)
 
-def run_proof():
+def run_proof(device_type="cuda", executor="auto"):
     # Get the challenge indices
     indices = get_challenge_indices()
-    num_gpus = torch.cuda.device_count()
+    n, seeds, hash_algorithm, low_memory = get_seeds()
+    num_gpus = torch.cuda.device_count() if device_type == "cuda" else 1
     
-    # Use ThreadPoolExecutor for parallel GPU processing
-    with ThreadPoolExecutor(max_workers=num_gpus) as executor:
+    # Parallel GPU processing, responses are written to /dev/shm by each task
+    with create_gpu_executor(resolve_executor(executor, device_type, num_gpus), num_gpus) as pool:
         futures = [
-            executor.submit(run_proof_gpu, gpu_id, indices, num_gpus)
+            pool.submit(run_proof_gpu, gpu_id, indices, num_gpus, device_type, seeds, n, hash_algorithm, low_memory)
             for gpu_id in range(num_gpus)
         ]
-        # Wait for all threads to complete
+        # Wait for all tasks to complete
         for future in futures:
-            future.result()  # To raise any exceptions that occurred in the threads
+            future.result()  # To raise any exceptions that occurred in the tasks
+
+def gpu_worker_main(gpu_id, device_type, connection):
+    """
+    Serve the compute and proof requests of one GPU in its own process.
+
+    C and the Merkle tree stay resident in the worker between the two phases. Proof
+    responses are handed back through a shared memory block, which the parent reads
+    and unlinks; the block is unregistered from the resource tracker here so that
+    the parent is its only owner.
+    """
+    merkle_tree = None
+    C = None
+    seeds = None
+    n = None
+    hash_algorithm = "sha256"
+    low_memory = False
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        command = request.get("cmd")
+        if command == "shutdown":
+            break
+        try:
+            if command == "compute":
+                merkle_tree = C = None
+                gc.collect()
+                seeds = {gpu_id: tuple(request["seeds"])}
+                n = request["n"]
+                hash_algorithm = request["hash_algorithm"]
+                low_memory = request["low_memory"]
+                C = None if low_memory else np.empty((n, n), dtype=np.float32)
+                s_A, s_B = seeds[gpu_id]
+                root_hash, merkle_tree, gpu_timing = compute_gpu(
+                    gpu_id, s_A, s_B, n, hash_algorithm, device_type, low_memory, C_out=C
+                )
+                connection.send((True, (root_hash.hex(), gpu_timing)))
+            elif command == "proof":
+                if merkle_tree is None:
+                    raise RuntimeError(f"GPU {gpu_id}: No Merkle tree, run compute first.")
+                device = get_device(gpu_id, device_type)
+                response = generate_proof_response(
+                    gpu_id, request["indices"], merkle_tree, C, device, seeds, n, hash_algorithm, low_memory
+                )
+                block = shared_memory.SharedMemory(create=True, size=max(len(response), 1))
+                block.buf[:len(response)] = response
+                # The tracker would otherwise count the block twice, once for this process and
+                # once for the parent attaching it, and unlink it again after the parent did
+                resource_tracker.unregister(block._name, "shared_memory")
+                connection.send((True, (block.name, len(response))))
+                block.close()
+            else:
+                raise ValueError(f"Unknown GPU worker command: {command}")
+        except Exception as e:
+            connection.send((False, str(e)))
+
+class GpuWorker:
+    """Parent-side handle of a `gpu_worker_main` process."""
+
+    def __init__(self, gpu_id, device_type, context):
+        self.gpu_id = gpu_id
+        self.connection, worker_connection = context.Pipe()
+        self.process = context.Process(
+            target=gpu_worker_main, args=(gpu_id, device_type, worker_connection), daemon=True
+        )
+        self.process.start()
+        worker_connection.close()
+
+    def send(self, request):
+        self.connection.send(request)
+
+    def receive(self):
+        try:
+            ok, result = self.connection.recv()
+        except EOFError as e:
+            raise RuntimeError(f"GPU {self.gpu_id}: Worker process exited.") from e
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+    def receive_payload(self):
+        """Receive a response handed back through shared memory."""
+        name, size = self.receive()
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            return bytes(block.buf[:size])
+        finally:
+            block.close()
+            block.unlink()
+
+    def close(self, timeout=10):
+        try:
+            self.connection.send({"cmd": "shutdown"})
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.connection.close()
+
+# Agent mode frames (little-endian): JSON length (I), binary payload length (I), JSON message, binary payload
+AGENT_FRAME_HEADER = struct.Struct("<II")
+
+def read_frame(stream):
+    """Read one agent frame, returns (message, payload) or (None, None) on end of stream."""
+    header = stream.read(AGENT_FRAME_HEADER.size)
+    if len(header) < AGENT_FRAME_HEADER.size:
+        return None, None
+    message_size, payload_size = AGENT_FRAME_HEADER.unpack(header)
+    message = json.loads(stream.read(message_size).decode())
+    payload = stream.read(payload_size) if payload_size else b""
+    return message, payload
+
+def write_frame(stream, message, payload=b""):
+    data = json.dumps(message).encode()
+    stream.write(AGENT_FRAME_HEADER.pack(len(data), len(payload)) + data + payload)
+    stream.flush()
+
+class MinerAgent:
+    """
+    Serves every PoG phase from a single long-lived process.
+
+    Matrices C and Merkle trees stay resident between the compute and proof
+    phases, and torch/CUDA are initialized only once. In process mode they live
+    in one long-lived worker process per GPU instead (see `gpu_worker_main`).
+    """
+
+    def __init__(self, device_type="cuda", executor="auto"):
+        self.device_type = device_type
+        self.executor = resolve_executor(executor, device_type, self.num_gpus)
+        self.n = None
+        self.seeds = {}
+        self.hash_algorithm = "sha256"
+        self.low_memory = False
+        self.trees = {}
+        self.matrices = {}
+        self.workers = None
+        self.computed = set()
+        if self.executor == "process":
+            # Workers import torch while the validator runs gpu_info and the benchmark
+            self.get_workers()
+
+    @property
+    def num_gpus(self):
+        return torch.cuda.device_count() if self.device_type == "cuda" else 1
+
+    def handle(self, message):
+        command = message.get("cmd")
+        if command == "gpu_info":
+            return collect_gpu_info(), b""
+        if command == "benchmark":
+            warmup = int(message.get("warmup", BENCHMARK_WARMUP))
+            trials = int(message.get("trials", BENCHMARK_TRIALS))
+            return {"output": benchmark_output(self.device_type, warmup, trials)}, b""
+        if command == "compute":
+            return self.compute(message), b""
+        if command == "proof":
+            return self.proof(message)
+        raise ValueError(f"Unknown command: {command}")
+
+    def compute_gpu(self, gpu_id):
+        s_A, s_B = self.seeds[gpu_id]
+        C = None if self.low_memory else np.empty((self.n, self.n), dtype=np.float32)
+        root_hash, merkle_tree, gpu_timing = compute_gpu(
+            gpu_id, s_A, s_B, self.n, self.hash_algorithm, self.device_type, self.low_memory, C_out=C
+        )
+        self.trees[gpu_id] = merkle_tree
+        self.matrices[gpu_id] = C
+        return (gpu_id, root_hash.hex()), (gpu_id, gpu_timing)
+
+    def compute(self, message):
+        if self.device_type == "cuda" and not torch.cuda.is_available():
+            raise RuntimeError("No GPU detected.")
+        self.n = int(message["n"])
+        self.seeds = {int(gpu_id): (int(s_A), int(s_B)) for gpu_id, (s_A, s_B) in message["seeds"].items()}
+        self.hash_algorithm = message.get("hash_algorithm", "sha256")
+        self.low_memory = bool(message.get("low_memory", False))
+        self.trees.clear()
+        self.matrices.clear()
+        self.computed.clear()
+        gc.collect()
+
+        root_hashes = []
+        gpu_timings = []
+        # GPUs that failed are reported to the validator rather than silently left out
+        errors = []
+        if self.executor == "process":
+            workers = self.get_workers()
+            for gpu_id, worker in enumerate(workers):
+                worker.send({
+                    "cmd": "compute", "seeds": self.seeds[gpu_id], "n": self.n,
+                    "hash_algorithm": self.hash_algorithm, "low_memory": self.low_memory,
+                })
+            for gpu_id, worker in enumerate(workers):
+                try:
+                    root_hash, gpu_timing = worker.receive()
+                except Exception as e:
+                    print(f"Error processing GPU {gpu_id}: {e}")
+                    errors.append((gpu_id, str(e)))
+                    continue
+                self.computed.add(gpu_id)
+                root_hashes.append((gpu_id, root_hash))
+                gpu_timings.append((gpu_id, gpu_timing))
+            return {"root_hashes": root_hashes, "timings": gpu_timings, "errors": errors}
+
+        with ThreadPoolExecutor(max_workers=self.num_gpus) as executor:
+            futures = {executor.submit(self.compute_gpu, gpu_id): gpu_id for gpu_id in range(self.num_gpus)}
+            for future in as_completed(futures):
+                try:
+                    root_hash_result, gpu_timing_result = future.result()
+                except Exception as e:
+                    print(f"Error processing GPU {futures[future]}: {e}")
+                    errors.append((futures[future], str(e)))
+                    continue
+                self.computed.add(root_hash_result[0])
+                root_hashes.append(root_hash_result)
+                gpu_timings.append(gpu_timing_result)
+        return {"root_hashes": root_hashes, "timings": gpu_timings, "errors": errors}
+
+    def get_workers(self):
+        """Start the GPU worker processes on first use, and again if one of them died."""
+        if self.workers and not all(worker.process.is_alive() for worker in self.workers):
+            self.close()
+        if not self.workers:
+            context = multiprocessing.get_context("spawn")
+            self.workers = [GpuWorker(gpu_id, self.device_type, context) for gpu_id in range(self.num_gpus)]
+        return self.workers
+
+    def close(self):
+        if self.workers:
+            for worker in self.workers:
+                worker.close()
+        self.workers = None
+
+    def proof_gpu(self, gpu_id, gpu_indices):
+        device = get_device(gpu_id, self.device_type)
+        return generate_proof_response(
+            gpu_id, gpu_indices, self.trees[gpu_id], self.matrices[gpu_id], device,
+            self.seeds, self.n, self.hash_algorithm, self.low_memory
+        )
+
+    def proof(self, message):
+        indices = {int(gpu_id): [tuple(idx) for idx in idx_list] for gpu_id, idx_list in message["indices"].items()}
+        gpu_ids = [gpu_id for gpu_id in sorted(indices) if gpu_id in self.computed]
+        if self.executor == "process":
+            for gpu_id in gpu_ids:
+                self.workers[gpu_id].send({"cmd": "proof", "indices": indices[gpu_id]})
+            responses = [self.workers[gpu_id].receive_payload() for gpu_id in gpu_ids]
+        else:
+            with ThreadPoolExecutor(max_workers=max(len(gpu_ids), 1)) as executor:
+                responses = list(executor.map(lambda gpu_id: self.proof_gpu(gpu_id, indices[gpu_id]), gpu_ids))
+        layout = [(gpu_id, len(response)) for gpu_id, response in zip(gpu_ids, responses)]
+        return {"responses": layout}, b"".join(responses)
+
+def run_agent(device_type="cuda", executor="auto"):
+    """
+    Serve length-prefixed JSON/binary requests on stdin/stdout until shutdown or end of input.
+    """
+    protocol_in = sys.stdin.buffer
+    # Keep the real stdout for the protocol and send every other print to stderr
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    sys.stdout.flush()
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    agent = MinerAgent(device_type, executor)
+    try:
+        while True:
+            message, _ = read_frame(protocol_in)
+            if message is None:
+                break
+            if message.get("cmd") == "shutdown":
+                write_frame(protocol_out, {"ok": True, "result": None})
+                break
+            try:
+                result, payload = agent.handle(message)
+                write_frame(protocol_out, {"ok": True, "result": result}, payload)
+            except Exception as e:
+                write_frame(protocol_out, {"ok": False, "error": str(e)})
+    finally:
+        agent.close()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Miner script for GPU proof.')
     parser.add_argument('--mode', type=str, default='benchmark', 
-                        choices=['benchmark', 'compute', 'proof', 'gpu_info'],
-                        help='Mode to run: benchmark, compute, proof, or gpu_info')
+                        choices=['benchmark', 'compute', 'proof', 'gpu_info', 'agent'],
+                        help='Mode to run: benchmark, compute, proof, gpu_info, or agent to serve every mode over stdin/stdout')
+    parser.add_argument('--device', type=str, default='cuda', choices=['cuda', 'cpu'],
+                        help='Device for benchmark, compute and proof modes; cpu runs a single simulated GPU')
+    parser.add_argument('--executor', type=str, default='auto', choices=['auto', 'thread', 'process'],
+                        help='Run each GPU of compute and proof modes in a thread or in its own process; '
+                             'auto uses processes on multi-GPU hosts')
     args = parser.parse_args()
 
     if args.mode == 'benchmark':
-        run_benchmark()
+        run_benchmark(args.device)
     elif args.mode == 'compute':
-        run_compute()
+        run_compute(args.device, args.executor)
     elif args.mode == 'proof':
-        run_proof()
+        run_proof(args.device, args.executor)
     elif args.mode == 'gpu_info':
         get_gpu_info()
+    elif args.mode == 'agent':
+        run_agent(args.device, args.executor)
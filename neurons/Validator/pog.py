@@ -1,4 +1,4 @@
-import paramiko
+import asyncio
 import hashlib
 import numpy as np
 import os
@@ -6,11 +6,49 @@ import time
 import blake3
 import secrets  # For secure random seed generation
 import json
-import tempfile
+import struct
 import yaml
 import torch
 import bittensor as bt
 
+from neurons.Validator.prng import generate_prng_block
+
+# Binary proof response format, see serialize_proof_response in the miner script
+PROOF_FORMAT_MAGIC = b"PoGR"
+PROOF_FORMAT_VERSION = 2
+PROOF_HEADER = struct.Struct("<4sHHIIII")
+
+# Hash backends for the PoG Merkle trees, must match HASH_BACKENDS in the miner script
+HASH_BACKENDS = {
+    "sha256": hashlib.sha256,
+    "blake3": blake3.blake3,
+}
+DEFAULT_HASH_ALGORITHM = "sha256"
+
+def get_hash_backend(name):
+    """
+    Return the hash function registered under `name`.
+    """
+    if name not in HASH_BACKENDS:
+        raise ValueError(f"Unsupported hash algorithm: {name}")
+    return HASH_BACKENDS[name]
+
+def negotiate_hash_algorithm(preferred, miner_algorithms):
+    """
+    Pick the hash algorithm for a miner: the configured one if the miner script supports it,
+    the default otherwise.
+
+    Parameters:
+        preferred (str): Hash algorithm configured by the validator.
+        miner_algorithms (list): Hash algorithms reported by the miner script in gpu_info mode.
+
+    Returns:
+        str: The negotiated hash algorithm.
+    """
+    if preferred in HASH_BACKENDS and preferred in (miner_algorithms or []):
+        return preferred
+    return DEFAULT_HASH_ALGORITHM
+
 def load_yaml_config(file_path):
     """
     Load GPU performance data from a YAML file.
@@ -24,6 +62,114 @@ def load_yaml_config(file_path):
     except yaml.YAMLError as e:
         raise ValueError(f"Error decoding YAML file {file_path}: {e}")
 
+class GpuReferenceTable:
+    """
+    GPU catalogue of the `gpu_performance` config section compiled into NumPy arrays.
+
+    Rows follow the order of `GPU_TFLOPS_FP16`, so ties resolve to the first GPU of
+    the catalogue as before. Use `get_gpu_reference_table` to share one table per
+    loaded config instead of compiling it for every miner test.
+    """
+
+    def __init__(self, gpu_data):
+        self.names = list(gpu_data["GPU_TFLOPS_FP16"].keys())
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.fp16 = np.array([gpu_data["GPU_TFLOPS_FP16"][name] for name in self.names], dtype=np.float64)
+        self.fp32 = np.array([gpu_data["GPU_TFLOPS_FP32"][name] for name in self.names], dtype=np.float64)
+        self.avram = np.array([gpu_data["GPU_AVRAM"][name] for name in self.names], dtype=np.float64)
+        self.tolerance_pairs = dict(gpu_data.get("gpu_tolerance_pairs") or {})
+
+    def deviations(self, fp16_tflops, fp32_tflops, estimated_avram):
+        """
+        Combined relative deviation of each benchmark result from each catalogue GPU.
+
+        Returns:
+            np.ndarray: Array of shape (results, GPUs).
+        """
+        fp16 = np.asarray(fp16_tflops, dtype=np.float64).reshape(-1, 1)
+        fp32 = np.asarray(fp32_tflops, dtype=np.float64).reshape(-1, 1)
+        avram = np.asarray(estimated_avram, dtype=np.float64).reshape(-1, 1)
+        return (
+            np.abs(fp16 - self.fp16) / self.fp16
+            + np.abs(fp32 - self.fp32) / self.fp32
+            + np.abs(avram - self.avram) / self.avram
+        ) / 3
+
+    def apply_tolerance(self, identified_gpu, reported_name, tolerance_pairs):
+        """Accept the reported name when it forms a tolerance pair with the identified GPU."""
+        if reported_name and identified_gpu != reported_name:
+            # Check if identified GPU matches the tolerance pair
+            if identified_gpu in tolerance_pairs and reported_name == tolerance_pairs.get(identified_gpu):
+                bt.logging.trace(f"[Tolerance Adjustment] Detected GPU {identified_gpu} matches reported GPU {reported_name}.")
+                return reported_name
+            # Check if reported GPU matches the tolerance pair in reverse
+            if reported_name in tolerance_pairs and identified_gpu == tolerance_pairs.get(reported_name):
+                bt.logging.trace(f"[Tolerance Adjustment] Reported GPU {reported_name} matches detected GPU {identified_gpu}.")
+                return reported_name
+        return identified_gpu
+
+    def identify_batch(self, fp16_tflops, fp32_tflops, estimated_avram, reported_names=None, tolerance_pairs=None):
+        """
+        Identify a batch of benchmark results in one pass over the catalogue.
+
+        Parameters:
+            fp16_tflops (array-like): Measured FP16 TFLOPS of each result.
+            fp32_tflops (array-like): Measured FP32 TFLOPS of each result.
+            estimated_avram (array-like): Estimated available VRAM in GB, or a single value for all results.
+            reported_names (list): GPU names reported by the miners (optional).
+            tolerance_pairs (dict): Tolerance pairs overriding the ones of the catalogue (optional).
+
+        Returns:
+            tuple: Identified GPU names, and the confidence margin of each result: the combined
+            deviation of the runner-up GPU minus the one of the best match (inf with a single GPU).
+        """
+        tolerance_pairs = self.tolerance_pairs if tolerance_pairs is None else tolerance_pairs
+        fp16 = np.atleast_1d(np.asarray(fp16_tflops, dtype=np.float64))
+        fp32 = np.atleast_1d(np.asarray(fp32_tflops, dtype=np.float64))
+        avram = np.broadcast_to(np.asarray(estimated_avram, dtype=np.float64), fp16.shape)
+        deviations = self.deviations(fp16, fp32, avram)
+
+        best = np.argmin(deviations, axis=1)
+        best_deviation = deviations[np.arange(len(best)), best]
+        if len(self.names) > 1:
+            margins = np.partition(deviations, 1, axis=1)[:, 1] - best_deviation
+        else:
+            margins = np.full(len(best), np.inf)
+
+        reported_names = reported_names or [None] * len(best)
+        names = [
+            self.apply_tolerance(self.names[i], reported_name, tolerance_pairs)
+            for i, reported_name in zip(best, reported_names)
+        ]
+        return names, margins
+
+    def identify(self, fp16_tflops, fp32_tflops, estimated_avram, reported_name=None, tolerance_pairs=None):
+        """Identify a single benchmark result, see identify_batch."""
+        names, _ = self.identify_batch([fp16_tflops], [fp32_tflops], estimated_avram, [reported_name], tolerance_pairs)
+        return names[0]
+
+# Reference tables of the latest gpu_performance sections seen, a reloaded config is a new mapping.
+# Several are kept so tests still running on the previous config do not evict the current one.
+_gpu_reference_tables = {}
+_GPU_REFERENCE_TABLES_MAX = 4
+
+def get_gpu_reference_table(gpu_data):
+    """
+    Return the compiled GPU reference table of the `gpu_performance` config section.
+
+    The table is compiled on first use and again only when a different section, e.g.
+    from a reloaded config.yaml, is passed in.
+    """
+    cached = _gpu_reference_tables.get(id(gpu_data))
+    # The section is kept with its table, so its id cannot be reused by another mapping
+    if cached is not None and cached[0] is gpu_data:
+        return cached[1]
+    table = GpuReferenceTable(gpu_data)
+    _gpu_reference_tables[id(gpu_data)] = (gpu_data, table)
+    while len(_gpu_reference_tables) > _GPU_REFERENCE_TABLES_MAX:
+        del _gpu_reference_tables[next(iter(_gpu_reference_tables))]
+    return table
+
 def identify_gpu(fp16_tflops, fp32_tflops, estimated_avram, gpu_data, reported_name=None, tolerance_pairs=None):
     """
     Identify GPU based on TFLOPS and AVRAM with a tolerance check for GPUs with similar fingerprints.
@@ -38,111 +184,110 @@ def identify_gpu(fp16_tflops, fp32_tflops, estimated_avram, gpu_data, reported_n
     Returns:
         str: Identified GPU name with tolerance handling.
     """
-    tolerance_pairs = tolerance_pairs or {}  # Default to empty dict if not provided
-    GPU_TFLOPS_FP16 = gpu_data["GPU_TFLOPS_FP16"]
-    GPU_TFLOPS_FP32 = gpu_data["GPU_TFLOPS_FP32"]
-    GPU_AVRAM = gpu_data["GPU_AVRAM"]
-
-    combined_scores = []
-    for gpu in GPU_TFLOPS_FP16.keys():
-        fp16_theoretical = GPU_TFLOPS_FP16[gpu]
-        fp32_theoretical = GPU_TFLOPS_FP32[gpu]
-        avram_theoretical = GPU_AVRAM[gpu]
-
-        fp16_deviation = abs(fp16_tflops - fp16_theoretical) / fp16_theoretical
-        fp32_deviation = abs(fp32_tflops - fp32_theoretical) / fp32_theoretical
-        avram_deviation = abs(estimated_avram - avram_theoretical) / avram_theoretical
-
-        combined_score = (fp16_deviation + fp32_deviation + avram_deviation) / 3
-        combined_scores.append((gpu, combined_score))
-    
-    # Sort by the lowest deviation
-    identified_gpu = sorted(combined_scores, key=lambda x: x[1])[0][0]
-
-    # Tolerance handling for nearly identical GPUs
-    if reported_name:
-        # Check if identified GPU matches the tolerance pair
-        if identified_gpu in tolerance_pairs and reported_name == tolerance_pairs.get(identified_gpu):
-            bt.logging.trace(f"[Tolerance Adjustment] Detected GPU {identified_gpu} matches reported GPU {reported_name}.")
-            identified_gpu = reported_name
-        # Check if reported GPU matches the tolerance pair in reverse
-        elif reported_name in tolerance_pairs and identified_gpu == tolerance_pairs.get(reported_name):
-            bt.logging.trace(f"[Tolerance Adjustment] Reported GPU {reported_name} matches detected GPU {identified_gpu}.")
-            identified_gpu = reported_name
-
-    return identified_gpu
+    table = get_gpu_reference_table(gpu_data)
+    return table.identify(fp16_tflops, fp32_tflops, estimated_avram, reported_name, tolerance_pairs or {})
+
+# Local script hashes memoized on (path, mtime, size), the script only changes on updates
+_script_hash_cache = {}
 
 def compute_script_hash(script_path):
-    with open(script_path, "rb") as f:
-        return hashlib.sha256(f.read()).hexdigest()
+    stat = os.stat(script_path)
+    key = (os.path.abspath(script_path), stat.st_mtime_ns, stat.st_size)
+    script_hash = _script_hash_cache.get(key)
+    if script_hash is None:
+        with open(script_path, "rb") as f:
+            script_hash = hashlib.sha256(f.read()).hexdigest()
+        _script_hash_cache.clear()
+        _script_hash_cache[key] = script_hash
+    return script_hash
+
+def remote_script_path(script_hash):
+    return f"/tmp/miner_script_{script_hash}.py"
+
+async def remote_file_hash(transport, remote_path):
+    stdout, _ = await transport.run(f"sha256sum {remote_path} 2>/dev/null")
+    parts = stdout.split()
+    return parts[0] if parts else None
+
+async def deploy_miner_script(transport, script_path):
+    """
+    Deploy the miner script under a content-addressed path.
 
-def send_script_and_request_hash(ssh_client, script_path):
-    sftp = ssh_client.open_sftp()
-    sftp.put(script_path, "/tmp/miner_script.py")
-    sftp.close()
+    The script is only uploaded when the miner does not already hold a copy whose
+    SHA-256, computed on the miner, matches the local script.
 
-    # Command to compute the hash on the remote server
-    hash_command = """
-    /opt/conda/bin/python -c "
-import hashlib
-with open('/tmp/miner_script.py', 'rb') as f:
-    computed_hash = hashlib.sha256(f.read()).hexdigest()
-print(computed_hash)
-"
+    Returns:
+        tuple: (remote_path, remote_hash) where remote_hash is computed on the miner.
     """
-    stdin, stdout, stderr = ssh_client.exec_command(hash_command)
-    computed_hash = stdout.read().decode().strip()
-    hash_error = stderr.read().decode().strip()
+    local_hash = compute_script_hash(script_path)
+    remote_path = remote_script_path(local_hash)
 
-    if hash_error:
-        raise RuntimeError(f"Hash computation failed: {hash_error}")
-    return computed_hash
+    remote_hash = await remote_file_hash(transport, remote_path)
+    if remote_hash == local_hash:
+        return remote_path, remote_hash
 
-def execute_script_on_miner(ssh_client, mode):
-    execution_command = f"/opt/conda/bin/python /tmp/miner_script.py --mode {mode}"
-    stdin, stdout, stderr = ssh_client.exec_command(execution_command)
-    execution_output = stdout.read().decode().strip()
-    execution_error = stderr.read().decode().strip()
-
-    if execution_error:
-        raise RuntimeError(f"Script execution failed: {execution_error}")
-    return execution_output
+    # Upload next to the final path and move it in place, so an interrupted upload is never reused
+    upload_path = f"{remote_path}.{secrets.token_hex(4)}"
+    await transport.upload(script_path, upload_path)
+    await transport.run(f"mv -f {upload_path} {remote_path}")
+    return remote_path, await remote_file_hash(transport, remote_path)
 
 def parse_benchmark_output(output):
-    try:
-        parts = output.strip().split()
-        num_gpus = int(parts[0])  # First value is the number of GPUs
-        vram = float(parts[1])
-        size_fp16 = int(parts[2])
-        time_fp16 = float(parts[3])
-        size_fp32 = int(parts[4])
-        time_fp32 = float(parts[5])
-        return num_gpus, vram, size_fp16, time_fp16, size_fp32, time_fp32
-    except (ValueError, IndexError) as e:
-        raise ValueError(f"Failed to parse execution output: {output}") from e
+    """
+    Parse the JSON benchmark payload of the miner script.
+
+    The miner caps its FP16/FP32 benchmark matrix sizes so it can afford repeated trials;
+    TFLOPS are derived from those (size, median time) pairs as measured. The time budget
+    of the Merkle challenge uses the FP32 multiplication the miner also timed at its full,
+    uncapped size (size_fp32_full, time_fp32_full).
+
+    `vram` is the figure comparable to the GPU_AVRAM identification references, while
+    `usable_vram` is the largest block allocatable on every GPU and sizes the matrices.
 
-def parse_merkle_output(output):
+    Returns:
+        dict: num_gpus, vram, usable_vram, size_fp16, time_fp16, size_fp32, time_fp32,
+        size_fp32_full and time_fp32_full of the slowest GPU, "gpus", the per-GPU results
+        with their own time_fp16, time_fp32 and time_fp32_full, and "devices", the per-GPU
+        memory probes in bytes.
+    """
     try:
-        lines = output.strip().split('\n')
-        root_hashes_line = None
-        timings_line = None
-        for line in lines:
-            if line.startswith('Root hashes:'):
-                root_hashes_line = line
-            elif line.startswith('Timings:'):
-                timings_line = line
-        if root_hashes_line is None or timings_line is None:
-            raise ValueError("Output does not contain root hashes or timings")
-        # Parse root hashes
-        root_hashes_str = root_hashes_line.split(': ', 1)[1]
-        root_hashes = json.loads(root_hashes_str)  # List of tuples (gpu_id, root_hash)
-
-        # Parse timings
-        timings_str = timings_line.split(': ', 1)[1]
-        gpu_timings = json.loads(timings_str)  # List of tuples (gpu_id, timings_dict)
-
-        return root_hashes, gpu_timings
-    except (ValueError, IndexError, json.JSONDecodeError) as e:
+        benchmark = json.loads(output)
+        num_gpus = int(benchmark["num_gpus"])
+        vram = float(benchmark["vram"])
+        usable_vram = float(benchmark.get("usable_vram", vram))
+        size_fp16 = int(benchmark["size_fp16"])
+        size_fp32 = int(benchmark["size_fp32"])
+        size_fp32_full = int(benchmark["size_fp32_full"])
+        if size_fp16 <= 0 or size_fp32 <= 0 or size_fp32_full <= 0:
+            raise ValueError("Empty benchmark matrices")
+        gpus = [
+            {
+                "gpu_id": int(gpu["gpu_id"]),
+                "name": gpu.get("name"),
+                "time_fp16": float(gpu["fp16"]["median"]),
+                "time_fp32": float(gpu["fp32"]["median"]),
+                "time_fp32_full": float(gpu["fp32_full"]["median"]),
+                "fp16": gpu["fp16"],
+                "fp32": gpu["fp32"],
+            }
+            for gpu in benchmark.get("gpus", [])
+        ]
+        return {
+            "num_gpus": num_gpus,
+            "vram": vram,
+            "usable_vram": usable_vram,
+            "size_fp16": size_fp16,
+            "time_fp16": float(benchmark["fp16"]["median"]),
+            "size_fp32": size_fp32,
+            "time_fp32": float(benchmark["fp32"]["median"]),
+            "size_fp32_full": size_fp32_full,
+            "time_fp32_full": float(benchmark["fp32_full"]["median"]),
+            "fp16": benchmark["fp16"],
+            "fp32": benchmark["fp32"],
+            "gpus": gpus,
+            "devices": benchmark.get("devices", []),
+        }
+    except (ValueError, KeyError, TypeError) as e:
         raise ValueError(f"Failed to parse execution output: {output}") from e
 
 def get_random_seeds(num_gpus):
@@ -153,70 +298,41 @@ def get_random_seeds(num_gpus):
         seeds[gpu_id] = (s_A, s_B)
     return seeds
 
-def send_seeds(ssh_client, seeds, n):
-    lines = [str(n)]  # First line is n
-    for gpu_id in seeds.keys():
-        s_A, s_B = seeds[gpu_id]
-        line = f"{gpu_id} {s_A} {s_B}"
-        lines.append(line)
-    content = '\n'.join(lines)
-    command = f"echo '{content}' > /tmp/seeds.txt"
-    stdin, stdout, stderr = ssh_client.exec_command(command)
-    stdout.channel.recv_exit_status()
-
-def send_challenge_indices(ssh_client, indices):
-    lines = []
-    for gpu_id in indices.keys():
-        idx_list = indices[gpu_id]
-        indices_str = ';'.join([f"{i},{j}" for i, j in idx_list])
-        line = f"{gpu_id} {indices_str}"
-        lines.append(line)
-    content = '\n'.join(lines)
-    command = f"echo '{content}' > /tmp/challenge_indices.txt"
-    stdin, stdout, stderr = ssh_client.exec_command(command)
-    stdout.channel.recv_exit_status()
-
-def receive_responses(ssh_client, num_gpus):
-    responses = {}
-    try:
-        with ssh_client.open_sftp() as sftp, tempfile.TemporaryDirectory() as temp_dir:
-            for gpu_id in range(num_gpus):
-                remote_path = f'/dev/shm/responses_gpu_{gpu_id}.npy'
-                local_path = f'{temp_dir}/responses_gpu_{gpu_id}.npy'
-                
-                try:
-                    sftp.get(remote_path, local_path)
-                    response = np.load(local_path, allow_pickle=True)
-                    responses[gpu_id] = response.item()
-                except Exception as e:
-                    print(f"Error processing GPU {gpu_id}: {e}")
-                    responses[gpu_id] = None
-    except Exception as e:
-        print(f"SFTP connection error: {e}")
-    
-    return responses
-
-def xorshift32_numpy(state):
-    state = np.uint64(state)
-    x = state & np.uint64(0xFFFFFFFF)
-    x ^= (np.uint64((x << np.uint64(13)) & np.uint64(0xFFFFFFFF)))
-    x ^= (np.uint64((x >> np.uint64(17)) & np.uint64(0xFFFFFFFF)))
-    x ^= (np.uint64((x << np.uint64(5)) & np.uint64(0xFFFFFFFF)))
-    x = x & np.uint64(0xFFFFFFFF)
-    return x
-
-def generate_prng_value(s, i, j):
-    s = np.uint64(s)
-    i = np.uint64(i % np.uint64(2**32))
-    j = np.uint64(j)
-    state = (s + i + j) & np.uint64(0xFFFFFFFF)
-
-    for _ in range(10):
-        state = xorshift32_numpy(state)
-
-    return state / float(0xFFFFFFFF)
-
-def verify_responses(seeds, root_hashes, responses, indices, n):
+def parse_proof_response(buffer):
+    """
+    Decode a binary proof response without copying or unpickling.
+
+    Parameters:
+        buffer (bytes): The raw response written by the miner.
+
+    Returns:
+        dict: 'leaf_indices' (k,) sorted row indices, plus 'rows' (k, n) float32 and
+        'siblings' (s, hash_size) uint8 NumPy views over the buffer.
+    """
+    if len(buffer) < PROOF_HEADER.size:
+        raise ValueError("Proof response is truncated.")
+    magic, version, hash_size, num_rows, row_length, num_leaves, num_siblings = PROOF_HEADER.unpack_from(buffer, 0)
+    if magic != PROOF_FORMAT_MAGIC or version != PROOF_FORMAT_VERSION:
+        raise ValueError(f"Unsupported proof response format: {magic!r} v{version}.")
+
+    bitmap_size = (num_leaves + 7) // 8
+    rows_size = num_rows * row_length * 4
+    siblings_size = num_siblings * hash_size
+    if len(buffer) != PROOF_HEADER.size + bitmap_size + rows_size + siblings_size:
+        raise ValueError("Proof response size does not match its header.")
+
+    offset = PROOF_HEADER.size
+    bitmap = np.frombuffer(buffer, dtype=np.uint8, count=bitmap_size, offset=offset)
+    leaf_indices = np.flatnonzero(np.unpackbits(bitmap, count=num_leaves, bitorder="little"))
+    if len(leaf_indices) != num_rows:
+        raise ValueError("Proof response bitmap does not match its row count.")
+    offset += bitmap_size
+    rows = np.frombuffer(buffer, dtype="<f4", count=num_rows * row_length, offset=offset).reshape(num_rows, row_length)
+    offset += rows_size
+    siblings = np.frombuffer(buffer, dtype=np.uint8, count=siblings_size, offset=offset).reshape(num_siblings, hash_size)
+    return {'leaf_indices': leaf_indices, 'rows': rows, 'siblings': siblings}
+
+def verify_responses(seeds, root_hashes, responses, indices, n, hash_algorithm=DEFAULT_HASH_ALGORITHM):
     """
     Verifies the responses from GPUs by checking computed values and Merkle proofs.
 
@@ -226,6 +342,7 @@ def verify_responses(seeds, root_hashes, responses, indices, n):
         responses (dict): Responses from each GPU containing computed rows and proofs.
         indices (dict): Challenge indices for each GPU.
         n (int): Total number of leaves in the Merkle tree.
+        hash_algorithm (str): Hash algorithm negotiated with the miner for the Merkle trees.
 
     Returns:
         bool: True if verification passes within the allowed failure threshold, False otherwise.
@@ -233,6 +350,7 @@ def verify_responses(seeds, root_hashes, responses, indices, n):
     verification_passed = True
     failed_gpus = []
     num_gpus = len(root_hashes.keys())
+    hash_func = get_hash_backend(hash_algorithm)
 
     # Define the minimum number of GPUs that must pass verification
     if num_gpus == 4:
@@ -247,39 +365,12 @@ def verify_responses(seeds, root_hashes, responses, indices, n):
 
     for gpu_id in root_hashes.keys():
         s_A, s_B = seeds[gpu_id]
-        gpu_indices = indices[gpu_id]
-        response = responses[gpu_id]
+        gpu_indices = np.asarray(indices[gpu_id], dtype=np.int64).reshape(-1, 2)
+        response = responses.get(gpu_id)
         root_hash = root_hashes[gpu_id]
         total_leaves = n
 
-        gpu_failed = False  # Flag to track if the current GPU has failed
-
-        for idx, (i, j) in enumerate(gpu_indices):
-            # Generate only the necessary row and column entries using PRNG
-            A_row = np.array([generate_prng_value(s_A, i, col) for col in range(n)], dtype=np.float32)
-            B_col = np.array([generate_prng_value(s_B, row, j) for row in range(n)], dtype=np.float32)
-
-            # Compute C_{i,j} as the dot product of A_row and B_col
-            value_validator = np.dot(A_row, B_col)
-
-            # Retrieve miner's computed value and corresponding Merkle proof
-            row_miner = response['rows'][idx]
-            proof = response['proofs'][idx]
-            value_miner = row_miner[j]
-
-            # Check if the miner's value matches the expected value
-            if not np.isclose(value_miner, value_validator, atol=1e-5):
-                bt.logging.trace(f"[Verification] GPU {gpu_id}: Value mismatch at index ({i}, {j}).")
-                gpu_failed = True
-                break  # Exit the loop for this GPU as it has already failed
-
-            # Verify the Merkle proof for the row
-            if not verify_merkle_proof_row(row_miner, proof, bytes.fromhex(root_hash), i, total_leaves):
-                bt.logging.trace(f"[Verification] GPU {gpu_id}: Invalid Merkle proof at index ({i}).")
-                gpu_failed = True
-                break  # Exit the loop for this GPU as it has already failed
-
-        if gpu_failed:
+        if not verify_gpu_response(gpu_id, s_A, s_B, root_hash, response, gpu_indices, n, total_leaves, hash_func):
             failed_gpus.append(gpu_id)
             bt.logging.trace(f"[Verification] GPU {gpu_id} failed verification.")
         else:
@@ -302,41 +393,115 @@ def verify_responses(seeds, root_hashes, responses, indices, n):
 
     return verification_passed
 
-def verify_merkle_proof_row(row, proof, root_hash, index, total_leaves, hash_func=hashlib.sha256):
+def verify_gpu_response(gpu_id, s_A, s_B, root_hash, response, gpu_indices, n, total_leaves, hash_func=hashlib.sha256):
     """
-    Verifies a Merkle proof for a given row.
+    Verifies all k challenged indices of a single GPU as one batch.
 
     Parameters:
-    - row (np.ndarray): The data row to verify.
-    - proof (list of bytes): The list of sibling hashes required for verification.
+        gpu_id (int): GPU identifier (used for logging).
+        s_A (int): Seed of matrix A.
+        s_B (int): Seed of matrix B.
+        root_hash (str): Hex encoded Merkle root committed by the GPU.
+        response (dict): Rows and proofs returned by the GPU.
+        gpu_indices (np.ndarray): (k, 2) array of challenged (i, j) indices.
+        n (int): Size of the matrices.
+        total_leaves (int): Total number of leaves in the Merkle tree.
+        hash_func (callable): Hash function of the Merkle tree.
+
+    Returns:
+        bool: True if every challenged value and Merkle proof is valid.
+    """
+    if response is None:
+        bt.logging.trace(f"[Verification] GPU {gpu_id}: Missing response.")
+        return False
+
+    row_indices = gpu_indices[:, 0]
+    col_indices = gpu_indices[:, 1]
+    try:
+        leaf_indices = np.asarray(response['leaf_indices'], dtype=np.int64)
+        rows_miner = np.asarray(response['rows'], dtype=np.float32).reshape(len(leaf_indices), n)
+        siblings = response['siblings']
+    except (KeyError, TypeError, ValueError):
+        bt.logging.trace(f"[Verification] GPU {gpu_id}: Malformed response.")
+        return False
+
+    # The response must contain exactly the challenged rows, once each and in ascending order
+    if not np.array_equal(leaf_indices, np.unique(row_indices)):
+        bt.logging.trace(f"[Verification] GPU {gpu_id}: Returned rows do not match the challenge.")
+        return False
+
+    # Generate the k needed A rows and B columns as (k, n) blocks and compute all C_{i,j} at once
+    A_rows = generate_prng_block(s_A, row_indices, n)
+    B_cols = generate_prng_block(s_B, col_indices, n)
+    values_validator = np.einsum("kn,kn->k", A_rows, B_cols)
+    values_miner = rows_miner[np.searchsorted(leaf_indices, row_indices), col_indices]
+
+    # Check if the miner's values match the expected values
+    mismatches = ~np.isclose(values_miner, values_validator, atol=1e-5)
+    if mismatches.any():
+        i, j = gpu_indices[np.argmax(mismatches)]
+        bt.logging.trace(f"[Verification] GPU {gpu_id}: Value mismatch at index ({i}, {j}).")
+        return False
+
+    # Verify the Merkle proofs of all returned rows
+    if not verify_merkle_multiproof(rows_miner, siblings, bytes.fromhex(root_hash), leaf_indices, total_leaves, hash_func):
+        bt.logging.trace(f"[Verification] GPU {gpu_id}: Invalid Merkle proof for rows {row_indices.tolist()}.")
+        return False
+
+    return True
+
+def verify_merkle_multiproof(rows, siblings, root_hash, leaf_indices, total_leaves, hash_func=hashlib.sha256):
+    """
+    Verifies a Merkle multiproof for several rows in a single bottom-up pass.
+
+    Siblings are consumed in the order produced by get_merkle_multiproof in the miner
+    script: level by level, ascending node index, skipping any sibling that is itself
+    computed from the challenged rows or is the duplicated last node of an odd level.
+
+    Parameters:
+    - rows (np.ndarray): The data rows to verify, shape (k, n), in ascending index order.
+    - siblings (sequence of bytes-like): The deduplicated sibling hashes.
     - root_hash (bytes): The root hash of the Merkle tree.
-    - index (int): The index of the row in the tree.
+    - leaf_indices (array-like): Sorted, unique index of each row in the tree.
     - total_leaves (int): The total number of leaves in the Merkle tree.
     - hash_func (callable): The hash function to use (default: hashlib.sha256).
 
     Returns:
-    - bool: True if the proof is valid, False otherwise.
+    - bool: True if the multiproof is valid, False otherwise.
     """
-    # Initialize the computed hash with the hash of the row using the specified hash function
-    computed_hash = hash_func(row.tobytes()).digest()
-    idx = index
+    if len(rows) == 0 or len(rows) != len(leaf_indices):
+        return False
+
+    nodes = {int(index): hash_func(row.tobytes()).digest() for index, row in zip(leaf_indices, rows)}
+    sibling_iter = iter(siblings)
     num_leaves = total_leaves
-    
-    # Iterate through each sibling hash in the proof
-    for sibling_hash in proof:
-        if idx % 2 == 0:
-            # If the current index is even, concatenate computed_hash + sibling_hash
-            combined = computed_hash + sibling_hash
-        else:
-            # If the current index is odd, concatenate sibling_hash + computed_hash
-            combined = sibling_hash + computed_hash
-        # Compute the new hash using the specified hash function
-        computed_hash = hash_func(combined).digest()
-        # Move up to the next level
-        idx = idx // 2
-    
-    # Compare the computed hash with the provided root hash
-    return computed_hash == root_hash
+    try:
+        while num_leaves > 1:
+            parents = {}
+            for idx in sorted(nodes):
+                if idx // 2 in parents:
+                    continue  # Right child of a pair already hashed from the left child
+                sibling_idx = idx ^ 1
+                if sibling_idx in nodes:
+                    sibling_hash = nodes[sibling_idx]
+                elif sibling_idx >= num_leaves:
+                    sibling_hash = nodes[idx]  # Duplicate if odd number of nodes
+                else:
+                    sibling_hash = bytes(next(sibling_iter))
+                if idx % 2 == 0:
+                    combined = nodes[idx] + sibling_hash
+                else:
+                    combined = sibling_hash + nodes[idx]
+                parents[idx // 2] = hash_func(combined).digest()
+            nodes = parents
+            num_leaves = (num_leaves + 1) // 2
+    except StopIteration:
+        return False
+
+    # Every sibling must have been consumed
+    if next(sibling_iter, None) is not None:
+        return False
+    return len(nodes) == 1 and nodes.get(0) == root_hash
 
 def adjust_matrix_size(vram, element_size=2, buffer_factor=0.8):
     usable_vram = vram * buffer_factor * 1e9  # Usable VRAM in bytes
@@ -344,23 +509,116 @@ def adjust_matrix_size(vram, element_size=2, buffer_factor=0.8):
     aligned_size = (max_size // 32) * 32  # Ensure alignment to multiple of 32
     return aligned_size
 
-def get_remote_gpu_info(ssh_client):
-    """
-    Execute the miner script in gpu_info mode to get GPU information from the remote miner.
-
-    Args:
-        ssh_client (paramiko.SSHClient): SSH client connected to the miner.
+# Agent mode frames (little-endian): JSON length (I), binary payload length (I), JSON message, binary payload
+AGENT_FRAME_HEADER = struct.Struct("<II")
 
-    Returns:
-        dict: Dictionary containing GPU information (number and names).
+class MinerAgentClient:
     """
-    command = "/opt/conda/bin/python /tmp/miner_script.py --mode gpu_info"
-    stdin, stdout, stderr = ssh_client.exec_command(command)
+    Drive every PoG phase through one long-lived miner script process in agent mode.
 
-    output = stdout.read().decode().strip()
-    error = stderr.read().decode().strip()
+    The agent is started once through a miner transport and keeps its matrices
+    and Merkle trees resident between the compute and proof phases, so seeds,
+    challenge indices and proofs travel over the same channel instead of
+    temporary files.
 
-    if error:
-        raise RuntimeError(f"Failed to get GPU info: {error}")
+    Every request is bounded by a per-command timeout in seconds, from `timeouts`
+    unless given to `call`; a request that times out leaves the channel out of
+    sync, so the agent is then only closed.
+    """
 
-    return json.loads(output)
\ No newline at end of file
+    timeouts = {"gpu_info": 60, "benchmark": 180, "compute": 180, "proof": 60, "shutdown": 10}
+    default_timeout = 60
+
+    def __init__(self, process):
+        self.process = process
+        self.closed = False
+        self.broken = False
+
+    @classmethod
+    async def start(cls, transport, script_path, python_path="/opt/conda/bin/python", log_path="/tmp/miner_agent.log"):
+        # Diagnostics go to a log file on the miner so they never stall the protocol channel
+        command = f"{python_path} {script_path} --mode agent 2>>{log_path}"
+        return cls(await transport.start_process(command))
+
+    async def _read_exact(self, size):
+        try:
+            return await self.process.stdout.readexactly(size)
+        except asyncio.IncompleteReadError as e:
+            raise RuntimeError("Miner agent closed the connection") from e
+
+    async def _exchange(self, message):
+        self.process.stdin.write(AGENT_FRAME_HEADER.pack(len(message), 0) + message)
+        await self.process.stdin.drain()
+
+        message_size, payload_size = AGENT_FRAME_HEADER.unpack(await self._read_exact(AGENT_FRAME_HEADER.size))
+        response = json.loads((await self._read_exact(message_size)).decode())
+        payload = await self._read_exact(payload_size) if payload_size else b""
+        return response, payload
+
+    async def call(self, cmd, timeout=None, **params):
+        """
+        Send one request and wait for its response.
+
+        :param timeout: Seconds to wait for the response, defaults to the command's entry in `timeouts`.
+        :raises RuntimeError: If the agent fails, closes the connection or does not answer in time.
+
+        Returns:
+            tuple: (result, payload) where payload holds the binary part of the response.
+        """
+        if self.broken:
+            raise RuntimeError(f"Miner agent channel is out of sync, cannot send {cmd}")
+        if timeout is None:
+            timeout = self.timeouts.get(cmd, self.default_timeout)
+        message = json.dumps({"cmd": cmd, **params}).encode()
+        try:
+            response, payload = await asyncio.wait_for(self._exchange(message), timeout=timeout)
+        except asyncio.TimeoutError as e:
+            self.broken = True
+            raise RuntimeError(f"Miner agent {cmd} timed out after {timeout} s") from e
+        if not response.get("ok"):
+            raise RuntimeError(f"Miner agent {cmd} failed: {response.get('error')}")
+        return response.get("result"), payload
+
+    async def gpu_info(self):
+        return (await self.call("gpu_info"))[0]
+
+    async def benchmark(self, warmup=None, trials=None):
+        """Returns the JSON benchmark payload expected by `parse_benchmark_output`."""
+        params = {name: value for name, value in (("warmup", warmup), ("trials", trials)) if value is not None}
+        return (await self.call("benchmark", **params))[0]["output"]
+
+    async def compute(self, seeds, n, hash_algorithm=DEFAULT_HASH_ALGORITHM, low_memory=False):
+        """
+        Returns (root_hashes, gpu_timings, errors): lists of (gpu_id, root hash hex), (gpu_id, timing dict)
+        and (gpu_id, error message) of the GPUs that failed.
+        """
+        seeds = {str(gpu_id): [s_A, s_B] for gpu_id, (s_A, s_B) in seeds.items()}
+        result, _ = await self.call("compute", seeds=seeds, n=n, hash_algorithm=hash_algorithm, low_memory=low_memory)
+        return result["root_hashes"], result["timings"], result.get("errors", [])
+
+    async def proof(self, indices):
+        """Returns the proof responses parsed by `parse_proof_response`, by GPU ID."""
+        indices = {str(gpu_id): [[int(i), int(j)] for i, j in idx_list] for gpu_id, idx_list in indices.items()}
+        result, payload = await self.call("proof", indices=indices)
+        responses = {}
+        offset = 0
+        for gpu_id, size in result["responses"]:
+            try:
+                responses[gpu_id] = parse_proof_response(payload[offset:offset + size])
+            except Exception as e:
+                bt.logging.warning(f"Error parsing the proof response of GPU {gpu_id}: {e}")
+                responses[gpu_id] = None
+            offset += size
+        return responses
+
+    async def close(self, timeout=10):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if not self.broken:
+                await self.call("shutdown", timeout=timeout)
+            self.process.stdin.write_eof()
+            await asyncio.wait_for(self.process.wait(), timeout=timeout)
+        except Exception:
+            pass
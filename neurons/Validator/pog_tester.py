@@ -0,0 +1,508 @@
+import asyncio
+import base64
+import json
+import time
+
+import bittensor as bt
+import numpy as np
+
+import RSAEncryption as rsa
+from compute.protocol import Allocate
+from compute.utils.db import ComputeDb
+from neurons.Validator.database.pog import delete_pog_identity, get_pog_identity, get_pog_specs, update_pog_identity
+from neurons.Validator.pog import (
+    MinerAgentClient,
+    adjust_matrix_size,
+    compute_script_hash,
+    deploy_miner_script,
+    get_gpu_reference_table,
+    get_random_seeds,
+    negotiate_hash_algorithm,
+    parse_benchmark_output,
+    verify_responses,
+)
+from neurons.Validator.transport import AsyncSSHTransport
+
+
+class PogTester:
+    """
+    Runs the Proof-of-GPU test of a single miner: allocation, SSH session, benchmark,
+    Merkle challenge, verification and deallocation.
+
+    Shared by the validator and by standalone PoG worker processes.
+    """
+
+    def __init__(self, wallet, db, executor, verification_executor, verification_workers, on_verification=None,
+                 on_phase=None, transport_factory=AsyncSSHTransport.connect, python_path="/opt/conda/bin/python"):
+        """
+        :param wallet: Validator wallet signing the allocation queries.
+        :param db: ComputeDb holding the PoG identities and stats.
+        :param executor: Thread pool for the blocking allocator queries.
+        :param verification_executor: Process pool running verify_responses.
+        :param verification_workers: Size of the verification pool.
+        :param on_verification: Optional callback receiving each verification latency in seconds.
+        :param on_phase: Optional callback receiving (hotkey, phase, seconds) for each completed test phase.
+        :param transport_factory: Coroutine function (host, port, username, password, timeout) returning a MinerTransport.
+        :param python_path: Python interpreter running the miner script on the miner.
+        """
+        self.wallet = wallet
+        self.db = db
+        self.executor = executor
+        self.verification_executor = verification_executor
+        # Bound the number of pending verification jobs so miner tests back off when the pool is saturated,
+        # the semaphore is created on first use inside the event loop
+        self.verification_workers = verification_workers
+        self.verification_slots = None
+        self.on_verification = on_verification
+        self.on_phase = on_phase
+        self.transport_factory = transport_factory
+        self.python_path = python_path
+
+    def record_phase(self, hotkey, phase, start_time):
+        """Report the duration of a test phase, returns the end time to chain phases."""
+        end_time = time.time()
+        if self.on_phase:
+            self.on_phase(hotkey, phase, end_time - start_time)
+        return end_time
+
+    async def test_miner_gpu(self, axon, config_data):
+        """
+        Allocate, test, and deallocate a single miner.
+
+        SSH traffic runs on the event loop; only the allocator queries use the thread pool
+        and only the proof verification uses the verification process pool.
+
+        :return: Tuple of (miner_hotkey, gpu_name, num_gpus)
+        """
+        allocation_status = False
+        miner_info = None
+        host = None  # Initialize host variable
+        transport = None
+        agent = None
+        hotkey = axon.hotkey
+        loop = asyncio.get_running_loop()
+        bt.logging.trace(f"{hotkey}: Starting miner test.")
+
+        try:
+            # Step 0: Init
+            gpu_data = config_data["gpu_performance"]
+            gpu_tolerance_pairs = gpu_data.get("gpu_tolerance_pairs", {})
+            # Extract Merkle Proof Settings
+            merkle_proof = config_data["merkle_proof"]
+            time_tol = merkle_proof.get("time_tolerance",5)
+            # Extract miner_script path
+            miner_script_path = merkle_proof["miner_script_path"]
+
+            # Step 1: Allocate Miner
+            phase_start = time.time()
+            # Generate RSA key pair
+            private_key, public_key = await loop.run_in_executor(self.executor, rsa.generate_key_pair)
+            allocation_response = await self.allocate_miner(axon, private_key, public_key)
+            if not allocation_response:
+                bt.logging.info(f"🌀 {hotkey}: Busy or not allocatable.")
+                return (hotkey, None, 0)
+            allocation_status = True
+            miner_info = allocation_response
+            host = miner_info['host']
+            bt.logging.trace(f"{hotkey}: Allocated Miner for testing.")
+            phase_start = self.record_phase(hotkey, "allocate", phase_start)
+
+            # Step 2: Connect via SSH
+            bt.logging.trace(f"{hotkey}: Connect to Miner via SSH.")
+            transport = await self.transport_factory(host, port=miner_info.get('port', 22), username=miner_info['username'], password=miner_info['password'], timeout=10)
+            bt.logging.trace(f"{hotkey}: Connected to Miner via SSH.")
+            phase_start = self.record_phase(hotkey, "connect", phase_start)
+
+            # Step 3: Hash Check
+            local_hash = compute_script_hash(miner_script_path)
+            bt.logging.trace(f"{hotkey}: [Step 1] Local script hash computed successfully.")
+            bt.logging.trace(f"{hotkey}: Local Hash: {local_hash}")
+            remote_path, remote_hash = await deploy_miner_script(transport, miner_script_path)
+            if local_hash != remote_hash:
+                bt.logging.info(f"{hotkey}: [Integrity Check] FAILURE: Hash mismatch detected.")
+                raise ValueError(f"{hotkey}: Script integrity verification failed.")
+            phase_start = self.record_phase(hotkey, "deploy", phase_start)
+
+            # Start the PoG agent once; every remaining phase goes through its channel
+            agent = await MinerAgentClient.start(transport, script_path=remote_path, python_path=self.python_path)
+
+            # Step 4: Get GPU info NVIDIA from the remote miner
+            bt.logging.trace(f"{hotkey}: [Step 4] Retrieving GPU information (NVIDIA driver) from miner...")
+            gpu_info = await agent.gpu_info()
+            num_gpus_reported = gpu_info["num_gpus"]
+            gpu_name_reported = gpu_info["gpu_names"][0] if num_gpus_reported > 0 else None
+            hash_algorithm = negotiate_hash_algorithm(merkle_proof.get("hash_algorithm", "sha256"), gpu_info.get("hash_algorithms"))
+            self.record_phase(hotkey, "gpu_info", phase_start)
+            bt.logging.trace(f"{hotkey}: [Step 4] Reported GPU Information:")
+            if num_gpus_reported > 0:
+                bt.logging.trace(f"{hotkey}: Number of GPUs: {num_gpus_reported}")
+                bt.logging.trace(f"{hotkey}: GPU Type: {gpu_name_reported}")
+            if num_gpus_reported <= 0:
+                bt.logging.info(f"{hotkey}: No GPUs detected.")
+                raise ValueError("No GPUs detected.")
+
+            # Fast path: a fresh identity matching the reported GPUs only needs the Merkle challenge
+            identity = get_pog_identity(self.db, hotkey)
+            if self.is_identity_reusable(hotkey, identity, gpu_info, merkle_proof):
+                bt.logging.info(f"💻 {hotkey}: Re-verifying cached identity {identity['num_gpus']} x {identity['gpu_name']}.")
+                verification_passed, elapsed_time, gpu_timings_list = await self.run_merkle_challenge(
+                    hotkey, agent, merkle_proof, hash_algorithm, identity["vram"], identity["num_gpus"]
+                )
+                if not verification_passed:
+                    delete_pog_identity(self.db, hotkey)
+                    bt.logging.info(f"⚠️  {hotkey}: GPU Re-verification: Aborted due to verification failure")
+                    return (hotkey, None, 0)
+                if self.check_reference_times(identity, elapsed_time, gpu_timings_list, merkle_proof):
+                    bt.logging.info(f"✅ {hotkey}: GPU Re-verification: Confirmed {identity['num_gpus']} x {identity['gpu_name']} GPU(s)")
+                    return (hotkey, identity["gpu_name"], identity["num_gpus"])
+                # Timings drifted from the reference, identify the GPUs again within this session
+                bt.logging.info(f"🔄 {hotkey}: Timings differ from the cached identity, running full identification.")
+                delete_pog_identity(self.db, hotkey)
+
+            # Step 5: Run the benchmarking mode
+            bt.logging.info(f"💻 {hotkey}: Executing benchmarking mode.")
+            bt.logging.trace(f"{hotkey}: [Step 5] Executing benchmarking mode on the miner...")
+            phase_start = time.time()
+            execution_output = await agent.benchmark(merkle_proof.get("benchmark_warmup"), merkle_proof.get("benchmark_trials"))
+            bt.logging.trace(f"{hotkey}: [Step 5] Benchmarking completed.")
+            self.record_phase(hotkey, "benchmark", phase_start)
+            # Parse the execution output
+            benchmark = parse_benchmark_output(execution_output)
+            num_gpus, vram = benchmark["num_gpus"], benchmark["vram"]
+            size_fp16, time_fp16 = benchmark["size_fp16"], benchmark["time_fp16"]
+            size_fp32, time_fp32 = benchmark["size_fp32"], benchmark["time_fp32"]
+            # The Merkle challenge time is bounded by the FP32 multiplication timed at full size
+            time_fp32_full = benchmark["time_fp32_full"]
+            usable_vram = benchmark["usable_vram"]
+            bt.logging.trace(f"{hotkey}: [Benchmark Results] Detected {num_gpus} GPU(s) with {vram} GB unfractured VRAM.")
+            for device in benchmark["devices"]:
+                bt.logging.trace(
+                    f"{hotkey}: GPU {device['gpu_id']} memory - total {device['total'] / 1e9:.2f} GB, "
+                    f"free {device['free'] / 1e9:.2f} GB, usable {device['usable'] / 1e9:.2f} GB"
+                )
+            bt.logging.trace(f"{hotkey}: FP16 - Matrix Size: {size_fp16}, Execution Time: {time_fp16} s")
+            bt.logging.trace(f"{hotkey}: FP32 - Matrix Size: {size_fp32}, Execution Time: {time_fp32} s")
+            bt.logging.trace(f"{hotkey}: Full-size FP32 - Matrix Size: {benchmark['size_fp32_full']}, Execution Time: {time_fp32_full} s")
+            bt.logging.trace(
+                f"{hotkey}: FP32 trials - median {benchmark['fp32']['median']:.6f} s, "
+                f"p10 {benchmark['fp32']['p10']:.6f} s, p90 {benchmark['fp32']['p90']:.6f} s"
+            )
+            # Calculate performance metrics
+            fp16_tflops = (2 * size_fp16 ** 3) / time_fp16 / 1e12
+            fp32_tflops = (2 * size_fp32 ** 3) / time_fp32 / 1e12
+            bt.logging.trace(f"{hotkey}: [Performance Metrics] Calculated TFLOPS:")
+            bt.logging.trace(f"{hotkey}: FP16: {fp16_tflops:.2f} TFLOPS")
+            bt.logging.trace(f"{hotkey}: FP32: {fp32_tflops:.2f} TFLOPS")
+            # The benchmark reports the slowest GPU, which bounds the whole host,
+            # identified in the same pass as each of the GPUs
+            gpus = benchmark["gpus"]
+            names, margins = get_gpu_reference_table(gpu_data).identify_batch(
+                [fp16_tflops] + [(2 * size_fp16 ** 3) / gpu["time_fp16"] / 1e12 for gpu in gpus],
+                [fp32_tflops] + [(2 * size_fp32 ** 3) / gpu["time_fp32"] / 1e12 for gpu in gpus],
+                vram,
+                [gpu_name_reported] + [gpu["name"] for gpu in gpus],
+                gpu_tolerance_pairs,
+            )
+            gpu_name, per_gpu_names = names[0], names[1:]
+            bt.logging.trace(f"{hotkey}: [GPU Identification] Based on performance: {gpu_name} (margin {margins[0]:.3f})")
+            if len(set(per_gpu_names)) > 1:
+                bt.logging.info(f"⚠️  {hotkey}: Mixed GPU host {per_gpu_names}, identified by its slowest GPU as {gpu_name}.")
+
+            # Step 6-7: Run and verify the Merkle proof challenge
+            # The matrices are sized from the memory actually allocatable on every GPU
+            verification_passed, elapsed_time, gpu_timings_list = await self.run_merkle_challenge(
+                hotkey, agent, merkle_proof, hash_algorithm, usable_vram, num_gpus
+            )
+            num_gpus = len(gpu_timings_list)
+            multiplication_times = [timing.get('multiplication_time', 0.0) for _, timing in sorted(gpu_timings_list)]
+            average_multiplication_time = sum(multiplication_times) / num_gpus if num_gpus > 0 else 0.0
+
+            timing_passed = False
+            if elapsed_time < time_tol + num_gpus * time_fp32_full and average_multiplication_time < time_fp32_full:
+                timing_passed = True
+
+            if verification_passed and timing_passed:
+                bt.logging.info(f"✅ {hotkey}: GPU Identification: Detected {num_gpus} x {gpu_name} GPU(s)")
+                if gpu_name is not None and num_gpus > 0:
+                    update_pog_identity(
+                        self.db, hotkey, gpu_name, num_gpus, gpu_info["gpu_names"], usable_vram, time_fp32_full, multiplication_times
+                    )
+                return (hotkey, gpu_name, num_gpus)
+            else:
+                bt.logging.info(f"⚠️  {hotkey}: GPU Identification: Aborted due to verification failure")
+                return (hotkey, None, 0)
+
+        except Exception as e:
+            bt.logging.info(f"❌ {hotkey}: Error testing Miner: {e}")
+            return (hotkey, None, 0)
+
+        finally:
+            if agent:
+                await agent.close()
+            if transport:
+                await transport.close()
+            if allocation_status and miner_info:
+                phase_start = time.time()
+                await self.deallocate_miner(axon, public_key)
+                self.record_phase(hotkey, "deallocate", phase_start)
+
+    async def run_merkle_challenge(self, hotkey, agent, merkle_proof, hash_algorithm, vram, num_gpus):
+        """
+        Run the seeded Merkle proof challenge on the miner and verify its proofs.
+
+        :return: Tuple of (verification_passed, elapsed compute time, per-GPU timings)
+        """
+        # Step 6: Run the Merkle proof mode
+        bt.logging.trace(f"{hotkey}: [Step 6] Initiating Merkle Proof Mode.")
+        # Step 1: Send seeds and execute compute mode
+        n = adjust_matrix_size(vram, element_size=4, buffer_factor=merkle_proof.get("matrix_buffer_factor", 0.10))
+        seeds = get_random_seeds(num_gpus)
+        bt.logging.trace(f"{hotkey}: [Step 6] Compute mode executed on miner - Matrix Size: {n}, Hash: {hash_algorithm}")
+        start_time = time.time()
+        root_hashes_list, gpu_timings_list, gpu_errors = await agent.compute(
+            seeds, n, hash_algorithm, merkle_proof.get("low_memory_proof", False)
+        )
+        end_time = self.record_phase(hotkey, "compute", start_time)
+        elapsed_time = end_time - start_time
+        bt.logging.trace(f"{hotkey}: Compute mode execution time: {elapsed_time:.2f} seconds.")
+        for gpu_id, error in gpu_errors:
+            bt.logging.info(f"⚠️  {hotkey}: GPU {gpu_id} failed the compute mode: {error}")
+        bt.logging.trace(f"{hotkey}: [Merkle Proof] Root hashes received from GPUs:")
+        for gpu_id, root_hash in root_hashes_list:
+            bt.logging.trace(f"{hotkey}: GPU {{gpu_id}}: {{root_hash}}")
+
+        # Calculate total times
+        total_multiplication_time = 0.0
+        total_merkle_tree_time = 0.0
+        num_gpus = len(gpu_timings_list)
+        for _, timing in gpu_timings_list:
+            total_multiplication_time += timing.get('multiplication_time', 0.0)
+            total_merkle_tree_time += timing.get('merkle_tree_time', 0.0)
+        average_multiplication_time = total_multiplication_time / num_gpus if num_gpus > 0 else 0.0
+        average_merkle_tree_time = total_merkle_tree_time / num_gpus if num_gpus > 0 else 0.0
+        bt.logging.trace(f"{hotkey}: Average Matrix Multiplication Time: {average_multiplication_time:.4f} seconds")
+        bt.logging.trace(f"{hotkey}: Average Merkle Tree Time: {average_merkle_tree_time:.4f} seconds")
+        if num_gpus == 0:
+            return False, elapsed_time, gpu_timings_list
+
+        # Step 7: Verify merkle proof
+        root_hashes = {gpu_id: root_hash for gpu_id, root_hash in root_hashes_list}
+        gpu_timings = {gpu_id: timing for gpu_id, timing in gpu_timings_list}
+        n = gpu_timings[0]['n']  # Assuming same n for all GPUs
+        indices = {}
+        num_indices = merkle_proof.get("num_indices", 1)
+        for gpu_id in range(num_gpus):
+            indices[gpu_id] = [tuple(idx) for idx in np.random.randint(0, n, size=(num_indices, 2)).tolist()]
+        phase_start = time.time()
+        responses = await agent.proof(indices)
+        bt.logging.trace(f"{hotkey}: [Merkle Proof] Proof mode executed on miner.")
+        bt.logging.trace(f"{hotkey}: [Merkle Proof] Responses received from miner.")
+        phase_start = self.record_phase(hotkey, "proof", phase_start)
+
+        verification_passed = await self.verify_in_pool(seeds, root_hashes, responses, indices, n, hash_algorithm)
+        self.record_phase(hotkey, "verify", phase_start)
+        return verification_passed, elapsed_time, gpu_timings_list
+
+    def is_identity_reusable(self, hotkey, identity, gpu_info, merkle_proof):
+        """
+        Check whether a cached PoG identity allows skipping the benchmark and identification steps.
+
+        The identity must be younger than full_identification_interval, match the GPUs reported by
+        the miner and agree with the latest pog_stats entry.
+        """
+        interval = merkle_proof.get("full_identification_interval", 0)
+        if not identity or interval <= 0:
+            return False
+        if time.time() - identity["identified_at"] > interval:
+            return False
+        if identity["num_gpus"] != gpu_info["num_gpus"] or identity["gpu_names"] != gpu_info["gpu_names"]:
+            bt.logging.trace(f"{hotkey}: Reported GPUs differ from the cached identity.")
+            return False
+        gpu_specs = get_pog_specs(self.db, hotkey)
+        return (
+            gpu_specs is not None
+            and gpu_specs["gpu_name"] == identity["gpu_name"]
+            and gpu_specs["num_gpus"] == identity["num_gpus"]
+        )
+
+    def check_reference_times(self, identity, elapsed_time, gpu_timings_list, merkle_proof):
+        """
+        Timing check of the re-verification fast path against the cached reference times.
+
+        Applies the full identification check with the cached full-size FP32 time, and requires
+        each GPU's multiplication time to stay within reverify_time_factor of its reference.
+        """
+        time_tol = merkle_proof.get("time_tolerance", 5)
+        time_factor = merkle_proof.get("reverify_time_factor", 1.5)
+        time_slack = merkle_proof.get("reverify_time_slack", 1.0)
+        num_gpus = len(gpu_timings_list)
+        if num_gpus != identity["num_gpus"]:
+            return False
+        time_fp32 = identity["time_fp32"]
+        reference_times = identity["multiplication_times"]
+        multiplication_times = [timing.get('multiplication_time', 0.0) for _, timing in sorted(gpu_timings_list)]
+        average_multiplication_time = sum(multiplication_times) / num_gpus
+        if not (elapsed_time < time_tol + num_gpus * time_fp32 and average_multiplication_time < time_fp32):
+            return False
+        return all(
+            measured <= reference * time_factor + time_slack
+            for measured, reference in zip(multiplication_times, reference_times)
+        )
+
+    async def verify_in_pool(self, seeds, root_hashes, responses, indices, n, hash_algorithm):
+        """
+        Hand off the verification of a miner's PoG responses to the verification process pool.
+
+        Waits while the pool already holds its maximum number of pending jobs.
+
+        :return: Result of verify_responses.
+        """
+        if self.verification_slots is None:
+            self.verification_slots = asyncio.BoundedSemaphore(self.verification_workers * 2)
+        start_time = time.time()
+        try:
+            async with self.verification_slots:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self.verification_executor, verify_responses, seeds, root_hashes, responses, indices, n, hash_algorithm
+                )
+        finally:
+            # Queueing for a verification slot counts too, it is the saturation signal
+            if self.on_verification:
+                self.on_verification(time.time() - start_time)
+
+    async def allocate_miner(self, axon, private_key, public_key):
+        """
+        Allocate a miner by querying the allocator.
+
+        :param uid: Unique identifier for the axon.
+        :param axon: Axon object containing miner details.
+        :return: Dictionary with miner details if successful, None otherwise.
+        """
+        try:
+            # Define device requirements (customize as needed)
+            device_requirement = {"cpu": {"count": 1}, "gpu": {}, "hard_disk": {"capacity": 1073741824}, "ram": {"capacity": 1073741824}}
+            device_requirement["gpu"] = {"count": 1, "capacity": 0, "type": ""}
+
+            docker_requirement = {
+                "base_image": "pytorch/pytorch:2.5.1-cuda12.4-cudnn9-runtime",
+            }
+
+            # The dendrite queries run on the event loop, they do not hold an executor thread
+            async with bt.dendrite(wallet=self.wallet) as dendrite:
+                # Simulate an allocation query with Allocate
+                check_allocation = await dendrite.forward(
+                    axon,
+                    Allocate(timeline=1, device_requirement=device_requirement, checking=True),
+                    timeout=30,
+                )
+                if not (check_allocation and check_allocation["status"] is True):
+                    bt.logging.trace(f"{axon.hotkey}: Miner aready allocated or no response received.")
+                    return None
+                response = await dendrite.forward(
+                    axon,
+                    Allocate(
+                        timeline=1,
+                        device_requirement=device_requirement,
+                        checking=False,
+                        public_key=public_key,
+                        docker_requirement=docker_requirement,
+                    ),
+                    timeout=30,
+                )
+                if response and response.get("status") is True:
+                    bt.logging.trace(f"Successfully allocated miner {axon.hotkey}")
+                    decrypted_info_str = rsa.decrypt_data(
+                        private_key.encode("utf-8"),
+                        base64.b64decode(response["info"]),
+                    )
+                    info = json.loads(decrypted_info_str)
+
+                    miner_info = {
+                        'host': axon.ip,
+                        'port': info['port'],
+                        'username': info['username'],
+                        'password': info['password'],
+                    }
+                    return miner_info
+                else:
+                    bt.logging.trace(f"{axon.hotkey}: Miner allocation failed or no response received.")
+                    return None
+
+        except Exception as e:
+            bt.logging.trace(f"{axon.hotkey}: Exception during miner allocation for: {e}")
+            return None
+
+    def get_allocation_public_key(self, axon):
+        """Public key of the miner's current allocation, read from the database."""
+        try:
+            # Instantiate the connection to the database and retrieve miner details
+            db = ComputeDb()
+            cursor = db.get_cursor()
+
+            cursor.execute(
+                "SELECT details, hotkey FROM allocation WHERE hotkey = ?",
+                (axon.hotkey,)
+            )
+            row = cursor.fetchone()
+
+            if row:
+                info = json.loads(row[0])  # Parse JSON string from the 'details' column
+                return info.get("regkey")
+        except Exception as e:
+            bt.logging.trace(f"{axon.hotkey}: Missing public key: {e}")
+        return None
+
+    async def deallocate_miner(self, axon, public_key):
+        """
+        Deallocate a miner by sending a deregistration query.
+
+        :param axon: Axon object containing miner details.
+        :param public_key: Public key of the miner; if None, it will be retrieved from the database.
+        """
+        if not public_key:
+            public_key = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self.get_allocation_public_key, axon
+            )
+
+        try:
+            retry_count = 0
+            max_retries = 3
+            allocation_status = True
+
+            async with bt.dendrite(wallet=self.wallet) as dendrite:
+                while allocation_status and retry_count < max_retries:
+                    try:
+                        # Send deallocation query
+                        deregister_response = await dendrite.forward(
+                            axon,
+                            Allocate(
+                                timeline=0,
+                                checking=False,
+                                public_key=public_key,
+                            ),
+                            timeout=60,
+                        )
+
+                        if deregister_response and deregister_response.get("status") is True:
+                            allocation_status = False
+                            bt.logging.trace(f"Deallocated miner {axon.hotkey}")
+                        else:
+                            retry_count += 1
+                            bt.logging.trace(
+                                f"{axon.hotkey}: Failed to deallocate miner. "
+                                f"(attempt {retry_count}/{max_retries})"
+                            )
+                            if retry_count >= max_retries:
+                                bt.logging.trace(f"{axon.hotkey}: Max retries reached for deallocating miner.")
+                            await asyncio.sleep(5)
+                    except Exception as e:
+                        retry_count += 1
+                        bt.logging.trace(
+                            f"{axon.hotkey}: Error while trying to deallocate miner. "
+                            f"(attempt {retry_count}/{max_retries}): {e}"
+                        )
+                        if retry_count >= max_retries:
+                            bt.logging.trace(f"{axon.hotkey}: Max retries reached for deallocating miner.")
+                        await asyncio.sleep(5)
+        except Exception as e:
+            bt.logging.trace(f"{axon.hotkey}: Unexpected error during deallocation: {e}")
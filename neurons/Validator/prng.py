@@ -0,0 +1,55 @@
+import numpy as np
+
+UINT32_MASK = 0xFFFFFFFF
+XORSHIFT_ROUNDS = 10
+
+
+def xorshift32_vectorized(states, rounds=XORSHIFT_ROUNDS):
+    """
+    Apply `rounds` xorshift32 steps to an array of uint32 states.
+
+    Shifts on uint32 wrap modulo 2**32, which is equivalent to the explicit
+    `& 0xFFFFFFFF` masking done by `xorshift32_torch_` on int64 tensors.
+    """
+    x = np.array(states, dtype=np.uint32, copy=True)
+    for _ in range(rounds):
+        x ^= x << np.uint32(13)
+        x ^= x >> np.uint32(17)
+        x ^= x << np.uint32(5)
+    return x
+
+
+def generate_prng_block(s, offsets, n):
+    """
+    Generate k rows of seeded PRNG values in a single batched pass.
+
+    The seeded matrix built by `generate_matrix_torch` only depends on i + j, so
+    row i of A and column j of B are both obtained from the same sequence shifted
+    by the row (resp. column) index.
+
+    Parameters:
+        s (int): 64-bit seed of the matrix.
+        offsets (array-like): Row indices (for A) or column indices (for B).
+        n (int): Matrix size.
+
+    Returns:
+        np.ndarray: float32 array of shape (k, n), bit-identical to the matching
+        rows/columns of `generate_matrix_torch(s, n)`.
+    """
+    offsets = np.asarray(offsets, dtype=np.uint64).reshape(-1, 1)
+    base = np.uint64(int(s) & UINT32_MASK)
+    positions = np.arange(n, dtype=np.uint64).reshape(1, -1)
+    states = ((base + offsets + positions) & np.uint64(UINT32_MASK)).astype(np.uint32)
+    states = xorshift32_vectorized(states)
+    # Match torch: int -> float32 conversion, then division by float32(0xFFFFFFFF) == 2**32
+    return states.astype(np.float32) / np.float32(UINT32_MASK)
+
+
+def generate_prng_row(s, i, n):
+    """Row i of the seeded matrix generated from seed s."""
+    return generate_prng_block(s, [i], n)[0]
+
+
+def generate_prng_col(s, j, n):
+    """Column j of the seeded matrix generated from seed s."""
+    return generate_prng_block(s, [j], n)[0]
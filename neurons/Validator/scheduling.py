@@ -0,0 +1,270 @@
+import asyncio
+import random
+import time
+
+
+def backoff_delay(attempt, base, cap):
+    """
+    Exponential backoff with jitter for the given retry attempt (1-based).
+
+    The delay doubles with every attempt up to `cap` and is then drawn uniformly
+    from its upper half, so miners failing together do not retry together.
+    """
+    delay = min(base * 2 ** max(attempt - 1, 0), cap)
+    return random.uniform(delay / 2, delay)
+
+
+class MinerHealth:
+    """PoG scheduling state of a single miner."""
+
+    def __init__(self, axon, last_success=None, next_due=0.0):
+        self.axon = axon
+        self.hotkey = axon.hotkey
+        self.endpoint = (axon.ip, axon.port)
+        self.last_success = last_success
+        self.last_attempt = None
+        self.consecutive_failures = 0
+        self.first_failure = None
+        self.given_up = False
+        self.changed = last_success is None
+        self.next_due = next_due
+
+    def reset_failures(self):
+        self.consecutive_failures = 0
+        self.first_failure = None
+        self.given_up = False
+
+
+class PogScheduler:
+    """
+    Staleness-first PoG scheduler.
+
+    Keeps per-hotkey health across rounds and hands out the miners whose result
+    is the stalest, testing new or moved miners (axon IP/port change) first.
+    Failing miners are pushed back with exponential backoff until they fail
+    `retry_limit` times or for `retry_limit * retry_interval` seconds; they are
+    then given up and only retried every `refresh_interval` until they pass again.
+    The number of tests started is capped per time window so load is spread evenly.
+    """
+
+    def __init__(self, refresh_interval, retry_interval, max_retry_interval, retry_limit, window, window_budget,
+                 clock=time.time):
+        self.reconfigure(refresh_interval, retry_interval, max_retry_interval, retry_limit, window, window_budget)
+        self.clock = clock
+        self.miners = {}
+        self.in_flight = set()
+        self.window_start = clock()
+        self.window_started = 0
+
+    def reconfigure(self, refresh_interval, retry_interval, max_retry_interval, retry_limit, window, window_budget):
+        """Apply new settings, miners already scheduled keep their due time."""
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.retry_limit = max(1, retry_limit)
+        self.window = window
+        self.window_budget = window_budget
+
+    def sync(self, axons, last_successes=None, skip_hotkeys=()):
+        """
+        Align the tracked miners with the queryable axons.
+
+        :param axons: Iterable of axons currently queryable.
+        :param last_successes: Optional dict hotkey -> timestamp of the last successful test.
+        :param skip_hotkeys: Hotkeys that must not be tested (e.g. allocated miners).
+        """
+        last_successes = last_successes or {}
+        skip_hotkeys = set(skip_hotkeys)
+        seen = set()
+        for axon in axons:
+            hotkey = axon.hotkey
+            if hotkey in skip_hotkeys:
+                continue
+            seen.add(hotkey)
+            endpoint = (axon.ip, axon.port)
+            state = self.miners.get(hotkey)
+            if state is None:
+                last_success = last_successes.get(hotkey)
+                next_due = 0.0 if last_success is None else last_success + self.refresh_interval
+                self.miners[hotkey] = MinerHealth(axon, last_success, next_due)
+                continue
+            state.axon = axon
+            if state.endpoint != endpoint:
+                # The miner moved, its previous result no longer says anything about the new machine
+                state.endpoint = endpoint
+                state.changed = True
+                state.reset_failures()
+                state.next_due = 0.0
+        for hotkey in list(self.miners):
+            if hotkey not in seen:
+                del self.miners[hotkey]
+
+    def remaining_budget(self):
+        now = self.clock()
+        if now - self.window_start >= self.window:
+            self.window_start = now
+            self.window_started = 0
+        return max(self.window_budget - self.window_started, 0)
+
+    def next_due(self, limit):
+        """
+        Pick up to `limit` due miners, changed ones first, then by staleness.
+
+        :return: List of axons, marked as in flight until recorded.
+        """
+        limit = min(limit, self.remaining_budget())
+        if limit <= 0:
+            return []
+        now = self.clock()
+        due = [
+            state for hotkey, state in self.miners.items()
+            if hotkey not in self.in_flight and state.next_due <= now
+        ]
+        due.sort(key=lambda state: (not state.changed, state.next_due))
+        due = due[:limit]
+        for state in due:
+            self.in_flight.add(state.hotkey)
+            state.last_attempt = now
+        self.window_started += len(due)
+        return [state.axon for state in due]
+
+    def record_success(self, hotkey):
+        self.in_flight.discard(hotkey)
+        state = self.miners.get(hotkey)
+        if state is None:
+            return
+        now = self.clock()
+        state.last_success = now
+        state.changed = False
+        state.reset_failures()
+        state.next_due = now + self.refresh_interval
+
+    def record_failure(self, hotkey):
+        """
+        Record a failed test and back the miner off.
+
+        :return: Tuple (consecutive failures, True if the miner was given up by this failure).
+        """
+        self.in_flight.discard(hotkey)
+        state = self.miners.get(hotkey)
+        if state is None:
+            return 0, False
+        now = self.clock()
+        state.consecutive_failures += 1
+        if state.first_failure is None:
+            state.first_failure = now
+        if state.given_up:
+            state.next_due = now + self.refresh_interval
+            return state.consecutive_failures, False
+        if (
+            state.consecutive_failures >= self.retry_limit
+            or now - state.first_failure >= self.retry_limit * self.retry_interval
+        ):
+            state.given_up = True
+            state.next_due = now + self.refresh_interval
+            return state.consecutive_failures, True
+        state.next_due = now + backoff_delay(state.consecutive_failures, self.retry_interval, self.max_retry_interval)
+        return state.consecutive_failures, False
+
+
+class ConcurrencyController:
+    """
+    AIMD controller for the number of concurrent PoG sessions.
+
+    The limit grows additively while the pool is saturated and the validator is
+    healthy, and is cut multiplicatively when test timeouts, event loop lag, CPU
+    usage or verification latency exceed their thresholds.
+    """
+
+    def __init__(self, min_limit, max_limit, initial_limit, increase=1, decrease=0.5, max_timeout_rate=0.2,
+                 max_loop_lag=0.5, max_cpu_percent=90.0, max_verification_latency=30.0):
+        self.limit = initial_limit
+        self.reconfigure(min_limit, max_limit, increase, decrease, max_timeout_rate, max_loop_lag, max_cpu_percent,
+                         max_verification_latency)
+        self._reset_window()
+
+    def reconfigure(self, min_limit, max_limit, increase=1, decrease=0.5, max_timeout_rate=0.2, max_loop_lag=0.5,
+                    max_cpu_percent=90.0, max_verification_latency=30.0):
+        """Apply new settings, the current limit is kept within the new bounds."""
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = min(max(self.limit, self.min_limit), self.max_limit)
+        self.increase = increase
+        self.decrease = decrease
+        self.max_timeout_rate = max_timeout_rate
+        self.max_loop_lag = max_loop_lag
+        self.max_cpu_percent = max_cpu_percent
+        self.max_verification_latency = max_verification_latency
+
+    def _reset_window(self):
+        self.completed = 0
+        self.timeouts = 0
+        self.verification_latencies = []
+        self.loop_lag = 0.0
+
+    def record_result(self, timed_out=False):
+        self.completed += 1
+        if timed_out:
+            self.timeouts += 1
+
+    def record_verification(self, latency):
+        self.verification_latencies.append(latency)
+
+    def record_loop_lag(self, lag):
+        self.loop_lag = max(self.loop_lag, lag)
+
+    async def monitor_loop_lag(self, interval=0.5):
+        """Measure how late the event loop wakes up a sleeping task."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.record_loop_lag(loop.time() - start - interval)
+
+    def update(self, in_flight, cpu_percent):
+        """
+        Apply one control decision from the signals gathered since the previous update.
+
+        :param in_flight: Number of sessions currently running.
+        :param cpu_percent: Validator CPU usage over the window.
+        :return: Dictionary of the signals and the decision taken, for logging.
+        """
+        timeout_rate = self.timeouts / self.completed if self.completed else 0.0
+        verification_latency = (
+            sum(self.verification_latencies) / len(self.verification_latencies) if self.verification_latencies else 0.0
+        )
+        reasons = []
+        if timeout_rate > self.max_timeout_rate:
+            reasons.append("timeouts")
+        if self.loop_lag > self.max_loop_lag:
+            reasons.append("loop_lag")
+        if cpu_percent > self.max_cpu_percent:
+            reasons.append("cpu")
+        if verification_latency > self.max_verification_latency:
+            reasons.append("verification_latency")
+
+        previous_limit = self.limit
+        if reasons:
+            self.limit = max(self.min_limit, int(self.limit * self.decrease))
+            decision = "decrease"
+        elif in_flight >= self.limit:
+            # Only grow when the current limit is actually the bottleneck
+            self.limit = min(self.max_limit, self.limit + self.increase)
+            decision = "increase"
+        else:
+            decision = "hold"
+
+        metrics = {
+            "limit": self.limit,
+            "previous_limit": previous_limit,
+            "decision": decision,
+            "reasons": ",".join(reasons),
+            "in_flight": in_flight,
+            "completed": self.completed,
+            "timeout_rate": timeout_rate,
+            "loop_lag": self.loop_lag,
+            "cpu_percent": cpu_percent,
+            "verification_latency": verification_latency,
+        }
+        self._reset_window()
+        return metrics
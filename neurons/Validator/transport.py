@@ -0,0 +1,101 @@
+import asyncio
+import os
+import shutil
+import signal
+
+import asyncssh
+
+
+class MinerTransport:
+    """
+    Interface used by the PoG pipeline to reach a miner.
+
+    `start_process` returns a process exposing `stdin` (write, drain, write_eof),
+    `stdout` (readexactly) and an awaitable `wait()`, which both asyncssh and
+    asyncio subprocesses provide.
+    """
+
+    async def upload(self, local_path, remote_path):
+        raise NotImplementedError
+
+    async def run(self, command):
+        """Run a command to completion, returns (stdout, stderr) as text."""
+        raise NotImplementedError
+
+    async def start_process(self, command):
+        raise NotImplementedError
+
+    async def close(self):
+        raise NotImplementedError
+
+
+class AsyncSSHTransport(MinerTransport):
+    """Miner transport over an asyncssh connection."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    @classmethod
+    async def connect(cls, host, port, username, password, timeout=10):
+        connection = await asyncio.wait_for(
+            asyncssh.connect(host, port=port, username=username, password=password, known_hosts=None),
+            timeout=timeout,
+        )
+        return cls(connection)
+
+    async def upload(self, local_path, remote_path):
+        async with self.connection.start_sftp_client() as sftp:
+            await sftp.put(local_path, remote_path)
+
+    async def run(self, command):
+        result = await self.connection.run(command, check=False)
+        return result.stdout, result.stderr
+
+    async def start_process(self, command):
+        # Binary streams, the PoG agent protocol carries raw proof bytes
+        return await self.connection.create_process(command, encoding=None)
+
+    async def close(self):
+        self.connection.close()
+        await self.connection.wait_closed()
+
+
+class LocalProcessTransport(MinerTransport):
+    """
+    Miner transport running commands on the local machine.
+
+    Used to run simulated miners next to the validator, e.g. for load testing.
+    Processes still running when the transport closes are killed, as an SSH
+    server does when the connection drops.
+    """
+
+    def __init__(self):
+        self.processes = []
+
+    async def upload(self, local_path, remote_path):
+        await asyncio.get_running_loop().run_in_executor(None, shutil.copyfile, local_path, remote_path)
+
+    async def run(self, command):
+        process = await asyncio.create_subprocess_shell(
+            command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        return stdout.decode(errors="replace"), stderr.decode(errors="replace")
+
+    async def start_process(self, command):
+        process = await asyncio.create_subprocess_shell(
+            command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, start_new_session=True
+        )
+        self.processes.append(process)
+        return process
+
+    async def close(self):
+        for process in self.processes:
+            if process.returncode is None:
+                # The command runs in its own session, kill the shell and whatever it started
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                await process.wait()
+        self.processes.clear()
@@ -0,0 +1,128 @@
+"""
+Standalone Proof-of-GPU worker.
+
+Claims PoG jobs enqueued by the validator in the shared job table, runs the
+miner tests and writes successful results to `pog_stats`. The validator only
+enqueues jobs when `merkle_proof.pog_job_queue` is enabled in config.yaml.
+
+Run one or more workers from the validator's working directory, with the
+validator's wallet (miners only accept allocations from validators):
+
+    python neurons/pog_worker.py --wallet.name <name> --wallet.hotkey <hotkey> --worker.id worker-1
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import multiprocessing
+import os
+import socket
+
+import bittensor as bt
+
+from compute.utils.db import ComputeDb
+from neurons.Validator.database.pog import update_pog_stats
+from neurons.Validator.job_queue import PogJobQueue
+from neurons.Validator.config_service import ConfigService
+from neurons.Validator.pog_tester import PogTester
+
+
+def get_config():
+    """Set up configuration using argparse."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--netuid", type=int, default=27, help="The chain subnet uid.")
+    parser.add_argument("--worker.id", dest="worker_id", type=str, default=f"{socket.gethostname()}-{os.getpid()}",
+                        help="Identifier of this worker in the job table.")
+    parser.add_argument("--worker.sessions", dest="worker_sessions", type=int, default=16,
+                        help="Number of miner tests run concurrently by this worker.")
+    parser.add_argument("--worker.poll_interval", dest="worker_poll_interval", type=float, default=5.0,
+                        help="Seconds between two claims when the job table is empty.")
+    parser.add_argument("--config_file", type=str, default="config.yaml", help="Path to the PoG config file.")
+    bt.logging.add_args(parser)
+    bt.wallet.add_args(parser)
+    return bt.config(parser)
+
+
+async def run_session(tester, job_queue, db, config_service, worker_id, poll_interval):
+    """Claim and run jobs one at a time until cancelled."""
+    while True:
+        job = job_queue.claim(worker_id)
+        if job is None:
+            await asyncio.sleep(poll_interval)
+            continue
+
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(job_queue.lease_seconds / 3)
+                if not job_queue.heartbeat(job):
+                    bt.logging.warning(f"{job.hotkey}: Lost the lease of PoG job {job.job_id}.")
+                    return
+
+        heartbeat_task = asyncio.create_task(heartbeat())
+        timed_out = False
+        try:
+            # Set a timeout for the GPU test
+            timeout = 300  # e.g., 5 minutes
+            _, gpu_name, num_gpus = await asyncio.wait_for(tester.test_miner_gpu(job.axon, config_service.data), timeout=timeout)
+        except asyncio.TimeoutError:
+            bt.logging.warning(f"⏳ Timeout while testing {job.hotkey}.")
+            gpu_name, num_gpus, timed_out = None, 0, True
+        except Exception as e:
+            bt.logging.trace(f"Exception in worker for {job.hotkey}: {e}")
+            gpu_name, num_gpus = None, 0
+        finally:
+            heartbeat_task.cancel()
+
+        success = gpu_name is not None and num_gpus > 0
+        if not success:
+            gpu_name, num_gpus = None, None
+        # Only the lease holder reports, a result for a lost lease is dropped
+        if job_queue.complete(job, gpu_name, num_gpus, timed_out) and success:
+            update_pog_stats(db, job.hotkey, gpu_name, num_gpus)
+
+
+async def run_worker(config):
+    # Reloaded while running, jobs claimed afterwards use the new settings
+    config_service = ConfigService(config.config_file)
+    merkle_proof = config_service.data["merkle_proof"]
+    wallet = bt.wallet(config=config)
+    db = ComputeDb()
+    job_queue = PogJobQueue(
+        db,
+        lease_seconds=merkle_proof["pog_job_lease"],
+        max_attempts=merkle_proof["pog_job_max_attempts"],
+    )
+
+    def apply_config(snapshot, previous):
+        job_queue.lease_seconds = snapshot.data["merkle_proof"]["pog_job_lease"]
+        job_queue.max_attempts = snapshot.data["merkle_proof"]["pog_job_max_attempts"]
+
+    config_service.add_listener(apply_config)
+
+    cpu_cores = os.cpu_count() or 1
+    verification_workers = merkle_proof.get("verification_workers") or cpu_cores
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=(cpu_cores + 4) * 4)
+    verification_executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=verification_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    tester = PogTester(wallet, db, executor, verification_executor, verification_workers)
+
+    bt.logging.info(f"💻 PoG worker {config.worker_id} started with {config.worker_sessions} sessions.")
+    try:
+        await asyncio.gather(config_service.watch(), *[
+            run_session(tester, job_queue, db, config_service, config.worker_id, config.worker_poll_interval)
+            for _ in range(config.worker_sessions)
+        ])
+    finally:
+        verification_executor.shutdown(wait=False)
+        executor.shutdown(wait=False)
+        db.close()
+
+
+def main():
+    config = get_config()
+    bt.logging(config=config)
+    asyncio.run(run_worker(config))
+
+
+if __name__ == "__main__":
+    main()
@@ -18,14 +18,12 @@
 
 import ast
 import asyncio
-import base64
-import json
 import os
 import random
 import threading
 import traceback
 import hashlib
-import numpy as np
+import psutil
 import yaml
 import multiprocessing
 from asyncio import AbstractEventLoop
@@ -33,17 +31,13 @@ from typing import Dict, Tuple, List
 
 import bittensor as bt
 import math
-import time
-import paramiko
 
 import cryptography
 import torch
 from cryptography.fernet import Fernet
 from torch._C._te import Tensor # type: ignore
-import RSAEncryption as rsa
-from neurons.Validator.database.pog import get_pog_specs, update_pog_stats
+from neurons.Validator.database.pog import get_pog_last_successes, get_pog_specs, update_pog_stats
 import concurrent.futures
-from collections import defaultdict
 
 import Validator.app_generator as ag
 from compute import (
@@ -54,7 +48,7 @@ from compute import (
     weights_rate_limit
     )
 from compute.axon import ComputeSubnetSubtensor
-from compute.protocol import Allocate, Challenge, Specs
+from compute.protocol import Challenge, Specs
 from compute.utils.db import ComputeDb
 from compute.utils.math import percent, force_to_float_or_default
 from compute.utils.parser import ComputeArgPaser
@@ -65,7 +59,10 @@ from neurons.Validator.calculate_pow_score import calc_score_pog
 from neurons.Validator.database.allocate import update_miner_details, select_has_docker_miners_hotkey, get_miner_details
 from neurons.Validator.database.challenge import select_challenge_stats, update_challenge_details
 from neurons.Validator.database.miner import select_miners, purge_miner_entries, update_miners
-from neurons.Validator.pog import adjust_matrix_size, compute_script_hash, execute_script_on_miner, get_random_seeds, load_yaml_config, parse_merkle_output, receive_responses, send_challenge_indices, send_script_and_request_hash, parse_benchmark_output, identify_gpu, send_seeds, verify_merkle_proof_row, get_remote_gpu_info, verify_responses
+from neurons.Validator.scheduling import ConcurrencyController, PogScheduler
+from neurons.Validator.config_service import ConfigService
+from neurons.Validator.job_queue import PogJobQueue
+from neurons.Validator.pog_tester import PogTester
 
 
 class Validator:
@@ -127,6 +124,11 @@ class Validator:
     def current_block(self):
         return get_current_block(subtensor=self.subtensor)
 
+    @property
+    def config_data(self):
+        """Current config.yaml snapshot, read-only and replaced when the file changes."""
+        return self.config_service.data
+
     @property
     def miners_items_to_set(self):
         return set((uid, hotkey) for uid, hotkey in self.miners.items()) if self.miners else None
@@ -183,15 +185,41 @@ class Validator:
         self.wandb = ComputeWandb(self.config, self.wallet, os.path.basename(__file__))
 
         # STEP 2B: Init Proof of GPU
-        # Load configuration from YAML
+        # Load configuration from YAML, reloaded while running when the file changes
         config_file = "config.yaml"
-        self.config_data = load_yaml_config(config_file)
+        self.config_service = ConfigService(config_file)
+        self.config_task = None
         cpu_cores = os.cpu_count() or 1
-        configured_max_workers = self.config_data["merkle_proof"].get("max_workers", 32)
+        configured_max_workers = self.config_data["merkle_proof"]["max_workers"]
         safe_max_workers = min((cpu_cores + 4)*4, configured_max_workers)
+        # Only short blocking calls (key generation, database reads) use threads, allocations are async dendrite queries
         self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=safe_max_workers)
+        # CPU-bound PoG verification runs in a separate process pool, away from the SSH/IO threads
+        verification_workers = self.config_data["merkle_proof"].get("verification_workers") or cpu_cores
+        self.verification_executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=verification_workers, mp_context=multiprocessing.get_context("spawn")
+        )
         self.results = {}
         self.gpu_task = None  # Track the GPU task
+        self.deallocation_tasks = set()  # Deallocations of miners whose GPU specs changed
+        # Per-miner PoG state, kept across restarts of the PoG task
+        merkle_proof = self.config_data["merkle_proof"]
+        # Concurrent PoG sessions adapt between pog_min_workers and max_workers, starting from the former static limit
+        self.pog_concurrency = ConcurrencyController(
+            initial_limit=safe_max_workers, **self.pog_concurrency_settings(merkle_proof)
+        )
+        self.pog_job_queue = PogJobQueue(
+            self.db,
+            lease_seconds=merkle_proof["pog_job_lease"],
+            max_attempts=merkle_proof["pog_job_max_attempts"],
+        )
+        self.pog_tester = PogTester(
+            self.wallet, self.db, self.executor, self.verification_executor, verification_workers,
+            on_verification=self.pog_concurrency.record_verification,
+        )
+        self.pog_scheduler = PogScheduler(**self.pog_scheduler_settings(merkle_proof))
+        self.config_service.add_listener(self.apply_config)
+        self.rescore_pending = False  # Set when a config reload changed the GPU scores
 
         # Step 3: Set up initial scoring weights for validation
         bt.logging.info("Building validation weights.")
@@ -265,6 +293,52 @@ class Validator:
         self._metagraph = self.subtensor.metagraph(self.config.netuid)
         self.uids = self.metagraph.uids.tolist()
 
+    @staticmethod
+    def pog_concurrency_settings(merkle_proof):
+        return dict(
+            min_limit=merkle_proof["pog_min_workers"],
+            max_limit=merkle_proof["max_workers"],
+            increase=merkle_proof["pog_concurrency_increase"],
+            decrease=merkle_proof["pog_concurrency_decrease"],
+            max_timeout_rate=merkle_proof["pog_max_timeout_rate"],
+            max_loop_lag=merkle_proof["pog_max_loop_lag"],
+            max_cpu_percent=merkle_proof["pog_max_cpu_percent"],
+            max_verification_latency=merkle_proof["pog_max_verification_latency"],
+        )
+
+    @staticmethod
+    def pog_scheduler_settings(merkle_proof):
+        return dict(
+            refresh_interval=merkle_proof["pog_refresh_interval"],
+            retry_interval=merkle_proof["pog_retry_interval"],
+            max_retry_interval=merkle_proof["pog_max_retry_interval"],
+            retry_limit=merkle_proof["pog_retry_limit"],
+            window=merkle_proof["pog_window"],
+            window_budget=merkle_proof["pog_window_budget"],
+        )
+
+    def apply_config(self, snapshot, previous):
+        """
+        Apply a reloaded config.yaml to the running validator.
+
+        PoG concurrency and scheduling settings take effect immediately, new miner tests
+        use the new snapshot and scores are recomputed with the next weight update.
+        Thread and process pool sizes, verification_workers and pog_job_queue still
+        need a restart.
+        """
+        merkle_proof = snapshot.data["merkle_proof"]
+        self.pog_concurrency.reconfigure(**self.pog_concurrency_settings(merkle_proof))
+        self.pog_scheduler.reconfigure(**self.pog_scheduler_settings(merkle_proof))
+        self.pog_job_queue.lease_seconds = merkle_proof["pog_job_lease"]
+        self.pog_job_queue.max_attempts = merkle_proof["pog_job_max_attempts"]
+        for key in ("verification_workers", "pog_job_queue"):
+            if merkle_proof.get(key) != previous.data["merkle_proof"].get(key):
+                bt.logging.warning(f"⚠️ merkle_proof.{key} changed, it only takes effect after a restart.")
+        if snapshot.score_lookup != previous.score_lookup:
+            # The full rescore queries wandb, it runs with the next weight update rather than on the event loop here
+            bt.logging.info("🔢 GPU scores changed, scores are recomputed before the next weights.")
+            self.rescore_pending = True
+
     def init_scores(self):
         self.scores = torch.zeros(len(self.uids), dtype=torch.float32)
         # Set the weights of validators to zero.
@@ -312,21 +386,33 @@ class Validator:
         except Exception as e:
             bt.logging.info(f"Error updating wandb : {e}")
 
-    def sync_scores(self):
-        # Fetch scoring stats
-        self.stats = select_challenge_stats(self.db)
+    def sync_allocations(self):
+        """
+        Refresh the allocated and penalized hotkeys from wandb.
 
+        :return: Hotkeys whose allocation status changed, their score multiplier changed with it.
+        """
         valid_validator_hotkeys = self.get_valid_validator_hotkeys()
 
         self.update_allocation_wandb()
 
         # Fetch allocated hotkeys
+        previous_allocated = set(self.allocated_hotkeys)
         self.allocated_hotkeys = self.wandb.get_allocated_hotkeys(valid_validator_hotkeys, True)
         # bt.logging.info(f"Allocated hotkeys: {self.allocated_hotkeys}")
 
         # Fetch penalized hotkeys
         self.penalized_hotkeys = self.wandb.get_penalized_hotkeys(valid_validator_hotkeys, True)
 
+        return previous_allocated.symmetric_difference(self.allocated_hotkeys)
+
+    def sync_scores(self):
+        self.rescore_pending = False
+        # Fetch scoring stats
+        self.stats = select_challenge_stats(self.db)
+
+        self.sync_allocations()
+
         # Fetch docker requirement
         has_docker_hotkeys = select_has_docker_miners_hotkey(self.db)
 
@@ -334,7 +420,8 @@ class Validator:
 
         self._queryable_uids = self.get_queryable()
 
-        # Calculate score
+        # Calculate score, every miner against the same config snapshot
+        snapshot = self.config_service.snapshot
         for uid in self.uids:
             try:
                 axon = self._queryable_uids[uid]
@@ -353,7 +440,9 @@ class Validator:
                 gpu_specs = get_pog_specs(self.db, hotkey)
 
                 if gpu_specs is not None:
-                    score = calc_score_pog(gpu_specs, hotkey, self.allocated_hotkeys, self.config_data)
+                    score = calc_score_pog(
+                        gpu_specs, hotkey, self.allocated_hotkeys, snapshot.data, score_lookup=snapshot.score_lookup
+                    )
                 else:
                     score = 0
 
@@ -373,6 +462,29 @@ class Validator:
 
         bt.logging.info(f"🔢 Synced scores : {self.scores.tolist()}")
 
+    def update_score(self, hotkey):
+        """
+        Recompute the score of a single miner from its latest PoG result, as sync_scores does.
+        """
+        uid = next((uid for uid, axon in self._queryable_uids.items() if axon.hotkey == hotkey), None)
+        if uid is None or uid >= len(self.scores):
+            return
+        try:
+            gpu_specs = get_pog_specs(self.db, hotkey)
+            if gpu_specs is not None:
+                snapshot = self.config_service.snapshot
+                score = calc_score_pog(
+                    gpu_specs, hotkey, self.allocated_hotkeys, snapshot.data, score_lookup=snapshot.score_lookup
+                )
+            else:
+                score = 0
+        except Exception as e:
+            bt.logging.trace(f"An unexpected exception occurred for UID {uid}: {str(e)}")
+            score = 0
+
+        self.stats.setdefault(uid, {})["score"] = score
+        self.scores[uid] = score
+
     def sync_local(self):
         """
         Resync our local state with the latest state from the blockchain.
@@ -573,7 +685,10 @@ class Validator:
                         bt.logging.info(f"GPU specs changed for allocated hotkey {hotkey}:")
                         bt.logging.info(f"Old count: {current_count}, Old name: {current_name}")
                         bt.logging.info(f"New count: {new_count}, New name: {new_name}")
-                        self.deallocate_miner(axon, None)
+                        # Runs on the validator loop, keep a reference until the deallocation is done
+                        task = self.loop.create_task(self.pog_tester.deallocate_miner(axon, None))
+                        self.deallocation_tasks.add(task)
+                        task.add_done_callback(self.deallocation_tasks.discard)
 
         # Update the local db with the new data from Wandb
         update_miner_details(self.db, list(specs_dict.keys()), list(specs_dict.values()))
@@ -594,47 +709,57 @@ class Validator:
 
     async def proof_of_gpu(self):
         """
-        Perform Proof-of-GPU benchmarking on allocated miners without overlapping tests.
-        Uses asyncio with ThreadPoolExecutor to test miners in parallel.
+        Continuously perform Proof-of-GPU benchmarking on non-allocated miners.
+        The scheduler hands out changed and stalest miners first, within a per-window budget.
+        Miner tests are coroutines; their number adapts to the validator load, up to max_workers.
+        With pog_job_queue enabled, tests are enqueued in the job table for PoG worker processes instead.
+        Settings are read from the current config snapshot, so a reloaded config.yaml applies to the next round.
         """
         try:
-            self._queryable_uids = self.get_queryable()
-
             # Settings
             merkle_proof = self.config_data["merkle_proof"]
-            retry_limit = merkle_proof.get("pog_retry_limit",30)
-            retry_interval = merkle_proof.get("pog_retry_interval",75)
-            num_workers = merkle_proof.get("max_workers",32)
-            max_delay = merkle_proof.get("max_random_delay",1200)
+            num_workers = merkle_proof["max_workers"]
+            max_delay = merkle_proof["max_random_delay"]
+            use_job_queue = merkle_proof["pog_job_queue"]
 
             # Random delay for PoG
             delay = random.uniform(0, max_delay)  # Random delay
             bt.logging.info(f"💻⏳ Scheduled Proof-of-GPU task to start in {delay:.2f} seconds.")
             await asyncio.sleep(delay)
 
-            bt.logging.info(f"💻 Starting Proof-of-GPU benchmarking for uids: {list(self._queryable_uids.keys())}")
-            # Shared dictionary to store results
-            self.results = {}
-            # Dictionary to track retry counts
-            retry_counts = defaultdict(int)
-            # Queue of miners to process
+            if not hasattr(self, "_queryable_uids"):
+                self._queryable_uids = self.get_queryable()
+            bt.logging.info(f"💻 Starting continuous Proof-of-GPU benchmarking for uids: {list(self._queryable_uids.keys())}")
+            # Queue of miners handed out by the scheduler
             queue = asyncio.Queue()
 
-            # Initialize the queue with initial miners
-            for i in range(0, len(self.uids), self.validator_challenge_batch_size):
-                for _uid in self.uids[i : i + self.validator_challenge_batch_size]:
-                    try:
-                        axon = self._queryable_uids[_uid]
-                        if axon.hotkey in self.allocated_hotkeys:
-                            bt.logging.info(f"Skipping allocated miner: {axon.hotkey}")
-                            continue  # skip this miner since it's allocated
-                        await queue.put(axon)
-                    except KeyError:
-                        continue
-
             # Initialize a single Lock for thread-safe updates to results
             results_lock = asyncio.Lock()
 
+            def record_failure(hotkey, reason=""):
+                failures, gave_up = self.pog_scheduler.record_failure(hotkey)
+                if gave_up:
+                    bt.logging.info(f"❌ {hotkey}: Miner failed after {failures} attempts{reason}.")
+                    update_pog_stats(self.db, hotkey, None, None)
+                    self.update_score(hotkey)
+                elif getattr(self.pog_scheduler.miners.get(hotkey), "given_up", False):
+                    bt.logging.debug(f"🔄 {hotkey}: Miner still failing, retrying after the refresh interval (Attempt {failures})")
+                else:
+                    bt.logging.info(f"🔄 {hotkey}: Retrying miner with backoff -> (Attempt {failures})")
+
+            async def record_result(hotkey, gpu_name, num_gpus, timed_out=False):
+                if gpu_name is not None and num_gpus > 0:
+                    async with results_lock:
+                        self.results[hotkey] = {
+                            "gpu_name": gpu_name,
+                            "num_gpus": num_gpus
+                        }
+                    self.update_score(hotkey)
+                    self.pog_scheduler.record_success(hotkey)
+                else:
+                    record_failure(hotkey, " (Timeout)" if timed_out else "")
+                self.pog_concurrency.record_result(timed_out=timed_out)
+
             async def worker():
                 while True:
                     try:
@@ -646,62 +771,81 @@ class Validator:
                         # Set a timeout for the GPU test
                         timeout = 300  # e.g., 5 minutes
                         result = await asyncio.wait_for(
-                            asyncio.get_event_loop().run_in_executor(
-                                self.executor, self.test_miner_gpu, axon, self.config_data
-                            ),
+                            self.pog_tester.test_miner_gpu(axon, self.config_data),
                             timeout=timeout
                         )
                         if result[1] is not None and result[2] > 0:
-                            async with results_lock:
-                                self.results[hotkey] = {
-                                    "gpu_name": result[1],
-                                    "num_gpus": result[2]
-                                }
                             update_pog_stats(self.db, hotkey, result[1], result[2])
+                            await record_result(hotkey, result[1], result[2])
                         else:
                             raise RuntimeError("GPU test failed")
                     except asyncio.TimeoutError:
-                        bt.logging.warning(f"⏳ Timeout while testing {hotkey}. Retrying...")
-                        retry_counts[hotkey] += 1
-                        if retry_counts[hotkey] < retry_limit:
-                            bt.logging.info(f"🔄 {hotkey}: Retrying miner -> (Attempt {retry_counts[hotkey]})")
-                            await asyncio.sleep(retry_interval)
-                            await queue.put(axon)
-                        else:
-                            bt.logging.info(f"❌ {hotkey}: Miner failed after {retry_limit} attempts (Timeout).")
-                            update_pog_stats(self.db, hotkey, None, None)
+                        bt.logging.warning(f"⏳ Timeout while testing {hotkey}.")
+                        await record_result(hotkey, None, 0, timed_out=True)
                     except Exception as e:
                         bt.logging.trace(f"Exception in worker for {hotkey}: {e}")
-                        retry_counts[hotkey] += 1
-                        if retry_counts[hotkey] < retry_limit:
-                            bt.logging.info(f"🔄 {hotkey}: Retrying miner -> (Attempt {retry_counts[hotkey]})")
-                            await asyncio.sleep(retry_interval)
-                            await queue.put(axon)
-                        else:
-                            bt.logging.info(f"❌ {hotkey}: Miner failed after {retry_limit} attempts.")
-                            update_pog_stats(self.db, hotkey, None, None)
+                        await record_result(hotkey, None, 0)
                     finally:
                         queue.task_done()
 
-            # Number of concurrent workers
-            # Determine a safe default number of workers
-            cpu_cores = os.cpu_count() or 1
-            safe_max_workers = min((cpu_cores + 4)*4, num_workers)
-
-            workers = [asyncio.create_task(worker()) for _ in range(safe_max_workers)]
-            bt.logging.trace(f"Started {safe_max_workers} worker tasks for Proof-of-GPU benchmarking.")
-
-            # Wait until the queue is fully processed
-            await queue.join()
+            if use_job_queue:
+                # Jobs left by a previous run are still being worked on
+                self.pog_scheduler.in_flight.update(self.pog_job_queue.active_hotkeys())
+                workers = []
+                bt.logging.trace("Enqueuing Proof-of-GPU jobs for PoG worker processes.")
+            else:
+                # Up to max_workers sessions, the concurrency controller decides how many are handed out
+                workers = [asyncio.create_task(worker()) for _ in range(num_workers)]
+                bt.logging.trace(f"Started {num_workers} worker tasks for Proof-of-GPU benchmarking.")
+            workers.append(asyncio.create_task(self.pog_concurrency.monitor_loop_lag()))
+            num_worker_tasks = 0 if use_job_queue else num_workers
+            psutil.cpu_percent(interval=None)  # Start the CPU usage window
 
-            # Cancel worker tasks
-            for w in workers:
-                w.cancel()
-            # Wait until all worker tasks are cancelled
-            await asyncio.gather(*workers, return_exceptions=True)
+            try:
+                while True:
+                    merkle_proof = self.config_data["merkle_proof"]
+                    if use_job_queue:
+                        # Worker processes already stored successful results in pog_stats
+                        for hotkey, gpu_name, num_gpus, timed_out in self.pog_job_queue.collect_results():
+                            await record_result(hotkey, gpu_name, num_gpus or 0, timed_out)
+                    else:
+                        # max_workers may have been raised by a config reload, extra workers stay idle when lowered
+                        while num_worker_tasks < merkle_proof["max_workers"]:
+                            workers.append(asyncio.create_task(worker()))
+                            num_worker_tasks += 1
 
-            bt.logging.success(f"✅ Proof-of-GPU benchmarking completed.")
-            return self.results
+                    metrics = self.pog_concurrency.update(
+                        len(self.pog_scheduler.in_flight), psutil.cpu_percent(interval=None)
+                    )
+                    if metrics["decision"] != "hold":
+                        bt.logging.info(
+                            f"💻 PoG concurrency {metrics['decision']}: {metrics['previous_limit']} -> {metrics['limit']} "
+                            f"(timeouts {metrics['timeout_rate']:.0%}, loop lag {metrics['loop_lag']:.2f}s, "
+                            f"CPU {metrics['cpu_percent']:.0f}%, verification {metrics['verification_latency']:.1f}s)"
+                        )
+                    self.wandb.log_pog_metrics(metrics)
+
+                    axons = list(self._queryable_uids.values())
+                    # Seed new miners with the age of their latest stored result
+                    last_successes = None
+                    if any(axon.hotkey not in self.pog_scheduler.miners for axon in axons):
+                        last_successes = get_pog_last_successes(self.db)
+                    self.pog_scheduler.sync(axons, last_successes, skip_hotkeys=self.allocated_hotkeys)
+
+                    free_workers = self.pog_concurrency.limit - len(self.pog_scheduler.in_flight)
+                    for axon in self.pog_scheduler.next_due(free_workers):
+                        if use_job_queue:
+                            self.pog_job_queue.enqueue(axon)
+                        else:
+                            await queue.put(axon)
+                    await asyncio.sleep(merkle_proof["pog_schedule_interval"])
+            finally:
+                # Cancel worker tasks
+                for w in workers:
+                    w.cancel()
+                # Wait until all worker tasks are cancelled
+                await asyncio.gather(*workers, return_exceptions=True)
+                self.pog_scheduler.in_flight.clear()
         except Exception as e:
             bt.logging.info(f"❌ Exception in proof_of_gpu: {e}\n{traceback.format_exc()}")
 
@@ -716,287 +860,6 @@ class Validator:
             bt.logging.error(f"Proof-of-GPU task failed: {e}")
             self.gpu_task = None
 
-    def test_miner_gpu(self, axon, config_data):
-        """
-        Allocate, test, and deallocate a single miner.
-
-        :return: Tuple of (miner_hotkey, gpu_name, num_gpus)
-        """
-        allocation_status = False
-        miner_info = None
-        host = None  # Initialize host variable
-        hotkey = axon.hotkey
-        bt.logging.trace(f"{hotkey}: Starting miner test.")
-
-        try:
-            # Step 0: Init
-            gpu_data = config_data["gpu_performance"]
-            gpu_tolerance_pairs = gpu_data.get("gpu_tolerance_pairs", {})
-            # Extract Merkle Proof Settings
-            merkle_proof = config_data["merkle_proof"]
-            time_tol = merkle_proof.get("time_tolerance",5)
-            # Extract miner_script path
-            miner_script_path = merkle_proof["miner_script_path"]
-
-            # Step 1: Allocate Miner
-            # Generate RSA key pair
-            private_key, public_key = rsa.generate_key_pair()
-            allocation_response = self.allocate_miner(axon, private_key, public_key)
-            if not allocation_response:
-                bt.logging.info(f"🌀 {hotkey}: Busy or not allocatable.")
-                return (hotkey, None, 0)
-            allocation_status = True
-            miner_info = allocation_response
-            host = miner_info['host']
-            bt.logging.trace(f"{hotkey}: Allocated Miner for testing.")
-
-            # Step 2: Connect via SSH
-            ssh_client = paramiko.SSHClient()
-            ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            bt.logging.trace(f"{hotkey}: Connect to Miner via SSH.")
-            ssh_client.connect(host, port=miner_info.get('port', 22), username=miner_info['username'], password=miner_info['password'], timeout=10)
-            if not (ssh_client):
-                ssh_client.close()
-                bt.logging.info(f"{hotkey}: SSH connection failed.")
-                return (hotkey, None, -1)
-            bt.logging.trace(f"{hotkey}: Connected to Miner via SSH.")
-
-            # Step 3: Hash Check
-            local_hash = compute_script_hash(miner_script_path)
-            bt.logging.trace(f"{hotkey}: [Step 1] Local script hash computed successfully.")
-            bt.logging.trace(f"{hotkey}: Local Hash: {local_hash}")
-            remote_hash = send_script_and_request_hash(ssh_client, miner_script_path)
-            if local_hash != remote_hash:
-                bt.logging.info(f"{hotkey}: [Integrity Check] FAILURE: Hash mismatch detected.")
-                raise ValueError(f"{hotkey}: Script integrity verification failed.")
-
-            # Step 4: Get GPU info NVIDIA from the remote miner
-            bt.logging.trace(f"{hotkey}: [Step 4] Retrieving GPU information (NVIDIA driver) from miner...")
-            gpu_info = get_remote_gpu_info(ssh_client)
-            num_gpus_reported = gpu_info["num_gpus"]
-            gpu_name_reported = gpu_info["gpu_names"][0] if num_gpus_reported > 0 else None
-            bt.logging.trace(f"{hotkey}: [Step 4] Reported GPU Information:")
-            if num_gpus_reported > 0:
-                bt.logging.trace(f"{hotkey}: Number of GPUs: {num_gpus_reported}")
-                bt.logging.trace(f"{hotkey}: GPU Type: {gpu_name_reported}")
-            if num_gpus_reported <= 0:
-                bt.logging.info(f"{hotkey}: No GPUs detected.")
-                raise ValueError("No GPUs detected.")
-
-            # Step 5: Run the benchmarking mode
-            bt.logging.info(f"💻 {hotkey}: Executing benchmarking mode.")
-            bt.logging.trace(f"{hotkey}: [Step 5] Executing benchmarking mode on the miner...")
-            execution_output = execute_script_on_miner(ssh_client, mode='benchmark')
-            bt.logging.trace(f"{hotkey}: [Step 5] Benchmarking completed.")
-            # Parse the execution output
-            num_gpus, vram, size_fp16, time_fp16, size_fp32, time_fp32 = parse_benchmark_output(execution_output)
-            bt.logging.trace(f"{hotkey}: [Benchmark Results] Detected {num_gpus} GPU(s) with {vram} GB unfractured VRAM.")
-            bt.logging.trace(f"{hotkey}: FP16 - Matrix Size: {size_fp16}, Execution Time: {time_fp16} s")
-            bt.logging.trace(f"{hotkey}: FP32 - Matrix Size: {size_fp32}, Execution Time: {time_fp32} s")
-            # Calculate performance metrics
-            fp16_tflops = (2 * size_fp16 ** 3) / time_fp16 / 1e12
-            fp32_tflops = (2 * size_fp32 ** 3) / time_fp32 / 1e12
-            bt.logging.trace(f"{hotkey}: [Performance Metrics] Calculated TFLOPS:")
-            bt.logging.trace(f"{hotkey}: FP16: {fp16_tflops:.2f} TFLOPS")
-            bt.logging.trace(f"{hotkey}: FP32: {fp32_tflops:.2f} TFLOPS")
-            gpu_name = identify_gpu(fp16_tflops, fp32_tflops, vram, gpu_data, gpu_name_reported, gpu_tolerance_pairs)
-            bt.logging.trace(f"{hotkey}: [GPU Identification] Based on performance: {gpu_name}")
-
-            # Step 6: Run the Merkle proof mode
-            bt.logging.trace(f"{hotkey}: [Step 6] Initiating Merkle Proof Mode.")
-            # Step 1: Send seeds and execute compute mode
-            n = adjust_matrix_size(vram, element_size=4, buffer_factor=0.10)
-            seeds = get_random_seeds(num_gpus)
-            send_seeds(ssh_client, seeds, n)
-            bt.logging.trace(f"{hotkey}: [Step 6] Compute mode executed on miner - Matrix Size: {n}")
-            start_time = time.time()
-            execution_output = execute_script_on_miner(ssh_client, mode='compute')
-            end_time = time.time()
-            elapsed_time = end_time - start_time
-            bt.logging.trace(f"{hotkey}: Compute mode execution time: {elapsed_time:.2f} seconds.")
-            # Parse the execution output
-            root_hashes_list, gpu_timings_list = parse_merkle_output(execution_output)
-            bt.logging.trace(f"{hotkey}: [Merkle Proof] Root hashes received from GPUs:")
-            for gpu_id, root_hash in root_hashes_list:
-                bt.logging.trace(f"{hotkey}: GPU {{gpu_id}}: {{root_hash}}")
-
-            # Calculate total times
-            total_multiplication_time = 0.0
-            total_merkle_tree_time = 0.0
-            num_gpus = len(gpu_timings_list)
-            for _, timing in gpu_timings_list:
-                total_multiplication_time += timing.get('multiplication_time', 0.0)
-                total_merkle_tree_time += timing.get('merkle_tree_time', 0.0)
-            average_multiplication_time = total_multiplication_time / num_gpus if num_gpus > 0 else 0.0
-            average_merkle_tree_time = total_merkle_tree_time / num_gpus if num_gpus > 0 else 0.0
-            bt.logging.trace(f"{hotkey}: Average Matrix Multiplication Time: {average_multiplication_time:.4f} seconds")
-            bt.logging.trace(f"{hotkey}: Average Merkle Tree Time: {average_merkle_tree_time:.4f} seconds")
-
-            timing_passed = False
-            if elapsed_time < time_tol + num_gpus * time_fp32 and average_multiplication_time < time_fp32:
-                timing_passed = True
-
-            # Step 7: Verify merkle proof
-            root_hashes = {gpu_id: root_hash for gpu_id, root_hash in root_hashes_list}
-            gpu_timings = {gpu_id: timing for gpu_id, timing in gpu_timings_list}
-            n = gpu_timings[0]['n']  # Assuming same n for all GPUs
-            indices = {}
-            num_indices = 1
-            for gpu_id in range(num_gpus):
-                indices[gpu_id] = [(np.random.randint(0, n), np.random.randint(0, n)) for _ in range(num_indices)]
-            send_challenge_indices(ssh_client, indices)
-            execution_output = execute_script_on_miner(ssh_client, mode='proof')
-            bt.logging.trace(f"{hotkey}: [Merkle Proof] Proof mode executed on miner.")
-            responses = receive_responses(ssh_client, num_gpus)
-            bt.logging.trace(f"{hotkey}: [Merkle Proof] Responses received from miner.")
-
-            verification_passed = verify_responses(seeds, root_hashes, responses, indices, n)
-            if verification_passed and timing_passed:
-                bt.logging.info(f"✅ {hotkey}: GPU Identification: Detected {num_gpus} x {gpu_name} GPU(s)")
-                return (hotkey, gpu_name, num_gpus)
-            else:
-                bt.logging.info(f"⚠️  {hotkey}: GPU Identification: Aborted due to verification failure")
-                return (hotkey, None, 0)
-
-        except Exception as e:
-            bt.logging.info(f"❌ {hotkey}: Error testing Miner: {e}")
-            return (hotkey, None, 0)
-
-        finally:
-            if allocation_status and miner_info:
-                self.deallocate_miner(axon, public_key)
-
-    def allocate_miner(self, axon, private_key, public_key):
-        """
-        Allocate a miner by querying the allocator.
-
-        :param uid: Unique identifier for the axon.
-        :param axon: Axon object containing miner details.
-        :return: Dictionary with miner details if successful, None otherwise.
-        """
-        try:
-            dendrite = bt.dendrite(wallet=self.wallet)
-
-            # Define device requirements (customize as needed)
-            device_requirement = {"cpu": {"count": 1}, "gpu": {}, "hard_disk": {"capacity": 1073741824}, "ram": {"capacity": 1073741824}}
-            device_requirement["gpu"] = {"count": 1, "capacity": 0, "type": ""}
-
-            docker_requirement = {
-                "base_image": "pytorch/pytorch:2.5.1-cuda12.4-cudnn9-runtime",
-            }
-
-            # Simulate an allocation query with Allocate
-            check_allocation = dendrite.query(
-                axon,
-                Allocate(timeline=1, device_requirement=device_requirement, checking=True),
-                timeout=30,
-                )
-            if check_allocation  and check_allocation ["status"] is True:
-                response = dendrite.query(
-                    axon,
-                    Allocate(
-                        timeline=1,
-                        device_requirement=device_requirement,
-                        checking=False,
-                        public_key=public_key,
-                        docker_requirement=docker_requirement,
-                    ),
-                    timeout=30,
-                )
-                if response and response.get("status") is True:
-                    bt.logging.trace(f"Successfully allocated miner {axon.hotkey}")
-                    decrypted_info_str = rsa.decrypt_data(
-                        private_key.encode("utf-8"),
-                        base64.b64decode(response["info"]),
-                    )
-                    info = json.loads(decrypted_info_str)
-
-                    miner_info = {
-                        'host': axon.ip,
-                        'port': info['port'],
-                        'username': info['username'],
-                        'password': info['password'],
-                    }
-                    return miner_info
-                else:
-                    bt.logging.trace(f"{axon.hotkey}: Miner allocation failed or no response received.")
-                    return None
-            else:
-                bt.logging.trace(f"{axon.hotkey}: Miner aready allocated or no response received.")
-                return None
-
-        except Exception as e:
-            bt.logging.trace(f"{axon.hotkey}: Exception during miner allocation for: {e}")
-            return None
-
-    def deallocate_miner(self, axon, public_key):
-        """
-        Deallocate a miner by sending a deregistration query.
-
-        :param axon: Axon object containing miner details.
-        :param public_key: Public key of the miner; if None, it will be retrieved from the database.
-        """
-        if not public_key:
-            try:
-                # Instantiate the connection to the database and retrieve miner details
-                db = ComputeDb()
-                cursor = db.get_cursor()
-
-                cursor.execute(
-                    "SELECT details, hotkey FROM allocation WHERE hotkey = ?",
-                    (axon.hotkey,)
-                )
-                row = cursor.fetchone()
-
-                if row:
-                    info = json.loads(row[0])  # Parse JSON string from the 'details' column
-                    public_key = info.get("regkey")
-            except Exception as e:
-                bt.logging.trace(f"{axon.hotkey}: Missing public key: {e}")
-
-        try:
-            dendrite = bt.dendrite(wallet=self.wallet)
-            retry_count = 0
-            max_retries = 3
-            allocation_status = True
-
-            while allocation_status and retry_count < max_retries:
-                try:
-                    # Send deallocation query
-                    deregister_response = dendrite.query(
-                        axon,
-                        Allocate(
-                            timeline=0,
-                            checking=False,
-                            public_key=public_key,
-                        ),
-                        timeout=60,
-                    )
-
-                    if deregister_response and deregister_response.get("status") is True:
-                        allocation_status = False
-                        bt.logging.trace(f"Deallocated miner {axon.hotkey}")
-                    else:
-                        retry_count += 1
-                        bt.logging.trace(
-                            f"{axon.hotkey}: Failed to deallocate miner. "
-                            f"(attempt {retry_count}/{max_retries})"
-                        )
-                        if retry_count >= max_retries:
-                            bt.logging.trace(f"{axon.hotkey}: Max retries reached for deallocating miner.")
-                        time.sleep(5)
-                except Exception as e:
-                    retry_count += 1
-                    bt.logging.trace(
-                        f"{axon.hotkey}: Error while trying to deallocate miner. "
-                        f"(attempt {retry_count}/{max_retries}): {e}"
-                    )
-                    if retry_count >= max_retries:
-                        bt.logging.trace(f"{axon.hotkey}: Max retries reached for deallocating miner.")
-                    time.sleep(5)
-        except Exception as e:
-            bt.logging.trace(f"{axon.hotkey}: Unexpected error during deallocation: {e}")
-
     def set_weights(self):
         # Remove all negative scores and attribute them 0.
         self.scores[self.scores < 0] = 0
@@ -1036,12 +899,16 @@ class Validator:
         block_next_set_weights = self.current_block + weights_rate_limit
         block_next_hardware_info = 1        
         block_next_miner_checking = 1
+        block_next_sync_scores = 1
 
         time_next_pog = None
         time_next_sync_status = None
         time_next_set_weights = None
         time_next_hardware_info = None        
 
+        # Reload config.yaml when it changes, for the lifetime of the validator
+        self.config_task = asyncio.create_task(self.config_service.watch())
+
         bt.logging.info("Starting validator loop.")
         while True:
             try:
@@ -1057,7 +924,7 @@ class Validator:
                         not block_next_hardware_info == 1 and self.validator_perform_hardware_query, block_next_hardware_info
                     )
 
-                    # Perform proof of GPU (pog) queries
+                    # Perform proof of GPU (pog) queries, the task runs continuously and is restarted if it stopped
                     if self.current_block % block_next_pog == 0 or block_next_pog < self.current_block:
                         block_next_pog = self.current_block + 360
 
@@ -1105,9 +972,16 @@ class Validator:
                         self.wandb.log_chain_data(chain_data)
 
                     # Periodically update the weights on the Bittensor blockchain, ~ every 20 minutes
+                    # Scores are kept up to date as PoG results arrive; the full sync is a periodic consistency check
                     if self.current_block - self.last_updated_block > weights_rate_limit:
                         block_next_set_weights = self.current_block + weights_rate_limit
-                        self.sync_scores()
+                        if self.current_block >= block_next_sync_scores or self.rescore_pending:
+                            block_next_sync_scores = self.current_block + 3 * weights_rate_limit  # ~ every hour
+                            self.sync_scores()
+                        else:
+                            # Allocations change between full syncs, rescore the miners whose multiplier changed
+                            for hotkey in self.sync_allocations():
+                                self.update_score(hotkey)
                         self.set_weights()
                         self.last_updated_block = self.current_block
                         self.blocks_done.clear()
@@ -1136,6 +1010,7 @@ class Validator:
             # If the user interrupts the program, gracefully exit.
             except KeyboardInterrupt:
                 self.db.close()
+                self.verification_executor.shutdown(wait=False)
                 bt.logging.success("Keyboard interrupt detected. Exiting validator.")
                 exit()
 
@@ -0,0 +1,560 @@
+"""
+Local Proof-of-GPU load test.
+
+Spins up simulated miners on this machine and runs the validator's PoG test
+(PogTester.test_miner_gpu) against them, so PoG throughput can be measured
+without GPU miners. Miners are allocated through the validator's real Allocate
+queries, answered by a local stub axon standing in for every simulated miner.
+Each simulated miner runs the real miner script in agent mode on the CPU, with
+a small matrix size, through a local transport: subprocesses, or a local SSH
+server. The "SIM GPU" profiles report a simulated benchmark, the "SIM CPU"
+profile runs the real one on the CPU, calibrated once before the test.
+Latency, failures and cheating behaviours can be injected per miner.
+
+Reports tests and rounds per hour, per-phase latency percentiles and the
+validator's CPU and memory usage (the verification pool included, the
+simulated miners excluded).
+
+Run from the repository root:
+
+    python test-scripts/pog_load_test.py --miners 32 --rounds 3 --concurrency 16
+    python test-scripts/pog_load_test.py --transport ssh --cheat-rate 0.25 --failure-rate 0.02
+"""
+import argparse
+import asyncio
+import base64
+import concurrent.futures
+import importlib.util
+import json
+import multiprocessing
+import os
+import random
+import shlex
+import socket
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import bittensor as bt
+import numpy as np
+import psutil
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# Validator modules import RSAEncryption from neurons/, as when running neurons/validator.py
+sys.path.insert(1, os.path.join(ROOT, "neurons"))
+
+import RSAEncryption as rsa  # noqa: E402
+from compute.protocol import Allocate  # noqa: E402
+from neurons.Validator.database.pog import update_pog_stats  # noqa: E402
+from neurons.Validator.pog import adjust_matrix_size, load_yaml_config  # noqa: E402
+from neurons.Validator.pog_tester import PogTester  # noqa: E402
+from neurons.Validator.transport import AsyncSSHTransport, LocalProcessTransport  # noqa: E402
+from compute.utils.db import ComputeDb  # noqa: E402
+
+SIMULATOR = os.path.join(ROOT, "test-scripts", "simulated_miner.py")
+CHEATS = ("wrong_rows", "fake_root", "slow")
+PHASES = ("allocate", "connect", "deploy", "gpu_info", "benchmark", "compute", "proof", "verify", "deallocate")
+# Simulated GPU profiles: name -> scale of the reference VRAM and FP32 throughput
+PROFILES = {"SIM GPU S": 1, "SIM GPU L": 2, "SIM CPU": 0.5}
+# Profile running the real miner script benchmark, its references are calibrated on this machine
+CPU_PROFILE = "SIM CPU"
+SIM_VRAM = 8.0
+
+
+class SimulatedAxon:
+    def __init__(self, hotkey, ip, port):
+        self.hotkey = hotkey
+        self.ip = ip
+        self.port = port
+
+
+class SimulatedMiner:
+    """A simulated miner: its GPU profile, injected behaviours and expected PoG outcome."""
+
+    def __init__(self, index, gpu_name, num_gpus, benchmark, cheat, args, log_dir):
+        self.index = index
+        self.hotkey = f"sim-miner-{index}"
+        self.username = f"miner{index}"
+        # Pointed at the stub allocation axon once it is listening
+        self.axon = SimulatedAxon(self.hotkey, "127.0.0.1", None)
+        self.gpu_name = gpu_name
+        self.num_gpus = num_gpus
+        self.vram = SIM_VRAM * PROFILES[gpu_name]
+        self.benchmark = benchmark
+        self.cheat = cheat
+        self.latency = args.latency
+        self.failure_rate = args.failure_rate
+        self.allocation_failure_rate = args.allocation_failure_rate
+        self.slow_delay = args.slow_delay
+        self.log_path = os.path.join(log_dir, f"{self.username}.log")
+        self.rng = random.Random(args.seed + index)
+
+    @property
+    def behaviour(self):
+        return "honest" if self.cheat == "none" else self.cheat
+
+    def agent_command(self, command):
+        """Replace the miner script agent command with the simulator, other commands run as is."""
+        if "--mode agent" not in command:
+            return command
+        script_path = shlex.split(command)[1]
+        benchmark = ["--benchmark", shlex.quote(self.benchmark)] if self.benchmark is not None else []
+        return " ".join([
+            shlex.quote(sys.executable), shlex.quote(SIMULATOR),
+            "--script", shlex.quote(script_path),
+            "--gpu-name", shlex.quote(self.gpu_name),
+            "--num-gpus", str(self.num_gpus),
+            "--vram", str(self.vram),
+            *benchmark,
+            "--latency", str(self.latency),
+            "--crash-rate", str(self.failure_rate),
+            "--cheat", self.cheat,
+            "--slow-delay", str(self.slow_delay),
+            "--seed", str(self.rng.randrange(2 ** 32)),
+            f"2>>{shlex.quote(self.log_path)}",
+        ])
+
+
+class SimulatedMinerTransport(LocalProcessTransport):
+    """Local transport to a simulated miner, with the miner's latency on every round trip."""
+
+    def __init__(self, miner):
+        super().__init__()
+        self.miner = miner
+
+    async def upload(self, local_path, remote_path):
+        await asyncio.sleep(self.miner.latency)
+        await super().upload(local_path, remote_path)
+
+    async def run(self, command):
+        await asyncio.sleep(self.miner.latency)
+        return await super().run(command)
+
+    async def start_process(self, command):
+        await asyncio.sleep(self.miner.latency)
+        return await super().start_process(self.miner.agent_command(command))
+
+
+def start_ssh_server(miners_by_username):
+    """Start a local SSH server routing each login to its simulated miner."""
+    import asyncssh
+
+    class SimulatedSSHServer(asyncssh.SSHServer):
+        def begin_auth(self, username):
+            return True
+
+        def password_auth_supported(self):
+            return True
+
+        def validate_password(self, username, password):
+            return username in miners_by_username
+
+    async def pump(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+            writer.write_eof()
+        except (BrokenPipeError, ConnectionResetError, asyncssh.Error):
+            pass
+
+    async def handle_process(process):
+        miner = miners_by_username[process.get_extra_info("username")]
+        local_process = await asyncio.create_subprocess_shell(
+            miner.agent_command(process.command),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        stdin_task = asyncio.create_task(pump(process.stdin, local_process.stdin))
+        # All the output must be forwarded before reporting the exit status
+        await asyncio.gather(pump(local_process.stdout, process.stdout), pump(local_process.stderr, process.stderr))
+        stdin_task.cancel()
+        process.exit(await local_process.wait())
+
+    return asyncssh.create_server(
+        SimulatedSSHServer, "127.0.0.1", 0,
+        server_host_keys=[asyncssh.generate_private_key("ssh-ed25519")],
+        process_factory=handle_process, sftp_factory=True, encoding=None,
+    )
+
+
+class StubAllocateAxon:
+    """
+    Local axon answering the Allocate queries of every simulated miner as the miner's
+    allocate handler does: availability checks, allocations returning the SSH login
+    encrypted with the validator's public key, and deallocations.
+    """
+
+    def __init__(self, wallet, miners, ssh_port):
+        self.miners = {miner.hotkey: miner for miner in miners}
+        self.ssh_port = ssh_port
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        self.axon = bt.axon(wallet=wallet, ip="127.0.0.1", port=port, external_ip="127.0.0.1", external_port=port)
+        self.axon.attach(forward_fn=self.allocate, verify_fn=self.verify)
+
+    @property
+    def port(self):
+        return self.axon.external_port
+
+    def verify(self, synapse: Allocate) -> None:
+        # The default check binds each request to this axon's hotkey, while this axon
+        # stands in for every simulated miner hotkey
+        if synapse.axon.hotkey not in self.miners:
+            raise ValueError(f"Unknown miner {synapse.axon.hotkey}")
+
+    async def allocate(self, synapse: Allocate) -> Allocate:
+        miner = self.miners[synapse.axon.hotkey]
+        await asyncio.sleep(miner.latency)
+        if synapse.checking:
+            synapse.output = {"status": miner.rng.random() >= miner.allocation_failure_rate}
+        elif synapse.timeline > 0:
+            login = {"port": self.ssh_port or 22, "username": miner.username, "password": "simulated"}
+            info = rsa.encrypt_data(synapse.public_key.encode("utf-8"), json.dumps(login))
+            synapse.output = {"status": True, "info": base64.b64encode(info).decode("utf-8")}
+        else:
+            synapse.output = {"status": True}
+        return synapse
+
+    def start(self):
+        self.axon.start()
+
+    def stop(self):
+        self.axon.stop()
+
+
+def create_wallet(work_dir, name):
+    """Throwaway wallet without password, kept in the working directory."""
+    wallet = bt.wallet(name=name, hotkey="default", path=work_dir)
+    wallet.create_new_coldkey(use_password=False, overwrite=True, suppress=True)
+    wallet.create_new_hotkey(use_password=False, overwrite=True, suppress=True)
+    return wallet
+
+
+def calibrate_cpu_benchmark(miner_script_path, warmup, trials):
+    """Run the miner script benchmark on the CPU once, as the reference of the CPU profile."""
+    spec = importlib.util.spec_from_file_location("miner_script", miner_script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.benchmark_results("cpu", warmup, trials)
+
+
+def simulated_benchmark(gpu_name, num_gpus, vram, time_fp32):
+    """Benchmark payload of GPUs with the given VRAM, timed so that FP32 takes `time_fp32` seconds."""
+    timings = {
+        "fp16": {"median": time_fp32 / 2, "p10": time_fp32 / 2, "p90": time_fp32 / 2},
+        "fp32": {"median": time_fp32, "p10": time_fp32, "p90": time_fp32},
+        "fp32_full": {"median": time_fp32, "p10": time_fp32, "p90": time_fp32},
+    }
+    return json.dumps({
+        "num_gpus": num_gpus,
+        "vram": vram,
+        "size_fp16": adjust_matrix_size(vram, element_size=2, buffer_factor=1.0),
+        "size_fp32": adjust_matrix_size(vram, element_size=4, buffer_factor=0.5),
+        "size_fp32_full": adjust_matrix_size(vram, element_size=4, buffer_factor=0.5),
+        **timings,
+        "gpus": [{"gpu_id": gpu_id, "name": gpu_name, **timings} for gpu_id in range(num_gpus)],
+    })
+
+
+def simulated_gpu_performance(time_fp32, cpu_benchmark):
+    """gpu_performance table of the simulated profiles, matching simulated_benchmark and the CPU calibration."""
+    gpu_data = {"GPU_TFLOPS_FP16": {}, "GPU_TFLOPS_FP32": {}, "GPU_AVRAM": {}, "gpu_tolerance_pairs": {}}
+    for gpu_name, scale in PROFILES.items():
+        vram = SIM_VRAM * scale
+        if gpu_name == CPU_PROFILE:
+            gpu_data["GPU_TFLOPS_FP16"][gpu_name] = 2 * cpu_benchmark["size_fp16"] ** 3 / cpu_benchmark["fp16"]["median"] / 1e12
+            gpu_data["GPU_TFLOPS_FP32"][gpu_name] = 2 * cpu_benchmark["size_fp32"] ** 3 / cpu_benchmark["fp32"]["median"] / 1e12
+            gpu_data["GPU_AVRAM"][gpu_name] = vram
+            continue
+        size_fp16 = adjust_matrix_size(vram, element_size=2, buffer_factor=1.0)
+        size_fp32 = adjust_matrix_size(vram, element_size=4, buffer_factor=0.5)
+        gpu_data["GPU_TFLOPS_FP16"][gpu_name] = 2 * size_fp16 ** 3 / (time_fp32 / 2) / 1e12
+        gpu_data["GPU_TFLOPS_FP32"][gpu_name] = 2 * size_fp32 ** 3 / time_fp32 / 1e12
+        gpu_data["GPU_AVRAM"][gpu_name] = vram
+    return gpu_data
+
+
+def create_miners(args, log_dir):
+    rng = random.Random(args.seed)
+    miners = []
+    for index in range(args.miners):
+        gpu_name = list(PROFILES)[index % len(PROFILES)]
+        if gpu_name == CPU_PROFILE:
+            # The real benchmark times the single CPU device
+            num_gpus, benchmark = 1, None
+        else:
+            num_gpus = rng.randint(1, args.max_gpus)
+            benchmark = simulated_benchmark(gpu_name, num_gpus, SIM_VRAM * PROFILES[gpu_name], args.time_fp32)
+        cheat = rng.choice(CHEATS) if rng.random() < args.cheat_rate else "none"
+        miners.append(SimulatedMiner(index, gpu_name, num_gpus, benchmark, cheat, args, log_dir))
+    return miners
+
+
+class ResourceSampler:
+    """Samples the CPU and memory of the validator process and of its verification pool."""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.session = os.getsid(0)
+        self.tracked = {}
+        self.cpu_samples = []
+        self.rss_samples = []
+        self.loop_lag = 0.0
+
+    def validator_processes(self):
+        # Simulated miners run in their own sessions, the verification pool shares the validator's
+        processes = [self.process]
+        for child in self.process.children(recursive=True):
+            try:
+                if os.getsid(child.pid) == self.session:
+                    processes.append(child)
+            except (ProcessLookupError, psutil.Error):
+                continue
+        return processes
+
+    def sample(self):
+        cpu_percent = 0.0
+        rss = 0
+        for process in self.validator_processes():
+            tracked = self.tracked.setdefault(process.pid, process)
+            try:
+                cpu_percent += tracked.cpu_percent(None)
+                rss += tracked.memory_info().rss
+            except psutil.Error:
+                continue
+        return cpu_percent, rss
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self.sample()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.loop_lag = max(self.loop_lag, loop.time() - start - self.interval)
+            cpu_percent, rss = self.sample()
+            self.cpu_samples.append(cpu_percent)
+            self.rss_samples.append(rss)
+
+
+def percentiles(values):
+    if not values:
+        return {"count": 0}
+    p50, p90, p99 = np.percentile(values, [50, 90, 99])
+    return {"count": len(values), "p50": p50, "p90": p90, "p99": p99, "max": max(values)}
+
+
+async def run_load_test(args):
+    config_path = os.path.abspath(args.config_file)
+    work_dir = tempfile.mkdtemp(prefix="pog_load_test_")
+    # ComputeDb lives in the working directory, keep the load test away from the validator's database
+    os.chdir(work_dir)
+
+    config_data = load_yaml_config(config_path)
+    merkle_proof = config_data["merkle_proof"]
+    merkle_proof["miner_script_path"] = os.path.join(ROOT, merkle_proof["miner_script_path"])
+    # Size the simulated VRAM share so the challenge matrices are matrix_size x matrix_size
+    merkle_proof["matrix_buffer_factor"] = 2 * 4 * (args.matrix_size + 16) ** 2 / (SIM_VRAM * 1e9)
+    merkle_proof["hash_algorithm"] = args.hash_algorithm
+    merkle_proof["low_memory_proof"] = args.low_memory
+    if args.no_reverify:
+        merkle_proof["full_identification_interval"] = 0
+    cpu_benchmark = calibrate_cpu_benchmark(
+        merkle_proof["miner_script_path"], merkle_proof.get("benchmark_warmup", 3), merkle_proof.get("benchmark_trials", 10)
+    )
+    config_data["gpu_performance"] = simulated_gpu_performance(args.time_fp32, cpu_benchmark)
+    if args.slow_delay is None:
+        args.slow_delay = merkle_proof.get("time_tolerance", 5) + args.max_gpus * args.time_fp32 + 1
+
+    # The dendrites look up this host's external IP on creation, the load test stays local
+    bt.utils.networking.get_external_ip = lambda: "127.0.0.1"
+    miners = create_miners(args, work_dir)
+    db = ComputeDb()
+    phase_latencies = defaultdict(list)
+    results = []
+
+    ssh_server = None
+    ssh_port = None
+    if args.transport == "ssh":
+        ssh_server = await start_ssh_server({miner.username: miner for miner in miners})
+        ssh_port = ssh_server.sockets[0].getsockname()[1]
+        transport_factory = AsyncSSHTransport.connect
+    else:
+        miners_by_username = {miner.username: miner for miner in miners}
+
+        async def transport_factory(host, port, username, password, timeout=10):
+            miner = miners_by_username[username]
+            await asyncio.sleep(miner.latency)
+            return SimulatedMinerTransport(miner)
+
+    allocator = StubAllocateAxon(create_wallet(work_dir, "miners"), miners, ssh_port)
+    for miner in miners:
+        miner.axon.port = allocator.port
+    allocator.start()
+
+    verification_workers = args.verification_workers or os.cpu_count() or 1
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency + 4)
+    verification_executor = concurrent.futures.ProcessPoolExecutor(
+        max_workers=verification_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    tester = PogTester(
+        create_wallet(work_dir, "validator"), db, executor, verification_executor, verification_workers,
+        on_phase=lambda hotkey, phase, seconds: phase_latencies[phase].append(seconds),
+        transport_factory=transport_factory, python_path=sys.executable,
+    )
+    sampler = ResourceSampler(args.sample_interval)
+    sampler_task = asyncio.create_task(sampler.run())
+    sessions = asyncio.Semaphore(args.concurrency)
+
+    async def test_miner(miner, round_index):
+        async with sessions:
+            start_time = time.time()
+            timed_out = False
+            try:
+                _, gpu_name, num_gpus = await asyncio.wait_for(
+                    tester.test_miner_gpu(miner.axon, config_data), timeout=args.timeout
+                )
+            except asyncio.TimeoutError:
+                gpu_name, num_gpus, timed_out = None, 0, True
+            elapsed = time.time() - start_time
+        passed = gpu_name is not None and num_gpus > 0
+        if passed:
+            # Feeds the cached identity fast path of the next rounds, as the validator does
+            update_pog_stats(db, miner.hotkey, gpu_name, num_gpus)
+        results.append({
+            "hotkey": miner.hotkey,
+            "round": round_index,
+            "behaviour": miner.behaviour,
+            "passed": passed,
+            "identified": passed and gpu_name == miner.gpu_name and num_gpus == miner.num_gpus,
+            "timed_out": timed_out,
+            "latency": elapsed,
+        })
+
+    async def test_rounds(miner):
+        # A miner is never tested twice at once, its rounds run back to back
+        for round_index in range(args.rounds):
+            await test_miner(miner, round_index)
+
+    start_time = time.time()
+    try:
+        await asyncio.gather(*(test_rounds(miner) for miner in miners))
+    finally:
+        elapsed = time.time() - start_time
+        sampler_task.cancel()
+        allocator.stop()
+        if ssh_server:
+            ssh_server.close()
+        verification_executor.shutdown(wait=True)
+        executor.shutdown(wait=True)
+        db.close()
+
+    return build_report(args, miners, results, phase_latencies, sampler, elapsed, work_dir)
+
+
+def build_report(args, miners, results, phase_latencies, sampler, elapsed, work_dir):
+    behaviours = defaultdict(lambda: {"miners": 0, "tests": 0, "passed": 0, "identified": 0, "timed_out": 0})
+    for miner in miners:
+        behaviours[miner.behaviour]["miners"] += 1
+    for result in results:
+        stats = behaviours[result["behaviour"]]
+        stats["tests"] += 1
+        stats["passed"] += result["passed"]
+        stats["identified"] += result["identified"]
+        stats["timed_out"] += result["timed_out"]
+    phases = {phase: percentiles(phase_latencies[phase]) for phase in PHASES if phase_latencies[phase]}
+    phases["test"] = percentiles([result["latency"] for result in results])
+    return {
+        "transport": args.transport,
+        "miners": args.miners,
+        "rounds": args.rounds,
+        "concurrency": args.concurrency,
+        "matrix_size": args.matrix_size,
+        "elapsed": elapsed,
+        "tests": len(results),
+        "tests_per_hour": len(results) / elapsed * 3600 if elapsed else 0.0,
+        "rounds_per_hour": len(results) / args.miners / elapsed * 3600 if elapsed else 0.0,
+        "phases": phases,
+        "behaviours": dict(behaviours),
+        "cpu_percent": {
+            "mean": float(np.mean(sampler.cpu_samples)) if sampler.cpu_samples else 0.0,
+            "peak": max(sampler.cpu_samples, default=0.0),
+        },
+        "rss_mb": {
+            "mean": float(np.mean(sampler.rss_samples)) / 2 ** 20 if sampler.rss_samples else 0.0,
+            "peak": max(sampler.rss_samples, default=0) / 2 ** 20,
+        },
+        "loop_lag_max": sampler.loop_lag,
+        "work_dir": work_dir,
+    }
+
+
+def print_report(report):
+    print()
+    print(f"PoG load test: {report['miners']} miners x {report['rounds']} rounds, concurrency {report['concurrency']}, "
+          f"{report['transport']} transport, n={report['matrix_size']}")
+    print(f"Elapsed: {report['elapsed']:.1f} s, {report['tests']} tests")
+    print(f"Throughput: {report['tests_per_hour']:.0f} tests/hour, {report['rounds_per_hour']:.1f} rounds/hour")
+    print()
+    print(f"{'Phase latency (s)':<20}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for phase, stats in report["phases"].items():
+        if not stats["count"]:
+            continue
+        print(f"{phase:<20}{stats['count']:>8}{stats['p50']:>10.3f}{stats['p90']:>10.3f}{stats['p99']:>10.3f}{stats['max']:>10.3f}")
+    print()
+    print(f"{'Behaviour':<20}{'miners':>8}{'tests':>8}{'passed':>8}{'identified':>12}{'timeouts':>10}")
+    for behaviour, stats in sorted(report["behaviours"].items()):
+        print(f"{behaviour:<20}{stats['miners']:>8}{stats['tests']:>8}{stats['passed']:>8}{stats['identified']:>12}{stats['timed_out']:>10}")
+    print()
+    print(f"Validator CPU: mean {report['cpu_percent']['mean']:.1f}%, peak {report['cpu_percent']['peak']:.1f}% (100% = one core)")
+    print(f"Validator RSS: mean {report['rss_mb']['mean']:.0f} MB, peak {report['rss_mb']['peak']:.0f} MB")
+    print(f"Event loop lag: max {report['loop_lag_max']:.3f} s")
+    print(f"Miner logs and database: {report['work_dir']}")
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Local PoG load test against simulated miners.")
+    parser.add_argument("--miners", type=int, default=16, help="Number of simulated miners.")
+    parser.add_argument("--rounds", type=int, default=2, help="Number of PoG tests per miner.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Number of miner tests run concurrently.")
+    parser.add_argument("--transport", type=str, default="subprocess", choices=["subprocess", "ssh"],
+                        help="Run simulated miners as local subprocesses or behind a local SSH server.")
+    parser.add_argument("--matrix-size", type=int, default=512, help="Size of the challenge matrices.")
+    parser.add_argument("--max-gpus", type=int, default=1, help="Simulated miners have 1 to max-gpus GPUs.")
+    parser.add_argument("--time-fp32", type=float, default=2.0, help="FP32 benchmark time reported by the simulated GPUs.")
+    parser.add_argument("--hash-algorithm", type=str, default="sha256", choices=["sha256", "blake3"])
+    parser.add_argument("--low-memory", action="store_true", help="Use low-memory proofs.")
+    parser.add_argument("--no-reverify", action="store_true", help="Disable the cached identity fast path.")
+    parser.add_argument("--latency", type=float, default=0.02, help="Delay added to every miner round trip, in seconds.")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Probability of a miner crash on each agent request.")
+    parser.add_argument("--allocation-failure-rate", type=float, default=0.0, help="Probability of an allocation refusal.")
+    parser.add_argument("--cheat-rate", type=float, default=0.0, help=f"Share of cheating miners, among {', '.join(CHEATS)}.")
+    parser.add_argument("--slow-delay", type=float, default=None,
+                        help="Delay added to each GPU computation by slow cheaters; defaults to just above the timing limit.")
+    parser.add_argument("--timeout", type=float, default=300, help="Timeout of a miner test, as in the validator.")
+    parser.add_argument("--verification-workers", type=int, default=None, help="Size of the verification pool.")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between CPU and memory samples.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the miner behaviours.")
+    parser.add_argument("--config_file", type=str, default="config.yaml", help="Path to the PoG config file.")
+    parser.add_argument("--json", type=str, default=None, help="Also write the report to this JSON file.")
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+    json_path = os.path.abspath(args.json) if args.json else None
+    report = asyncio.run(run_load_test(args))
+    print_report(report)
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
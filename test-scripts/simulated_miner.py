@@ -0,0 +1,112 @@
+"""
+Simulated PoG miner used by the local load test (pog_load_test.py).
+
+Loads the miner script deployed by the validator and serves its agent mode on
+the CPU. The hardware probes (GPU info, memory) report a simulated GPU profile,
+as does the benchmark when a payload is given; without one, the real miner
+script benchmark runs on the CPU. Seeds, matrices, Merkle trees and proofs
+always go through the real miner script code. Latency, crashes and cheating
+behaviours are injected around it.
+"""
+import argparse
+import importlib.util
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+CHEATS = ("none", "wrong_rows", "fake_root", "slow")
+
+
+def load_miner_script(path):
+    spec = importlib.util.spec_from_file_location("miner_script", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def simulate(module, args):
+    """Patch the miner script module with the simulated GPU profile and behaviours."""
+    hash_algorithms = list(module.HASH_BACKENDS)
+
+    def collect_gpu_info():
+        return {"num_gpus": args.num_gpus, "gpu_names": [args.gpu_name] * args.num_gpus, "hash_algorithms": hash_algorithms}
+
+    def estimate_vram(*_args, **_kwargs):
+        usable = int(args.vram * 1e9)
+        return {"vram": args.vram, "usable_vram": args.vram,
+                "devices": [{"gpu_id": gpu_id, "total": usable, "free": usable, "usable": usable} for gpu_id in range(args.num_gpus)]}
+
+    def benchmark_output(*_args, **_kwargs):
+        return args.benchmark
+
+    module.collect_gpu_info = collect_gpu_info
+    module.estimate_vram = estimate_vram
+    if args.benchmark is not None:
+        module.benchmark_output = benchmark_output
+    # Every simulated GPU runs on the CPU device
+    module.MinerAgent.num_gpus = property(lambda self: args.num_gpus)
+
+    handle = module.MinerAgent.handle
+
+    def simulated_handle(self, message):
+        if args.crash_rate and random.random() < args.crash_rate:
+            print(f"Simulated crash on {message.get('cmd')}")
+            sys.stdout.flush()
+            os._exit(1)
+        if args.latency:
+            time.sleep(args.latency)
+        return handle(self, message)
+
+    module.MinerAgent.handle = simulated_handle
+
+    if args.cheat == "wrong_rows":
+        serialize_proof_response = module.serialize_proof_response
+
+        def tampered_proof_response(rows, tree, leaf_indices, total_leaves):
+            rows = np.array(rows, dtype=np.float32)
+            rows[:, 0] += 1.0
+            return serialize_proof_response(rows, tree, leaf_indices, total_leaves)
+
+        module.serialize_proof_response = tampered_proof_response
+
+    elif args.cheat == "fake_root":
+        compute_gpu = module.MinerAgent.compute_gpu
+
+        def fake_root_compute_gpu(self, gpu_id):
+            (gpu_id, root_hash), timing = compute_gpu(self, gpu_id)
+            return (gpu_id, os.urandom(len(root_hash) // 2).hex()), timing
+
+        module.MinerAgent.compute_gpu = fake_root_compute_gpu
+
+    elif args.cheat == "slow":
+        compute_gpu = module.MinerAgent.compute_gpu
+
+        def slow_compute_gpu(self, gpu_id):
+            time.sleep(args.slow_delay)
+            return compute_gpu(self, gpu_id)
+
+        module.MinerAgent.compute_gpu = slow_compute_gpu
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulated PoG miner serving the miner script agent mode on the CPU.")
+    parser.add_argument("--script", type=str, required=True, help="Path of the deployed miner script.")
+    parser.add_argument("--gpu-name", type=str, required=True, help="Reported GPU name.")
+    parser.add_argument("--num-gpus", type=int, default=1, help="Number of simulated GPUs.")
+    parser.add_argument("--vram", type=float, required=True, help="VRAM of each simulated GPU, in GB.")
+    parser.add_argument("--benchmark", type=str, default=None,
+                        help="Benchmark payload returned to the validator; the real benchmark runs on the CPU if omitted.")
+    parser.add_argument("--latency", type=float, default=0.0, help="Delay added to every agent request, in seconds.")
+    parser.add_argument("--crash-rate", type=float, default=0.0, help="Probability of exiting on each agent request.")
+    parser.add_argument("--cheat", type=str, default="none", choices=CHEATS, help="Cheating behaviour.")
+    parser.add_argument("--slow-delay", type=float, default=10.0, help="Delay added to each GPU computation by the slow cheat.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the injected failures.")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    miner_script = load_miner_script(args.script)
+    simulate(miner_script, args)
+    miner_script.run_agent("cpu")
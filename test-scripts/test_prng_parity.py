@@ -0,0 +1,107 @@
+"""
+Parity tests between the validator's NumPy PRNG (neurons/Validator/prng.py) and the
+seeded matrices generated by the miner script with torch, and between the miner script's
+block-wise generator and a frozen copy of its original, unchunked version.
+
+Run from the repository root:
+
+    python -m pytest -q test-scripts/test_prng_parity.py
+"""
+import importlib.util
+import os
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from neurons.Validator.prng import generate_prng_block, generate_prng_col, generate_prng_row
+
+MINER_SCRIPT_PATH = os.path.join(ROOT, "neurons", "Validator", "miner_script_m_merkletree.py")
+
+SEEDS = [0, 1, 0xFFFFFFFF, 0x100000000, 2**63 - 1, 2**64 - 1, 0x9E3779B97F4A7C15]
+SIZES = [1, 2, 7, 33, 257]
+
+
+@pytest.fixture(scope="module")
+def miner_script():
+    spec = importlib.util.spec_from_file_location("miner_script", MINER_SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def baseline_xorshift32_torch(state):
+    state = state.type(torch.int64)
+    x = state & 0xFFFFFFFF
+    x = x ^ ((x << 13) & 0xFFFFFFFF)
+    x = x ^ ((x >> 17) & 0xFFFFFFFF)
+    x = x ^ ((x << 5) & 0xFFFFFFFF)
+    x = x & 0xFFFFFFFF
+    return x
+
+
+def baseline_generate_matrix_torch(s, n):
+    # Frozen copy of the original, unchunked miner script generator (on the CPU)
+    device = torch.device("cpu")
+    dtype = torch.int64
+    i_indices = torch.arange(n, dtype=dtype, device=device).repeat_interleave(n)
+    j_indices = torch.arange(n, dtype=dtype, device=device).repeat(n)
+    s_signed = (s + 2**63) % 2**64 - 2**63
+    s_tensor = torch.tensor(s_signed, dtype=dtype, device=device)
+    i_mod = i_indices % (2**32)
+    states = (s_tensor + i_mod + j_indices) & 0xFFFFFFFF
+    for _ in range(10):
+        states = baseline_xorshift32_torch(states)
+    return (states.float() / float(0xFFFFFFFF)).reshape(n, n)
+
+
+def reference_matrix(miner_script, s, n, block_elements=None):
+    kwargs = {} if block_elements is None else {"block_elements": block_elements}
+    return miner_script.generate_matrix_torch(s, n, device=torch.device("cpu"), **kwargs).numpy()
+
+
+@pytest.mark.parametrize("s", SEEDS)
+@pytest.mark.parametrize("n", SIZES)
+def test_block_matches_full_matrix(miner_script, s, n):
+    matrix = reference_matrix(miner_script, s, n)
+    block = generate_prng_block(s, np.arange(n), n)
+    assert block.dtype == np.float32
+    np.testing.assert_array_equal(block, matrix)
+
+
+@pytest.mark.parametrize("s", SEEDS)
+@pytest.mark.parametrize("n", SIZES)
+def test_rows_and_columns_match(miner_script, s, n):
+    matrix = reference_matrix(miner_script, s, n)
+    for index in sorted({0, n // 2, n - 1}):
+        np.testing.assert_array_equal(generate_prng_row(s, index, n), matrix[index])
+        np.testing.assert_array_equal(generate_prng_col(s, index, n), matrix[:, index])
+
+
+@pytest.mark.parametrize("s", SEEDS[:3])
+def test_unordered_offsets(miner_script, s):
+    n = 65
+    matrix = reference_matrix(miner_script, s, n)
+    offsets = [64, 3, 3, 0, 17]
+    np.testing.assert_array_equal(generate_prng_block(s, offsets, n), matrix[offsets])
+
+
+@pytest.mark.parametrize("n", [37, 100])
+def test_generation_blocks_not_dividing_n(miner_script, n):
+    # Row blocks of the miner script that do not divide n must not change the matrix
+    s = 0xDEADBEEFCAFEBABE
+    matrix = reference_matrix(miner_script, s, n, block_elements=3 * n + 1)
+    np.testing.assert_array_equal(generate_prng_block(s, np.arange(n), n), matrix)
+
+
+@pytest.mark.parametrize("s", SEEDS)
+@pytest.mark.parametrize("n", SIZES)
+@pytest.mark.parametrize("block_elements", [None, 5])
+def test_matches_baseline_generator(miner_script, s, n, block_elements):
+    # The block-wise generator must reproduce the matrices of the original miner script
+    expected = baseline_generate_matrix_torch(s, n).numpy()
+    np.testing.assert_array_equal(reference_matrix(miner_script, s, n, block_elements), expected)